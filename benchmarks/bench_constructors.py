@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Constructor benchmark
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Time per Color built with Color(value, format) against the matching fast
+classmethod constructor.
+
+    python benchmarks/bench_constructors.py [number]
+
+"""
+
+import sys
+import timeit
+
+# Path hack. (for importing)
+import os
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+CASES = [
+    ('HEX', "Color('#335577')", "Color.from_hex('#335577')"),
+    ('RGB', "Color((0.2, 0.3, 0.4), 'RGB')", "Color.from_rgb((0.2, 0.3, 0.4))"),
+    ('RGB256', "Color((51, 85, 119), 'RGB256')", "Color.from_rgb256((51, 85, 119))"),
+    ('INT', "Color('#%06X' % 0x335577)", "Color.from_int(0x335577)"),
+    ('RGB (trusted)', "Color((0.2, 0.3, 0.4), 'RGB')", "Color.from_rgb_unchecked((0.2, 0.3, 0.4))"),
+]
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    setup = 'from chroma import Color'
+
+    print('%-14s %14s %14s %8s' % ('format', 'Color() us', 'from_*() us', 'speedup'))
+    for name, slow, fast in CASES:
+        slow_time = min(timeit.repeat(slow, setup, repeat=3, number=number)) / number * 1e6
+        fast_time = min(timeit.repeat(fast, setup, repeat=3, number=number)) / number * 1e6
+        print('%-14s %14.3f %14.3f %7.1fx' % (name, slow_time, fast_time, slow_time / fast_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+convert_many benchmark
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Throughput of chroma.convert_many (HEX -> HLS) by worker count, against a
+plain loop over Color(...).hls.
+
+    python benchmarks/bench_convert_many.py [count]
+
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+
+# Path hack. (for importing)
+import os
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+
+def throughput(count, func):
+    start = time.time()
+    func()
+    return count / (time.time() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(0)
+    values = ['#%06X' % (rng.randint(0, 0xFFFFFF)) for _ in range(count)]
+
+    baseline = throughput(count, lambda: [chroma.Color(v).hls for v in values])
+    print('%-24s %12.0f colors/s' % ('Color(...).hls loop', baseline))
+
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        rate = throughput(count, lambda: chroma.convert_many(values, 'HEX', 'HLS', workers=workers))
+        print('%-24s %12.0f colors/s  (%.1fx loop)' % ('convert_many workers=%d' % (workers), rate, rate / baseline))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite
+~~~~~~~~~~~~~~~~
+
+Times every Color hot path (construction per format, property getters and
+setters, equality, mixing) for a single color and for a batch of distinct
+colors, plus the ColorArray equivalents when NumPy is installed. Results are
+written as JSON; pass a previous results file to --compare to list
+regressions (exit status 1 if any).
+
+    python benchmarks/run.py -o before.json
+    python benchmarks/run.py -o after.json --compare before.json
+
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+# Path hack. (for importing)
+import os
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+FORMATS = ('HEX', 'RGB', 'RGB256', 'HLS', 'HSV', 'CMY', 'CMYK', 'XYZ', 'LAB')
+PROPERTIES = ('hex', 'rgb256', 'hls', 'hsv', 'cmy', 'cmyk')
+
+# Filled in by prepare(), imported by the timeit setup code
+data = {}
+
+SETUP = 'from __main__ import data; from chroma import Color, mix_many'
+
+
+def prepare(batch_size):
+    """Scalar values and a batch of distinct random colors in every format"""
+    rng = random.Random(1234)
+    hexes = ['#%06X' % rng.randint(0, 0xFFFFFF) for _ in range(batch_size)]
+    colors = [chroma.Color(h) for h in hexes]
+
+    data['color'] = chroma.Color('#335577')
+    data['other'] = chroma.Color('#446688')
+    data['colors'] = colors
+    data['others'] = colors[::-1]
+    for format in FORMATS:
+        data[format] = getattr(data['color'], format.lower())
+        data[format + '_many'] = [getattr(c, format.lower()) for c in colors]
+
+    if hasattr(chroma, 'ColorArray'):
+        data['array'] = chroma.ColorArray(hexes)
+        data['array_others'] = chroma.ColorArray(hexes[::-1])
+
+
+def cases():
+    """(name, statement, colors per execution)"""
+    batch = len(data['colors'])
+
+    for format in FORMATS:
+        yield ('construct.%s' % format, "Color(data[%r], %r)" % (format, format), 1)
+        yield ('construct.%s.batch' % format,
+               "for v in data[%r]: Color(v, %r)" % (format + '_many', format), batch)
+
+    for name in PROPERTIES:
+        format = name.upper()
+        yield ('get.%s' % name, "data['color'].%s" % name, 1)
+        yield ('get.%s.batch' % name, "for c in data['colors']: c.%s" % name, batch)
+        yield ('set.%s' % name, "data['color'].%s = data[%r]" % (name, format), 1)
+        yield ('set.%s.batch' % name,
+               "for c, v in zip(data['colors'], data[%r]): c.%s = v" % (format + '_many', name), batch)
+
+    yield ('eq', "data['color'] == data['other']", 1)
+    yield ('eq.batch', "for c, o in zip(data['colors'], data['others']): c == o", batch)
+
+    for name, operator in (('additive', '+'), ('subtractive', '-')):
+        yield ('mix.%s' % name, "data['color'] %s data['other']" % operator, 1)
+        yield ('mix.%s.batch' % name,
+               "for c, o in zip(data['colors'], data['others']): c %s o" % operator, batch)
+        yield ('mix_many.%s.batch' % name, "mix_many(data['colors'], %r)" % name, batch)
+
+    if 'array' in data:
+        for format in FORMATS:
+            yield ('array.construct.%s.batch' % format,
+                   "ColorArray(data[%r], %r)" % (format + '_many', format), batch)
+        for name in PROPERTIES:
+            yield ('array.get.%s.batch' % name, "data['array'].%s" % name, batch)
+        for name, operator in (('additive', '+'), ('subtractive', '-')):
+            yield ('array.mix.%s.batch' % name, "data['array'] %s data['array_others']" % operator, batch)
+            yield ('array.mix_many.%s.batch' % name, "mix_many(data['array'], %r)" % name, batch)
+
+
+def run(number, repeat, batch_size, match=None):
+    """Seconds per color for every case, best of repeat runs"""
+    prepare(batch_size)
+    setup = SETUP + '; from chroma import ColorArray' if 'array' in data else SETUP
+
+    results = {}
+    for name, statement, colors in cases():
+        if match and match not in name:
+            continue
+        # Batches run once per repeat, scalar statements number times
+        executions = number if colors == 1 else 1
+        best = min(timeit.repeat(statement, setup, repeat=repeat, number=executions))
+        results[name] = best / executions / colors
+        sys.stderr.write('%-36s %12.3f us\n' % (name, results[name] * 1e6))
+    return results
+
+
+def compare(results, previous, threshold):
+    """Print the change per case, returns the names that slowed by more than threshold"""
+    regressions = []
+    print('%-36s %12s %12s %8s' % ('case', 'before us', 'after us', 'change'))
+    for name in sorted(results):
+        if name not in previous:
+            continue
+        before, after = previous[name], results[name]
+        change = after / before - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('%-36s %12.3f %12.3f %+7.1f%%%s' % (name, before * 1e6, after * 1e6, change * 100, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the Color hot paths')
+    parser.add_argument('-o', '--output', default='benchmark.json',
+                        help='write results to this JSON file (default: benchmark.json)')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare against a previous results file')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='slowdown reported as a regression (default: 0.10, 10%%)')
+    parser.add_argument('-n', '--number', type=int, default=20000,
+                        help='executions per scalar timing (default: 20000)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='timings per case, the best is kept (default: 5)')
+    parser.add_argument('-b', '--batch', type=int, default=10000,
+                        help='colors per batch (default: 10000)')
+    parser.add_argument('-k', dest='match', help='only run cases whose name contains this')
+    args = parser.parse_args(argv)
+
+    results = run(args.number, args.repeat, args.batch, args.match)
+    report = {
+        'meta': {
+            'chroma': chroma.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'numpy': 'array' in data,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'number': args.number,
+            'repeat': args.repeat,
+            'batch': args.batch,
+        },
+        'unit': 'seconds per color',
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+        if compare(results, previous, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
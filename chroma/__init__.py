@@ -7,6 +7,29 @@ Main module
 """
 
 from .core import *
+from . import instrument
+
+# Bulk containers need NumPy, which is optional
+try:
+    import numpy as _numpy
+except ImportError:
+    _numpy = None
+
+if _numpy is not None:
+    from .array import ColorArray
+    from .parallel import convert_many
+    from .palette import Palette
+    from .buffer import PixelBuffer
+    from .lut import LUT3D
+    from .blending import blend
+    from .histogram import ColorHistogram
+    from .colorfile import ColorFile
+    from .delta_e import delta_e_cie76, delta_e_cie94, delta_e_ciede2000
+    from .contrast import contrast_matrix, contrast_pairs
+    from .stats import ColorStats
+    from .grouping import cluster, dedupe
+    from .extract import extract_palette
+    from .quantize import quantize
 
 __title__ = 'chroma'
 __version__ = '0.2.0'
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.__main__
+~~~~~~~~~~~~~~~~
+
+Command line converter:
+
+    python -m chroma --from HEX --to HLS colors.txt > hls.csv
+
+"""
+
+import argparse
+import fileinput
+import sys
+import time
+
+from .stream import FORMATS, LAYOUTS, convert_stream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m chroma',
+        description='Convert a stream of colors between formats, one color per line')
+    parser.add_argument('files', nargs='*', help='input files (default: stdin)')
+    parser.add_argument('--from', dest='src', default='HEX', type=str.upper, choices=FORMATS,
+                        help='input format (default: HEX)')
+    parser.add_argument('--to', dest='dst', default='HLS', type=str.upper, choices=FORMATS,
+                        help='output format (default: HLS)')
+    parser.add_argument('--input', default='csv', choices=LAYOUTS,
+                        help='input layout (default: csv)')
+    parser.add_argument('--output', choices=LAYOUTS,
+                        help='output layout (default: same as input)')
+    parser.add_argument('--chunk-size', type=_positive_int, default=100000,
+                        help='rows converted at a time (default: 100000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='convert chunks in this many processes (default: 1)')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not report throughput on stderr')
+    args = parser.parse_args(argv)
+
+    # Invalid lines (e.g. a header) are reported and skipped, the exit
+    # status is 1 if there were any
+    skipped = []
+
+    def report(line_number, message):
+        skipped.append(line_number)
+        sys.stderr.write('chroma: line %d skipped: %s\n' % (line_number, message))
+
+    start = time.time()
+    try:
+        count = convert_stream(fileinput.input(args.files), sys.stdout.write,
+                               args.src, args.dst, args.input, args.output or args.input,
+                               args.chunk_size, args.workers, report)
+    except ValueError as e:
+        parser.exit(1, 'chroma: %s\n' % (e))
+    elapsed = time.time() - start
+
+    if not args.quiet:
+        sys.stderr.write('%d rows in %.2fs (%.0f rows/s)\n'
+                         % (count, elapsed, count / elapsed if elapsed else 0))
+    if skipped:
+        parser.exit(1, 'chroma: %d invalid lines skipped\n' % (len(skipped)))
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError('must be at least 1, got %d' % (value))
+    return value
+
+
+if __name__ == '__main__':
+    main()
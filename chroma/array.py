@@ -0,0 +1,692 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.array
+~~~~~~~~~~~~~
+
+Provides ColorArray object (requires NumPy)
+
+"""
+
+# Arrays are assumed to be passed and returned, one color per row
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from . import core
+from .core import Color, _ALPHA_KEY_FLAG
+from .names import _NAMED, _NAMED_INTS, int_from_name
+
+ONE_THIRD = 1.0 / 3.0
+ONE_SIXTH = 1.0 / 6.0
+TWO_THIRD = 2.0 / 3.0
+
+# CIE XYZ / Lab constants, see chroma.core
+_RGB_TO_XYZ = np.array(core._RGB_TO_XYZ)
+_XYZ_TO_RGB = np.array(core._XYZ_TO_RGB)
+_D65_WHITE = np.array(core._D65_WHITE)
+_LAB_EPSILON = core._LAB_EPSILON
+_LAB_DELTA = core._LAB_DELTA
+_LUMINANCE_WEIGHTS = np.array(core._LUMINANCE_WEIGHTS)
+
+# 8-bit sRGB value -> linear light, so 8-bit input needs no pow per component
+_SRGB_TO_LINEAR_8BIT = np.array([core._srgb_to_linear(i / 255.0) for i in range(256)])
+
+# Distinct named colors (see chroma.names), and their index once built
+_NAME_ARRAY = np.array(_NAMED)
+_NAME_INDEX = []
+
+# ASCII code -> hex digit value, 255 marks an invalid character
+_HEX_NIBBLES = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate('0123456789abcdef'):
+    _HEX_NIBBLES[ord(_c)] = _i
+    _HEX_NIBBLES[ord(_c.upper())] = _i
+
+# Hex digit value -> uppercase ASCII code
+_HEX_DIGITS = np.frombuffer(b'0123456789ABCDEF', dtype=np.uint8)
+
+# Bytes of a hex buffer parsed at a time (cut at a newline)
+HEX_BUFFER_CHUNK = 1 << 24
+
+# High bits of the first 8 / 6 hex nibbles of a line, read as a uint64
+_HIGH_BITS_8 = np.uint64(0xF0F0F0F0F0F0F0F0)
+_HIGH_BITS_6 = np.uint64(0x0000F0F0F0F0F0F0)
+
+
+class ColorArray(object):
+    """
+    Chroma ColorArray stores many colors at once, given in any format
+    accepted by Color, and converts them with whole-array operations
+    """
+    def __init__(self, color_values=(), format='HEX'):
+        # self.color is main storage (N x 3 array in RGB float form)
+        # HEX and NAME input take a sequence of strings, the other formats take
+        # anything convertible to an N x 3 (or N x 4 with alpha) array
+
+        self.color = np.ones((0, 3))
+        # If alpha is None, it is unset for every color in the array
+        # Otherwise it is an array of length N
+        self._alpha = None
+
+        format = format.upper()
+        if format == 'HEX':
+            self.hex = color_values
+        elif format == 'RGB':
+            self.rgb = color_values
+        elif format == 'RGB256':
+            self.rgb256 = color_values
+        elif format == 'HLS':
+            self.hls = color_values
+        elif format == 'HSV':
+            self.hsv = color_values
+        elif format == 'CMY':
+            self.cmy = color_values
+        elif format == 'CMYK':
+            self.cmyk = color_values
+        elif format == 'XYZ':
+            self.xyz = color_values
+        elif format == 'LAB':
+            self.lab = color_values
+        elif format == 'NAME':
+            self.name = color_values
+        else:
+            raise ValueError('Unsupported chroma.ColorArray format: %s' % (format))
+
+    @classmethod
+    def from_colors(cls, colors):
+        """Build a ColorArray from a sequence of Color objects"""
+        colors = list(colors)
+        array = cls()
+        array.color = np.array([c.color for c in colors], dtype=np.float64).reshape(-1, 3)
+
+        # Alpha is kept only if every color has it set
+        alphas = [c.alpha for c in colors]
+        if colors and None not in alphas:
+            array._alpha = np.array(alphas, dtype=np.float64)
+        return array
+
+    @classmethod
+    def from_hex_buffer(cls, buffer):
+        """
+        Parse a buffer (bytes, bytearray, mmap, ...) of newline separated
+        '#RRGGBB' / '#RRGGBBAA' values, the hash is optional and lines may end
+        in CRLF. Returns (ColorArray, invalid): one row per line, invalid
+        is a boolean array marking the lines that did not parse (left black)
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        size = len(data)
+        chunks = []
+        start = 0
+        while start < size:
+            stop = _next_line_start(data, start + HEX_BUFFER_CHUNK)
+            chunks.append(_parse_hex_lines(data[start:stop]))
+            start = stop
+
+        if chunks:
+            byte = np.concatenate([chunk[0] for chunk in chunks])
+            has_alpha = np.concatenate([chunk[1] for chunk in chunks])
+            invalid = np.concatenate([chunk[2] for chunk in chunks])
+        else:
+            byte = np.zeros((0, 4), dtype=np.uint8)
+            has_alpha = invalid = np.zeros(0, dtype=bool)
+
+        array = cls()
+        array.color = byte[:, :3] / 255.0
+        # As with the HEX format, alpha is kept if any value has it
+        if has_alpha.any():
+            array._alpha = byte[:, 3] / 255.0
+        return array, invalid
+
+    def to_colors(self):
+        """Return a list of Color objects, one per row"""
+        return [self[i] for i in range(len(self))]
+
+    # Container protocol
+    def __len__(self):
+        return len(self.color)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        # Integers return a Color, slices / masks / index arrays a ColorArray
+        if isinstance(index, (int, np.integer)):
+            rgb = tuple(self.color[index].tolist())
+            if self._alpha is not None:
+                rgb += (float(self._alpha[index]),)
+            return Color.from_rgb_unchecked(rgb)
+
+        array = ColorArray()
+        array.color = self.color[index]
+        if self._alpha is not None:
+            array._alpha = self._alpha[index]
+        return array
+
+    # Additive / subtractive mixing, row by row
+    # A Color (or single row ColorArray) is mixed into every row
+    def __add__(self, other):
+        return self.additive_mix(other)
+
+    def __radd__(self, other):
+        return self.additive_mix(other)
+
+    def __sub__(self, other):
+        return self.subtractive_mix(other)
+
+    def __rsub__(self, other):
+        return self.subtractive_mix(other)
+
+    # Representation
+    def __repr__(self):
+        return 'ColorArray(%s)' % (self.hex,)
+
+    #
+    # Properties
+    #
+
+    # RGB
+    # RGB is used as base, other formats will modify input into RGB and invoke
+    # RGB getters / setters
+    @property
+    def rgb(self):
+        return self._append_alpha_if_necessary(self.color)
+
+    @property
+    def rgb256(self):
+        rgb256 = _round(self.color * 255).astype(np.int64)
+        if self._alpha is not None:
+            # Alpha stays in range 0-1, as with Color.rgb256
+            return np.column_stack((rgb256, self._alpha))
+        return rgb256
+
+    @rgb.setter
+    def rgb(self, color_array):
+        """Used as main setter (rgb256, hls, hsv, cmy, cmyk, hex)"""
+        color_array = _as_color_array(color_array)
+        self.color = _apply_float_bounds(color_array[:, :3])
+
+        # Include alpha if necessary
+        if color_array.shape[1] > 3:
+            self.alpha = color_array[:, 3]
+
+    @rgb256.setter
+    def rgb256(self, color_array):
+        color_array = _as_color_array(color_array)
+        rgb = color_array[:, :3] / 255.0
+
+        # Alpha is given in range 0-1, it is not scaled
+        if color_array.shape[1] > 3:
+            rgb = np.column_stack((rgb, color_array[:, 3]))
+
+        self.rgb = rgb
+
+    # HLS
+    @property
+    def hls(self):
+        """
+        HLS: (Hue°, Lightness%, Saturation%)
+        Hue given as percent of 360, Lightness and Saturation given as percent
+        """
+        h, l, s = _rgb_to_hls(self.color)
+        hls = np.column_stack((_round(h * 360), l, s))
+        return self._append_alpha_if_necessary(hls)
+
+    @hls.setter
+    def hls(self, color_array):
+        color_array = _as_color_array(color_array)
+        h, l, s = (_apply_float_bounds(color_array[:, 0] / 360.0),
+                   _apply_float_bounds(color_array[:, 1]),
+                   _apply_float_bounds(color_array[:, 2]))
+        self.rgb = self._with_alpha_column(_hls_to_rgb(h, l, s), color_array)
+
+    # HSV
+    @property
+    def hsv(self):
+        """
+        HSV: (Hue°, Saturation%, Value%)
+        Hue given as percent of 360, Saturation and Value given as percent
+        """
+        h, s, v = _rgb_to_hsv(self.color)
+        hsv = np.column_stack((_round(h * 360), s, v))
+        return self._append_alpha_if_necessary(hsv)
+
+    @hsv.setter
+    def hsv(self, color_array):
+        color_array = _as_color_array(color_array)
+        h, s, v = (_apply_float_bounds(color_array[:, 0] / 360.0),
+                   _apply_float_bounds(color_array[:, 1]),
+                   _apply_float_bounds(color_array[:, 2]))
+        self.rgb = self._with_alpha_column(_hsv_to_rgb(h, s, v), color_array)
+
+    # CMY / CMYK
+    @property
+    def cmy(self):
+        """
+        CMY: returned in range 0.0 - 1.0
+        CMY is subtractive, e.g. black: (1, 1, 1), white (0, 0, 0)
+        """
+        return 1 - self.color
+
+    @cmy.setter
+    def cmy(self, color_array):
+        cmy = _apply_float_bounds(_as_color_array(color_array)[:, :3])
+        self.rgb = 1 - cmy
+
+    @property
+    def cmyk(self):
+        """CMYK: all returned in range 0.0 - 1.0"""
+        cmy = self.cmy
+        k = cmy.min(axis=1)
+
+        # Handle division by zero in case of black = 1
+        black = k == 1
+        denominator = np.where(black, 1.0, 1 - k)[:, np.newaxis]
+        cmy = (cmy - k[:, np.newaxis]) / denominator
+        cmy[black] = 1
+
+        # Apply bound and return
+        return _apply_float_bounds(np.column_stack((cmy, k)))
+
+    @cmyk.setter
+    def cmyk(self, color_array):
+        cmyk = _apply_float_bounds(_as_color_array(color_array, 4)[:, :4])
+        k = cmyk[:, 3:]
+        self.cmy = cmyk[:, :3] * (1 - k) + k
+
+    # CIE XYZ / Lab
+    @property
+    def xyz(self):
+        """CIE XYZ (D65), alpha is not appended"""
+        return _rgb_to_xyz(self.color)
+
+    @xyz.setter
+    def xyz(self, color_array):
+        xyz = _as_color_array(color_array)[:, :3]
+        # Colors outside the sRGB gamut are clipped
+        self.rgb = _linear_to_srgb(_apply_float_bounds(xyz.dot(_XYZ_TO_RGB.T)))
+
+    @property
+    def lab(self):
+        """CIE Lab (D65), alpha is not appended"""
+        return _xyz_to_lab(self.xyz)
+
+    @lab.setter
+    def lab(self, color_array):
+        lab = _as_color_array(color_array)
+        fy = (lab[:, 0] + 16) / 116.0
+        f = np.column_stack((fy + lab[:, 1] / 500.0, fy, fy - lab[:, 2] / 200.0))
+        t = np.where(f > _LAB_DELTA, f ** 3, 3 * _LAB_DELTA ** 2 * (f - 4.0 / 29.0))
+        self.xyz = t * _D65_WHITE
+
+    # Luminance (WCAG 2 relative luminance)
+    @property
+    def luminance(self):
+        """Relative luminance of every row, as an N array"""
+        return _srgb_to_linear(self.color).dot(_LUMINANCE_WEIGHTS)
+
+    # HEX
+    @property
+    def hex(self):
+        """List of hex strings, '#RRGGBB' or '#RRGGBBAA' if alpha is set"""
+        rgb = self.color
+        if self._alpha is not None:
+            rgb = np.column_stack((rgb, self._alpha))
+        return _format_hex(_round(rgb * 255).astype(np.uint8))
+
+    @hex.setter
+    def hex(self, color_values):
+        self.rgb = _rgb_from_hex(color_values)
+
+    # Name
+    @property
+    def name(self):
+        """List of names, as Color.name gives for each row"""
+        points = _round(self.color * 255)
+        return _NAME_ARRAY.take(_name_index().query(points)).tolist()
+
+    @name.setter
+    def name(self, names):
+        values = np.array([int_from_name(name) for name in names], dtype=np.int64)
+        byte = np.column_stack((values >> 16, (values >> 8) & 0xFF, values & 0xFF))
+        self.rgb = byte.reshape(-1, 3) / 255.0
+
+    # Alpha
+    @property
+    def alpha(self):
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, value):
+        if value is None:
+            self._alpha = None
+            return
+
+        # Scalars apply to every color
+        alpha = np.empty(len(self.color))
+        alpha[:] = value
+        self._alpha = _apply_float_bounds(alpha)
+
+    #
+    # Color Functions
+    # Same clamping as the Color methods, without a Color per row
+    #
+
+    # Additive (Light) Mixing
+    def additive_mix(self, other):
+        other = _mix_operand(other)
+        mix = ColorArray()
+        mix.color = _apply_float_bounds(self.color + other.color)
+        # Alpha is summed only when both sides have it, as with Color
+        if self._alpha is not None and other._alpha is not None:
+            mix._alpha = _apply_float_bounds(self._alpha + other._alpha)
+        return mix
+
+    # Subtractive (Dye, Multiplicative) Mixing
+    def subtractive_mix(self, other):
+        other = _mix_operand(other)
+        mix = ColorArray()
+        mix.color = 1 - _apply_float_bounds((1 - self.color) + (1 - other.color))
+        return mix
+
+    def mix(self, mode='additive'):
+        """Mix every row into a single Color, see chroma.mix_many"""
+        if not len(self):
+            raise ValueError('Nothing to mix')
+
+        if mode == 'additive':
+            rgb = np.minimum(self.color.sum(axis=0), 1.0)
+            alpha = None
+            if self._alpha is not None:
+                alpha = min(float(self._alpha.sum()), 1.0)
+            return Color._new(tuple(rgb.tolist()), alpha)
+        elif mode == 'subtractive':
+            cmy = np.minimum((1 - self.color).sum(axis=0), 1.0)
+            return Color._new(tuple((1 - cmy).tolist()))
+        raise ValueError('Unsupported mix mode: %s' % (mode))
+
+    #
+    # INTERNAL
+    #
+    def _keys(self):
+        """Color._key for every row, as an int64 array"""
+        rgb = _round(self.color * 255).astype(np.int64)
+        keys = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+        if self._alpha is not None:
+            alpha = _round(self._alpha * 255).astype(np.int64)
+            keys = _ALPHA_KEY_FLAG | (keys << 8) | alpha
+        return keys
+
+    def _unique_keys(self):
+        """Distinct keys and how often each occurs"""
+        return np.unique(self._keys(), return_counts=True)
+
+    def _append_alpha_if_necessary(self, color_array):
+        """Return color_array with an alpha column if self.alpha is not None"""
+        if self._alpha is not None:
+            return np.column_stack((color_array, self._alpha))
+        return color_array
+
+    def _with_alpha_column(self, rgb, color_array):
+        """Carry the alpha column of color_array (if any) over to rgb"""
+        if color_array.shape[1] > 3:
+            return np.column_stack((rgb, color_array[:, 3]))
+        return rgb
+
+
+#
+# Vectorized conversions
+# Each mirrors the scalar code path in Color / colorsys
+#
+
+def _mix_operand(other):
+    """ColorArray to mix with, a Color becomes a single row"""
+    if isinstance(other, Color):
+        return ColorArray.from_colors([other])
+    if isinstance(other, ColorArray):
+        return other
+    raise ValueError('Cannot mix a ColorArray with %r' % (other,))
+
+
+def _as_color_array(color_values, width=3):
+    """Coerce input into a 2D float array with at least `width` columns"""
+    array = np.asarray(color_values, dtype=np.float64)
+    if array.ndim == 1 and array.size == 0:
+        array = array.reshape(0, width)
+    if array.ndim != 2 or array.shape[1] < width:
+        raise ValueError('Expected an N x %d color array, got shape %s'
+                         % (width, array.shape))
+    return array
+
+
+def _apply_float_bounds(array):
+    """Assure every coordinate is a float between 0 to 1"""
+    return np.clip(array, 0.0, 1.0)
+
+
+if isinstance(round(0.5), int):
+    def _round(array):
+        """Nearest integers, halves to even as core._round on Python 3"""
+        return np.rint(array)
+else:
+    def _round(array):
+        """Nearest integers, halves away from zero as core._round on Python 2"""
+        magnitude = np.abs(array)
+        whole = np.floor(magnitude)
+        return np.copysign(whole + (magnitude - whole >= 0.5), array)
+
+
+def _hue(rgb, maxc, rangec):
+    """Hue in range 0 - 1, as computed by colorsys (undefined for grays)"""
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    h = np.where(r == maxc, bc - gc,
+                 np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    return (h / 6.0) % 1.0
+
+
+def _rgb_to_hls(rgb):
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    rangec = maxc - minc
+    l = (minc + maxc) / 2.0
+
+    gray = minc == maxc
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(l <= 0.5, rangec / (maxc + minc), rangec / (2.0 - maxc - minc))
+        h = _hue(rgb, maxc, rangec)
+    s[gray] = 0.0
+    h[gray] = 0.0
+    return h, l, s
+
+
+def _hls_channel(m1, m2, hue):
+    hue = hue % 1.0
+    return np.select([hue < ONE_SIXTH, hue < 0.5, hue < TWO_THIRD],
+                     [m1 + (m2 - m1) * hue * 6.0, m2,
+                      m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0],
+                     m1)
+
+
+def _hls_to_rgb(h, l, s):
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+    rgb = np.column_stack((_hls_channel(m1, m2, h + ONE_THIRD),
+                           _hls_channel(m1, m2, h),
+                           _hls_channel(m1, m2, h - ONE_THIRD)))
+    gray = s == 0.0
+    rgb[gray] = l[gray, np.newaxis]
+    return rgb
+
+
+def _rgb_to_hsv(rgb):
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    rangec = maxc - minc
+
+    gray = minc == maxc
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = rangec / maxc
+        h = _hue(rgb, maxc, rangec)
+    s[gray] = 0.0
+    h[gray] = 0.0
+    return h, s, maxc
+
+
+def _hsv_to_rgb(h, s, v):
+    i = np.floor(h * 6.0)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+
+    r = np.choose(i, (v, q, p, p, t, v))
+    g = np.choose(i, (t, v, v, q, p, p))
+    b = np.choose(i, (p, p, t, v, v, q))
+    return np.column_stack((r, g, b))
+
+
+def _srgb_to_linear(rgb):
+    # Exact 8-bit values (anything from hex or rgb256) come from the table
+    byte = (rgb * 255 + 0.5).astype(np.uint8)
+    if np.array_equal(byte / 255.0, rgb):
+        return _SRGB_TO_LINEAR_8BIT.take(byte)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(linear):
+    return np.where(linear <= 0.0031308, linear * 12.92,
+                    1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def _rgb_to_xyz(rgb):
+    return _srgb_to_linear(rgb).dot(_RGB_TO_XYZ.T)
+
+
+def _xyz_to_lab(xyz):
+    t = xyz / _D65_WHITE
+    f = np.where(t > _LAB_EPSILON, np.cbrt(t), t / (3 * _LAB_DELTA ** 2) + 4.0 / 29.0)
+    return np.column_stack((116 * f[:, 1] - 16,
+                            500 * (f[:, 0] - f[:, 1]),
+                            200 * (f[:, 1] - f[:, 2])))
+
+
+def _rgb_from_hex(color_values):
+    """Parse a sequence of '#RRGGBB' / '#RRGGBBAA' strings into RGB(A) floats"""
+    if isinstance(color_values, (str, bytes)):
+        color_values = [color_values]
+    color_values = list(color_values)
+    if not color_values:
+        return np.ones((0, 3))
+
+    digits = [_hex_digits(value) for value in color_values]
+    lengths = np.array([len(d) for d in digits])
+    wrong_length = (lengths != 6) & (lengths != 8)
+    if wrong_length.any():
+        raise ValueError('Invalid Hex Input: %s' % (color_values[np.argmax(wrong_length)]))
+
+    # Fixed width ASCII view, 6 digit values are padded with zero bytes
+    raw = np.array(digits, dtype='S8').view(np.uint8).reshape(-1, 8)
+    nibbles = _HEX_NIBBLES[raw]
+    has_alpha = lengths == 8
+    nibbles[~has_alpha, 6:] = 15
+    invalid = (nibbles == 255).any(axis=1)
+    if invalid.any():
+        raise ValueError('Invalid Hex Input: %s' % (color_values[np.argmax(invalid)]))
+
+    rgba = (nibbles[:, 0::2] * 16 + nibbles[:, 1::2]) / 255.0
+
+    # Alpha is kept if any value has it, values without it are opaque
+    if has_alpha.any():
+        return rgba
+    return rgba[:, :3]
+
+
+def _name_index():
+    """Nearest neighbour index over the named colors in 8-bit RGB"""
+    if not _NAME_INDEX:
+        # Imported here, chroma.palette imports this module
+        from .palette import _GridIndex
+        values = np.array(_NAMED_INTS)
+        points = np.column_stack((values >> 16, (values >> 8) & 0xFF, values & 0xFF))
+        # Finer than the default grid, fewer candidates per query
+        _NAME_INDEX.append(_GridIndex(points, (0, 0, 0), (255, 255, 255), cells=12))
+    return _NAME_INDEX[0]
+
+
+def _hex_digits(color_value):
+    """ASCII bytes of a hex value with the leading hash removed"""
+    try:
+        if not isinstance(color_value, bytes):
+            color_value = ('%s' % (color_value,)).encode('ascii')
+    except UnicodeError:
+        raise ValueError('Invalid Hex Input: %s' % (color_value))
+
+    if color_value[:1] == b'#':
+        return color_value[1:]
+    return color_value
+
+
+def _next_line_start(data, position):
+    """Offset just past the first newline at or after position (or the end)"""
+    size = len(data)
+    step = 1 << 16
+    while position < size:
+        newlines = np.flatnonzero(data[position:position + step] == 10)
+        if len(newlines):
+            return position + int(newlines[0]) + 1
+        position += step
+        step *= 2
+    return size
+
+
+def _parse_hex_lines(data):
+    """
+    Parse whole lines of hex values, returns N x 4 uint8 (alpha 255 when
+    missing), which rows have alpha, and which rows are invalid
+    """
+    ends = np.flatnonzero(data == 10)
+    # A last line without a newline still counts, a trailing newline does not
+    if len(data) and data[-1] != 10:
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.intp)
+
+    # Trim a carriage return and the optional '#', only on non-empty lines;
+    # the padding lets every line be read as eight digits
+    padded = np.concatenate((data, np.zeros(8, dtype=np.uint8)))
+    ends = ends - (padded[np.maximum(ends - 1, 0)] == 13) * (ends > starts)
+    starts = starts + (padded[starts] == 35) * (ends > starts)
+    lengths = ends - starts
+    has_alpha = lengths == 8
+
+    # Eight digits per line, read past short lines and fixed up below. Rows
+    # of a sliding window view copy whole 8 byte runs, not byte by byte
+    windows = as_strided(padded, shape=(len(data) + 1, 8), strides=(1, 1))
+    nibbles = _HEX_NIBBLES[windows[starts]]
+
+    # Digits are 0 - 15 and anything else maps to 255, so a line is invalid
+    # when any high bit is set among its digits: one test per line on the
+    # eight nibbles read as a (little-endian) uint64
+    high_bits = np.where(has_alpha, _HIGH_BITS_8, _HIGH_BITS_6)
+    invalid = (nibbles.view('<u8').ravel() & high_bits) != 0
+    invalid |= (lengths != 6) & ~has_alpha
+    nibbles[invalid] = 0
+
+    byte = (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+    byte[:, 3] = np.where(has_alpha | invalid, byte[:, 3], 255)
+    return byte, has_alpha & ~invalid, invalid
+
+
+def _format_hex(bytes_array):
+    """Format an N x 3 (or N x 4) uint8 array as uppercase '#RRGGBB(AA)' strings"""
+    n, channels = bytes_array.shape
+    width = 1 + 2 * channels
+    ascii = np.empty((n, width), dtype=np.uint8)
+    ascii[:, 0] = ord('#')
+    ascii[:, 1::2] = _HEX_DIGITS[bytes_array >> 4]
+    ascii[:, 2::2] = _HEX_DIGITS[bytes_array & 15]
+    return ascii.view('S%d' % width).ravel().astype(str).tolist()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.blending
+~~~~~~~~~~~~~~~~
+
+Provides alpha compositing and blend modes in linear light (requires NumPy)
+
+"""
+
+# Colors are decoded from sRGB to linear light, blended and composited
+# there, then encoded back. Decoding 8-bit values is a lookup in the
+# 256 entry table ColorArray already uses; encoding interpolates in a 4096
+# entry table, within 0.005 of an 8-bit step of the exact curve
+
+import numpy as np
+
+from .core import Color
+from .array import (ColorArray, _SRGB_TO_LINEAR_8BIT, _apply_float_bounds,
+                    _linear_to_srgb, _srgb_to_linear)
+from .buffer import PixelBuffer, _BYTE_TO_FLOAT_ARRAY
+
+MODES = ('over', 'multiply', 'screen', 'overlay')
+
+# Linear light sampled at 4096 points -> sRGB, and the step to the next entry
+_ENCODE_SIZE = 4096
+_LINEAR_TO_SRGB = _linear_to_srgb(np.linspace(0.0, 1.0, _ENCODE_SIZE))
+_LINEAR_TO_SRGB_STEP = np.append(np.diff(_LINEAR_TO_SRGB), 0.0)
+
+
+def blend(top, bottom, mode='over'):
+    """
+    Composite top over bottom (Porter-Duff source over), after blending the
+    two with mode where they overlap
+    top, bottom: Color, ColorArray or PixelBuffer, a single Color is used
+    against every row of the other
+    Colors without alpha are opaque; the result has alpha if either input has
+    Returns a Color if both are Colors, a ColorArray otherwise
+    """
+    if mode not in MODES:
+        raise ValueError('Unsupported blend mode: %s' % (mode))
+
+    top_rgb, top_alpha = _linear(top)
+    bottom_rgb, bottom_alpha = _linear(bottom)
+
+    if mode != 'over':
+        mixed = _BLEND_FUNCTIONS[mode](bottom_rgb, top_rgb)
+        # Where the backdrop is transparent the top color shows unblended
+        if bottom_alpha is None:
+            top_rgb = mixed
+        else:
+            top_rgb = top_rgb + bottom_alpha[:, np.newaxis] * (mixed - top_rgb)
+
+    rgb, alpha = _over(top_rgb, top_alpha, bottom_rgb, bottom_alpha)
+
+    result = ColorArray()
+    result.color = _encode(rgb)
+    if alpha is not None:
+        result._alpha = alpha
+    if isinstance(top, Color) and isinstance(bottom, Color):
+        return result[0]
+    return result
+
+
+def over(top, bottom):
+    """Porter-Duff source over"""
+    return blend(top, bottom, 'over')
+
+
+def multiply(top, bottom):
+    return blend(top, bottom, 'multiply')
+
+
+def screen(top, bottom):
+    return blend(top, bottom, 'screen')
+
+
+def overlay(top, bottom):
+    return blend(top, bottom, 'overlay')
+
+
+#
+# INTERNAL
+#
+
+def _linear(colors):
+    """Linear light N x 3 array and alpha (or None)"""
+    if isinstance(colors, Color):
+        colors = ColorArray.from_colors([colors])
+    elif isinstance(colors, PixelBuffer):
+        # Straight from the bytes, no float sRGB step
+        pixels = colors.pixels
+        alpha = None
+        if colors.channels == 4:
+            alpha = _BYTE_TO_FLOAT_ARRAY.take(pixels[:, 3])
+        return _SRGB_TO_LINEAR_8BIT.take(pixels[:, :3]), alpha
+    elif not isinstance(colors, ColorArray):
+        raise ValueError('Cannot blend %r' % (colors,))
+    return _srgb_to_linear(colors.color), colors.alpha
+
+
+def _encode(linear):
+    """Linear light -> sRGB by interpolating in the encoding table"""
+    position = _apply_float_bounds(linear) * (_ENCODE_SIZE - 1)
+    index = position.astype(np.intp)
+    return _LINEAR_TO_SRGB.take(index) + (position - index) * _LINEAR_TO_SRGB_STEP.take(index)
+
+
+def _over(top_rgb, top_alpha, bottom_rgb, bottom_alpha):
+    """Source over on straight (not premultiplied) colors"""
+    rows = max(len(top_rgb), len(bottom_rgb))
+    if top_alpha is None:
+        rgb = np.broadcast_to(top_rgb, (rows, 3))
+        alpha = None if bottom_alpha is None else np.ones(rows)
+        return rgb, alpha
+
+    a_top = top_alpha[:, np.newaxis]
+    a_bottom = 1.0 if bottom_alpha is None else bottom_alpha[:, np.newaxis]
+    a_out = np.broadcast_to(a_top + a_bottom * (1 - a_top), (rows, 1))
+
+    premultiplied = top_rgb * a_top + bottom_rgb * a_bottom * (1 - a_top)
+    rgb = np.zeros((rows, 3))
+    np.divide(premultiplied, a_out, out=rgb, where=a_out > 0)
+    return rgb, a_out[:, 0].copy()
+
+
+def _multiply(backdrop, source):
+    return backdrop * source
+
+
+def _screen(backdrop, source):
+    return backdrop + source - backdrop * source
+
+
+def _overlay(backdrop, source):
+    return np.where(backdrop <= 0.5, 2 * backdrop * source,
+                    1 - 2 * (1 - backdrop) * (1 - source))
+
+
+_BLEND_FUNCTIONS = {
+    'multiply': _multiply,
+    'screen': _screen,
+    'overlay': _overlay,
+}
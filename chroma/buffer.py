@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.buffer
+~~~~~~~~~~~~~~
+
+Provides PixelBuffer, zero-copy access to raw 8-bit pixels (requires NumPy)
+
+"""
+
+import mmap
+
+import numpy as np
+
+from .core import Color, _BYTE_TO_FLOAT
+from .array import ColorArray, _format_hex
+
+# Byte (0 - 255) -> float in range 0 - 1, same values Color uses
+_BYTE_TO_FLOAT_ARRAY = np.array(_BYTE_TO_FLOAT)
+
+# Pixels converted at a time by the whole-buffer properties
+CHUNK_SIZE = 1 << 20
+
+
+class PixelBuffer(object):
+    """
+    Chroma PixelBuffer wraps packed 8-bit RGB or RGBA pixels held in any
+    object with the buffer protocol (bytes, bytearray, mmap, memoryview,
+    arrays), without copying them
+    """
+    def __init__(self, buffer, channels=3):
+        if channels not in (3, 4):
+            raise ValueError('PixelBuffer channels must be 3 (RGB) or 4 (RGBA)')
+
+        try:
+            pixels = np.frombuffer(buffer, dtype=np.uint8)
+        except AttributeError:
+            # NumPy on Python 2 reads memoryview only through PEP 3118
+            pixels = np.asarray(buffer).view(np.uint8).ravel()
+        if pixels.size % channels:
+            raise ValueError('Buffer size %d is not a multiple of %d channels'
+                             % (pixels.size, channels))
+
+        # self.pixels is an N x channels uint8 view of the buffer
+        self.pixels = pixels.reshape(-1, channels)
+        self.channels = channels
+        # Keep the buffer (and mmap, if opened here) alive with the view
+        self._buffer = buffer
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path, channels=3):
+        """Memory map a raw pixel file read-only, pages load as they are read"""
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return cls(b'', channels)
+
+        pixel_buffer = cls(mapped, channels)
+        pixel_buffer._mmap = mapped
+        return pixel_buffer
+
+    def close(self):
+        """
+        Release the file mapping made by open()
+        Slices and pixel arrays taken from this buffer must be released
+        first: while one is alive BufferError is raised and the buffer stays
+        open (Python 2 cannot tell, so the mapping is unmapped under them)
+        """
+        mapped = self._mmap
+        if mapped is None:
+            return
+
+        # Drop this buffer's own view of the mapping, then try to unmap it
+        self.pixels = self.pixels[:0].copy()
+        try:
+            mapped.close()
+        except BufferError:
+            self.pixels = np.frombuffer(mapped, dtype=np.uint8).reshape(-1, self.channels)
+            raise BufferError('PixelBuffer is still in use by a slice or pixel array, '
+                              'release those before closing it')
+        self._buffer = None
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Container protocol
+    def __len__(self):
+        return len(self.pixels)
+
+    def __getitem__(self, index):
+        # Integers return a Color, slices a PixelBuffer over the same memory
+        if isinstance(index, slice):
+            view = PixelBuffer.__new__(PixelBuffer)
+            view.pixels = self.pixels[index]
+            view.channels = self.channels
+            view._buffer = self._buffer
+            view._mmap = None
+            return view
+
+        return Color.from_rgb_unchecked(tuple([_BYTE_TO_FLOAT[x] for x in self.pixels[index].tolist()]))
+
+    #
+    # Bulk conversion
+    #
+    def to_array(self, start=0, stop=None):
+        """Pixels [start:stop] as a ColorArray (alpha set for RGBA)"""
+        pixels = self.pixels[start:stop]
+        array = ColorArray()
+        array.color = _BYTE_TO_FLOAT_ARRAY[pixels[:, :3]]
+        if self.channels == 4:
+            array._alpha = _BYTE_TO_FLOAT_ARRAY[pixels[:, 3]]
+        return array
+
+    def chunks(self, size=CHUNK_SIZE):
+        """ColorArrays of up to size pixels each, in order"""
+        for start in range(0, len(self), size):
+            yield self.to_array(start, start + size)
+
+    @property
+    def hex(self):
+        """Hex strings, formatted straight from the bytes"""
+        return _format_hex(self.pixels)
+
+    @property
+    def hls(self):
+        return self._convert('hls')
+
+    @property
+    def hsv(self):
+        return self._convert('hsv')
+
+    @property
+    def cmy(self):
+        return self._convert('cmy')
+
+    @property
+    def cmyk(self):
+        return self._convert('cmyk')
+
+    @property
+    def lab(self):
+        return self._convert('lab')
+
+    #
+    # INTERNAL
+    #
+    def _convert(self, name):
+        """Property of ColorArray for every pixel, converted a chunk at a time"""
+        arrays = [getattr(chunk, name) for chunk in self.chunks()]
+        if not arrays:
+            return getattr(self.to_array(), name)
+        return np.concatenate(arrays)
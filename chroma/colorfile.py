@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.colorfile
+~~~~~~~~~~~~~~~~~
+
+Provides ColorFile, a compact binary format for large color collections
+(requires NumPy)
+
+"""
+
+# Layout, all little-endian:
+#   header (32 bytes): magic 'CHRM', version (uint16), encoding (uint8),
+#                      flags (uint8), count, data offset, index offset (uint64)
+#   data:              count x 4 channels, uint8 (rgba8) or float32,
+#                      alpha is 1 (255) when the colors have none
+#   index (optional):  count sorted uint32 keys (0xRRGGBB, 0xRRGGBBAA with
+#                      alpha), then count uint64 row numbers in key order
+# Opening maps the file read-only, rows are only read when accessed
+
+import mmap
+import struct
+
+import numpy as np
+
+from .core import Color
+from .array import ColorArray, _round
+
+MAGIC = b'CHRM'
+VERSION = 1
+ENCODINGS = ('rgba8', 'float32')
+
+_HEADER = struct.Struct('<4sHBBQQQ')
+_DTYPES = {'rgba8': np.dtype('u1'), 'float32': np.dtype('<f4')}
+_FLAG_ALPHA = 1
+_FLAG_INDEX = 2
+
+# Colors converted at a time while writing
+CHUNK_SIZE = 1 << 20
+
+
+class ColorFile(object):
+    """
+    Chroma ColorFile gives lazy random access to a color collection written
+    with ColorFile.write
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError('Not a chroma color file: %s' % (path))
+            magic, version, encoding, flags, count, data_offset, index_offset = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError('Not a chroma color file: %s' % (path))
+            if version > VERSION:
+                raise ValueError('Unsupported color file version %d: %s' % (version, path))
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.encoding = ENCODINGS[encoding]
+        self.has_alpha = bool(flags & _FLAG_ALPHA)
+        # self.data is a count x 4 view of the file
+        self.data = np.frombuffer(self._mmap, _DTYPES[self.encoding], count * 4,
+                                  data_offset).reshape(count, 4)
+
+        self._keys = self._rows = None
+        if flags & _FLAG_INDEX:
+            self._keys = np.frombuffer(self._mmap, '<u4', count, index_offset)
+            self._rows = np.frombuffer(self._mmap, '<u8', count, index_offset + 4 * count)
+
+    @classmethod
+    def open(cls, path):
+        return cls(path)
+
+    @staticmethod
+    def write(path, colors, encoding='rgba8', index=False):
+        """
+        Write colors (ColorArray or iterable of Color objects) to path
+        encoding: 'rgba8' (4 bytes per color, values rounded as hex does)
+        or 'float32' (16 bytes per color)
+        index: also write a sorted key index, for fast ColorFile.index lookups
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError('Unsupported color file encoding: %s' % (encoding))
+        if not isinstance(colors, ColorArray):
+            colors = ColorArray.from_colors(colors)
+
+        count = len(colors)
+        item_size = 4 * _DTYPES[encoding].itemsize
+        data_offset = _HEADER.size
+        index_offset = _align(data_offset + count * item_size) if index else 0
+        flags = (_FLAG_ALPHA if colors.alpha is not None else 0) | (_FLAG_INDEX if index else 0)
+
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, ENCODINGS.index(encoding), flags,
+                                 count, data_offset, index_offset))
+            for start in range(0, count, CHUNK_SIZE):
+                f.write(_encode(colors[start:start + CHUNK_SIZE], encoding).tobytes())
+
+            if index:
+                keys = np.concatenate([_keys(colors[start:start + CHUNK_SIZE], colors.alpha is not None)
+                                       for start in range(0, count, CHUNK_SIZE)] or [np.zeros(0, '<u4')])
+                rows = np.argsort(keys, kind='mergesort')
+                f.write(b'\0' * (index_offset - f.tell()))
+                f.write(keys[rows].astype('<u4').tobytes())
+                f.write(rows.astype('<u8').tobytes())
+
+    def close(self):
+        """Release the file mapping"""
+        if self._mmap is not None:
+            self.data = self.data[:0].copy()
+            self._keys = self._rows = None
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Container protocol
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        # Integers return a Color, slices a ColorArray
+        if isinstance(index, slice):
+            return self.to_array(index.start, index.stop, index.step)
+
+        values = self.data[index].tolist()
+        if self.encoding == 'rgba8':
+            values = [x / 255.0 for x in values]
+        if self.has_alpha:
+            return Color.from_rgb_unchecked(tuple(values))
+        return Color.from_rgb_unchecked(tuple(values[:3]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __contains__(self, color):
+        return self.find(color) >= 0
+
+    def to_array(self, start=None, stop=None, step=None):
+        """Rows [start:stop:step] as a ColorArray"""
+        rows = self.data[start:stop:step]
+        array = ColorArray()
+        values = rows / 255.0 if self.encoding == 'rgba8' else rows.astype(np.float64)
+        array.color = values[:, :3]
+        if self.has_alpha:
+            array._alpha = values[:, 3]
+        return array
+
+    def find(self, color):
+        """
+        First row equal to color (same hex, as with Color equality), or -1
+        Binary search in the index if there is one, otherwise a scan
+        """
+        if (color.alpha is not None) != self.has_alpha:
+            return -1
+        key = color._key() & 0xFFFFFFFF
+
+        if self._keys is not None:
+            position = int(np.searchsorted(self._keys, key))
+            if position < len(self._keys) and self._keys[position] == key:
+                return int(self._rows[position])
+            return -1
+
+        for start in range(0, len(self), CHUNK_SIZE):
+            matches = np.flatnonzero(_keys(self.to_array(start, start + CHUNK_SIZE), self.has_alpha) == key)
+            if len(matches):
+                return start + int(matches[0])
+        return -1
+
+    def index(self, color):
+        """As find, but raises ValueError if color is missing (like list.index)"""
+        row = self.find(color)
+        if row < 0:
+            raise ValueError('%s is not in the color file' % (color))
+        return row
+
+
+#
+# INTERNAL
+#
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _encode(colors, encoding):
+    """count x 4 array to write, alpha 1 when unset"""
+    values = np.ones((len(colors), 4))
+    values[:, :3] = colors.color
+    if colors.alpha is not None:
+        values[:, 3] = colors.alpha
+    if encoding == 'rgba8':
+        return _round(values * 255).astype(np.uint8)
+    return values.astype('<f4')
+
+
+def _keys(colors, alpha):
+    """Color._key without the alpha flag, as uint32"""
+    keys = colors._keys()
+    if alpha:
+        keys = keys & 0xFFFFFFFF
+    return keys.astype(np.uint32)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.contrast
+~~~~~~~~~~~~~~~~
+
+Provides WCAG 2 contrast ratios between many colors at once (requires NumPy)
+
+"""
+
+# The ratio of two colors only depends on their relative luminance, so each
+# side is reduced to one luminance per color first (8-bit values through
+# the 256-entry linearization table). contrast_pairs sorts the background
+# luminances; for every foreground color the passing backgrounds are then a
+# run of darker ones and a run of lighter ones, found by binary search,
+# without building the full N x M matrix
+
+import numpy as np
+
+from .core import Color
+from .array import ColorArray
+
+# Minimum ratio of each WCAG 2 level, _LARGE for large text
+LEVELS = {
+    'AA': 4.5,
+    'AA_LARGE': 3.0,
+    'AAA': 7.0,
+    'AAA_LARGE': 4.5,
+}
+
+
+def contrast_matrix(foreground, background):
+    """
+    N x M array of contrast ratios (1 - 21) between every foreground and
+    background color, each a Color, ColorArray or iterable of Color objects
+    """
+    fg = _luminance(foreground)[:, np.newaxis] + 0.05
+    bg = _luminance(background)[np.newaxis, :] + 0.05
+    return np.maximum(fg, bg) / np.minimum(fg, bg)
+
+
+def contrast_pairs(foreground, background, level='AA'):
+    """
+    Foreground / background pairs reaching a WCAG level ('AA', 'AA_LARGE',
+    'AAA', 'AAA_LARGE') or a minimum ratio, as three arrays:
+    foreground positions, background positions and their ratios, ordered by
+    foreground then background position
+    """
+    threshold = _threshold(level)
+    fg = _luminance(foreground) + 0.05
+    bg = _luminance(background) + 0.05
+
+    order = np.argsort(bg, kind='mergesort')
+    sorted_bg = bg[order]
+
+    # Darker backgrounds pass when bg <= fg / t, lighter when bg >= fg * t;
+    # both bounds get a little slack, the exact ratio decides below
+    slack = 1 + 1e-9
+    dark_stop = np.searchsorted(sorted_bg, fg / threshold * slack, side='right')
+    light_start = np.searchsorted(sorted_bg, fg * threshold / slack, side='left')
+    light_start = np.maximum(light_start, dark_stop)
+
+    # Expand the runs into (foreground, sorted background position) pairs
+    starts = np.concatenate((np.zeros(len(fg), dtype=np.intp), light_start))
+    counts = np.concatenate((dark_stop, len(bg) - light_start))
+    owners = np.tile(np.arange(len(fg)), 2)
+    fg_idx = np.repeat(owners, counts)
+    run_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.arange(len(fg_idx)) - run_offsets + np.repeat(starts, counts)
+    bg_idx = order[positions]
+
+    a, b = fg[fg_idx], bg[bg_idx]
+    ratios = np.maximum(a, b) / np.minimum(a, b)
+    keep = ratios >= threshold
+    fg_idx, bg_idx, ratios = fg_idx[keep], bg_idx[keep], ratios[keep]
+
+    result = np.lexsort((bg_idx, fg_idx))
+    return fg_idx[result], bg_idx[result], ratios[result]
+
+
+#
+# INTERNAL
+#
+
+def _threshold(level):
+    if hasattr(level, 'upper'):
+        try:
+            return LEVELS[level.upper()]
+        except KeyError:
+            raise ValueError('Unknown contrast level: %s' % (level))
+    return float(level)
+
+
+def _luminance(colors):
+    """1-D array of relative luminances"""
+    if isinstance(colors, Color):
+        return np.array([colors.luminance])
+    if not isinstance(colors, ColorArray):
+        colors = ColorArray.from_colors(colors)
+    return colors.luminance
@@ -11,55 +11,260 @@ Provides Color object
 # Tuples are assumed to be passed and returned
 
 import colorsys
+import functools
+import math
+import string
+
+from .names import int_from_name, nearest_name
+
+# Lookup tables for hex formatting / parsing
+# Byte (0 - 255) -> two digit uppercase hex
+_BYTE_TO_HEX = ['%02X' % (i) for i in range(256)]
+
+# Byte (0 - 255) -> float in range 0 - 1
+_BYTE_TO_FLOAT = [i / 255.0 for i in range(256)]
+
+# Set in Color._key when alpha is present
+_ALPHA_KEY_FLAG = 1 << 32
+
+# Two hex digits (any case) -> float in range 0 - 1
+_HEX_TO_FLOAT = dict((high + low, int(high + low, 16) / 255.0)
+                     for high in string.hexdigits for low in string.hexdigits)
+
+# CIE XYZ / Lab, D65 white point and sRGB primaries
+# XYZ is scaled so white has Y = 1, Lab lightness ranges 0 - 100
+_RGB_TO_XYZ = ((0.4124564, 0.3575761, 0.1804375),
+               (0.2126729, 0.7151522, 0.0721750),
+               (0.0193339, 0.1191920, 0.9503041))
+_XYZ_TO_RGB = ((3.2404542, -1.5371385, -0.4985314),
+               (-0.9692660, 1.8760108, 0.0415560),
+               (0.0556434, -0.2040259, 1.0572252))
+_D65_WHITE = (0.95047, 1.0, 1.08883)
+_LAB_DELTA = 6.0 / 29.0
+_LAB_EPSILON = _LAB_DELTA ** 3
+
+# Metrics of Color.distance / is_close
+DISTANCE_METRICS = ('RGB', 'LAB')
+
+# WCAG 2 relative luminance weights of linear R, G, B
+_LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+# Nearest integer as round() gives it: halves to even on Python 3, away
+# from zero on Python 2. ColorArray's _round follows the same rule on each
+# interpreter, so single and bulk conversions round alike
+if isinstance(round(0.5), int):
+    _round = round
+else:
+    def _round(value):
+        return int(round(value))
+
+# Hit / miss counters for the opt-in cache of derived representations
+_cache_stats = {'hits': 0, 'misses': 0}
+
+def _cached(getter):
+    """Memoize a derived representation in Color._cache, if it is enabled"""
+    name = getter.__name__
+
+    @functools.wraps(getter)
+    def cached_getter(self):
+        cache = self._cache
+        if cache is None:
+            return getter(self)
+
+        if name in cache:
+            _cache_stats['hits'] += 1
+            return cache[name]
+
+        _cache_stats['misses'] += 1
+        value = cache[name] = getter(self)
+        return value
+
+    return cached_getter
 
 class Color(object):
     """
     Chroma Color object stores 'color value' to be given in any format
     by one of the properties
     """
+    # No per-instance __dict__, a Color only holds its rgb tuple, alpha
+    # and the (usually unset) cache of derived representations
+    __slots__ = ('color', '_alpha', '_cache')
+
     def __init__(self, color_value = '#FFFFFF', format = 'HEX'):
         # self.color is main storage for color format (tuple in RGB float form)
-        # HEX input takes string, RGB / HLS / HSV take tuples
+        # HEX and NAME input take strings, RGB / HLS / HSV take tuples
 
         self.color = (1.0, 1.0, 1.0)
         # If alpha is None, it is unset and assumed to be RGB
         # If non-negative, it has been set and use RGBA, HLSA, etc
         # _alpha used internally
         self._alpha = None
+        # If _cache is None, derived representations are computed on every read
+        # Otherwise it maps property name -> value until a setter clears it
+        self._cache = None
 
-        if format.upper() == 'HEX':
+        format = format.upper()
+        if format == 'HEX':
             self.rgb = self._rgb_from_hex(color_value)
-        elif format.upper() == 'RGB':
+        elif format == 'RGB':
             self.rgb = color_value
-        elif format.upper() == 'RGB256':
+        elif format == 'RGB256':
             self.rgb256 = color_value
-        elif format.upper() == 'HLS':
+        elif format == 'HLS':
             self.hls = color_value
-        elif format.upper() == 'HSV':
+        elif format == 'HSV':
             self.hsv = color_value
-        elif format.upper() == 'CMY':
+        elif format == 'CMY':
             self.cmy = color_value
-        elif format.upper() == 'CMYK':
+        elif format == 'CMYK':
             self.cmyk = color_value
+        elif format == 'XYZ':
+            self.xyz = color_value
+        elif format == 'LAB':
+            self.lab = color_value
+        elif format == 'NAME':
+            self.name = color_value
         else:
             raise ValueError('Unsupported chroma.Color format: %s' % (format))
 
-    # Color equality: difference is less than a tolerance
+    #
+    # Fast constructors
+    # Same result as Color(color_value, format), without the format dispatch
+    # or repeated bound checks
+    #
+    @classmethod
+    def from_rgb(cls, color_tuple):
+        alpha = color_tuple[3] if len(color_tuple) > 3 else None
+        return cls._new((_float_bound(color_tuple[0]),
+                         _float_bound(color_tuple[1]),
+                         _float_bound(color_tuple[2])),
+                        None if alpha is None else _float_bound(alpha))
+
+    @classmethod
+    def from_rgb256(cls, color_tuple):
+        """Alpha, if given, is in range 0 - 255 as with the RGB256 format"""
+        alpha = color_tuple[3] if len(color_tuple) > 3 else None
+        return cls._new((_float_bound(color_tuple[0] / 255.0),
+                         _float_bound(color_tuple[1] / 255.0),
+                         _float_bound(color_tuple[2] / 255.0)),
+                        None if alpha is None else _float_bound(alpha / 255.0))
+
+    @classmethod
+    def from_hex(cls, hex_value):
+        # Parsed values are already in range 0 - 1
+        rgb = _rgb_from_hex(hex_value)
+        if len(rgb) > 3:
+            return cls._new(rgb[:3], rgb[3])
+        return cls._new(rgb)
+
+    @classmethod
+    def from_int(cls, value, alpha=False):
+        """
+        From a packed integer, 0xRRGGBB
+        or 0xRRGGBBAA if alpha is True
+        """
+        if alpha:
+            if not 0 <= value <= 0xFFFFFFFF:
+                raise ValueError('Invalid RGBA Integer: %s' % (value))
+            return cls._new((_BYTE_TO_FLOAT[value >> 24],
+                             _BYTE_TO_FLOAT[(value >> 16) & 0xFF],
+                             _BYTE_TO_FLOAT[(value >> 8) & 0xFF]),
+                            _BYTE_TO_FLOAT[value & 0xFF])
+
+        if not 0 <= value <= 0xFFFFFF:
+            raise ValueError('Invalid RGB Integer: %s' % (value))
+        return cls._new((_BYTE_TO_FLOAT[value >> 16],
+                         _BYTE_TO_FLOAT[(value >> 8) & 0xFF],
+                         _BYTE_TO_FLOAT[value & 0xFF]))
+
+    @classmethod
+    def from_rgb_unchecked(cls, color_tuple):
+        """
+        Trusted RGB(A) float input: no bound checks or conversion,
+        values must already be floats in range 0 - 1
+        """
+        if len(color_tuple) > 3:
+            return cls._new(tuple(color_tuple[:3]), color_tuple[3])
+        return cls._new(tuple(color_tuple))
+
+    @classmethod
+    def _new(cls, color, alpha=None):
+        """Color with storage set directly, skipping __init__"""
+        self = cls.__new__(cls)
+        self.color = color
+        self._alpha = alpha
+        self._cache = None
+        return self
+
+    # Pickling: 8-bit colors (hex, rgb256, pixels) as the integer their hex
+    # encodes, others as the rgb tuple and alpha; no class state is stored
+    # Subclasses also store their class, and their instance __dict__ if any
+    # __setstate__ reads the (color, alpha) state of earlier 0.3 pickles and
+    # the __dict__ state of 0.2.0 pickles
+    def __reduce__(self):
+        alpha = self._alpha
+        key = 0
+        for x in (self.color if alpha is None else self.color + (alpha,)):
+            byte = _round(x*255)
+            if _BYTE_TO_FLOAT[byte] != x:
+                args = (self.color,) if alpha is None else (self.color, alpha)
+                break
+            key = (key << 8) | byte
+        else:
+            args = (key if alpha is None else key | _ALPHA_KEY_FLAG,)
+
+        cls = type(self)
+        if cls is Color:
+            return (_restore_color, args)
+        args = (args[0], alpha if len(args) > 1 else None, cls)
+        state = getattr(self, '__dict__', None)
+        if state:
+            return (_restore_color, args, state)
+        return (_restore_color, args)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            if 'color' not in state:
+                # Instance attributes of a subclass
+                self.__dict__.update(state)
+                return
+            # 0.2.0 and earlier pickled the instance __dict__
+            state = (state['color'], state.get('_alpha'))
+        self.color, self._alpha = state
+        self._cache = None
+
+    # Color equality: same hex value (and alpha), use is_close for a tolerance
     # Use hex as the test for equals, as it is the greatest resolution without rounding issues
+    # Compared as the integer hex encodes (see _key), no strings are built
     def __eq__(self, other):
-        return self.hex == other.hex
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self._key() == other._key()
 
     def __ne__(self, other):
-        return not (self == other)
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    # Hashable on the same key as equality
+    # Note: changing a color while it is in a set / dict key breaks lookups
+    def __hash__(self):
+        return hash(self._key())
 
     # Additive / subtractive mixing
+    # Anything but a Color (e.g. a ColorArray) handles the operation itself
     def __add__(self, other):
+        if not isinstance(other, Color):
+            return NotImplemented
         return self.additive_mix(other)
 
     def __radd__(self, other):
         return other.additive_mix(self)
 
     def __sub__(self, other):
+        if not isinstance(other, Color):
+            return NotImplemented
         return self.subtractive_mix(other)
 
     def __rsub__(self, other):
@@ -84,8 +289,10 @@ class Color(object):
         return self._append_alpha_if_necessary(self.color)
 
     @property
+    @_cached
     def rgb256(self):
-        rgb256 = tuple(map(lambda x: int(round(x*255)), self.color))
+        r, g, b = self.color
+        rgb256 = (_round(r*255), _round(g*255), _round(b*255))
         return self._append_alpha_if_necessary(rgb256)
 
     @rgb.setter
@@ -93,6 +300,7 @@ class Color(object):
         """Used as main setter (rgb256, hls, hls256, hsv, hsv256)"""
         # Check bounds
         self.color = tuple(map(self._apply_float_bounds, color_tuple[:3]))
+        self._clear_cache()
 
         # Include alpha if necessary
         if len(color_tuple) > 3:
@@ -100,10 +308,11 @@ class Color(object):
 
     @rgb256.setter
     def rgb256(self, color_tuple):
-        self.rgb = map(lambda x: x / 255.0, color_tuple)
+        self.rgb = tuple(x / 255.0 for x in color_tuple)
 
     # HLS
     @property
+    @_cached
     def hls(self):
         """
         HLS: (Hue°, Lightness%, Saturation%)
@@ -111,7 +320,7 @@ class Color(object):
         """
         r, g, b = self.color
         hls = colorsys.rgb_to_hls(r, g, b)
-        hls = (int(round(hls[0] * 360)), hls[1], hls[2])
+        hls = (_round(hls[0] * 360), hls[1], hls[2])
         return self._append_alpha_if_necessary(hls)
 
     @hls.setter
@@ -129,6 +338,7 @@ class Color(object):
 
     # HSV
     @property
+    @_cached
     def hsv(self):
         """
         HSV: (Hue°, Saturation%, Value%)
@@ -136,7 +346,7 @@ class Color(object):
         """
         r, g, b = self.color
         hsv = colorsys.rgb_to_hsv(r, g, b)
-        hsv = (int(round(hsv[0] * 360)), hsv[1], hsv[2])
+        hsv = (_round(hsv[0] * 360), hsv[1], hsv[2])
         return self._append_alpha_if_necessary(hsv)
 
     @hsv.setter
@@ -154,6 +364,7 @@ class Color(object):
 
     # CMY / CMYK
     @property
+    @_cached
     def cmy(self):
         """
         CMY: returned in range 0.0 - 1.0
@@ -175,6 +386,7 @@ class Color(object):
         self.rgb = (r, g, b)
 
     @property
+    @_cached
     def cmyk(self):
         """CMYK: all returned in range 0.0 - 1.0"""
         c, m, y = self.cmy
@@ -201,17 +413,63 @@ class Color(object):
         y = y * (1 - k) + k
         self.cmy = (c, m, y)
 
+    # CIE XYZ / Lab
+    @property
+    @_cached
+    def xyz(self):
+        """
+        CIE XYZ (D65): Y in range 0.0 - 1.0, white is (0.9505, 1.0, 1.0888)
+        Like CMY, alpha is not appended
+        """
+        rgb = [_srgb_to_linear(x) for x in self.color]
+        return tuple([sum([m * x for m, x in zip(row, rgb)]) for row in _RGB_TO_XYZ])
+
+    @xyz.setter
+    def xyz(self, color_tuple):
+        xyz = color_tuple[:3]
+        # Colors outside the sRGB gamut are clipped
+        rgb = [sum([m * x for m, x in zip(row, xyz)]) for row in _XYZ_TO_RGB]
+        self.rgb = tuple([_linear_to_srgb(self._apply_float_bounds(x)) for x in rgb])
+
+    @property
+    @_cached
+    def lab(self):
+        """
+        CIE Lab (D65): (Lightness 0 - 100, a, b)
+        Like CMY, alpha is not appended
+        """
+        fx, fy, fz = [_lab_f(x / white) for x, white in zip(self.xyz, _D65_WHITE)]
+        return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+    @lab.setter
+    def lab(self, color_tuple):
+        l, a, b = color_tuple[:3]
+        fy = (l + 16) / 116.0
+        fx = fy + a / 500.0
+        fz = fy - b / 200.0
+        self.xyz = tuple([_lab_f_inverse(f) * white for f, white in zip((fx, fy, fz), _D65_WHITE)])
+
+    # Luminance (WCAG 2 relative luminance)
+    @property
+    @_cached
+    def luminance(self):
+        """Relative luminance: 0 (black) - 1 (white), alpha is ignored"""
+        r, g, b = self.color
+        wr, wg, wb = _LUMINANCE_WEIGHTS
+        return wr * _srgb_to_linear(r) + wg * _srgb_to_linear(g) + wb * _srgb_to_linear(b)
+
     # HEX
     @property
+    @_cached
     def hex(self):
-        r = self._float_to_hex(self.color[0])
-        g = self._float_to_hex(self.color[1])
-        b = self._float_to_hex(self.color[2])
-        rgb = '#' + r + g + b
+        r, g, b = self.color
+        rgb = ('#' + _BYTE_TO_HEX[_round(r*255)]
+                   + _BYTE_TO_HEX[_round(g*255)]
+                   + _BYTE_TO_HEX[_round(b*255)])
 
         # Append alpha hex if necessary
-        if self.alpha is not None:
-            rgb += self._float_to_hex(self.alpha)
+        if self._alpha is not None:
+            rgb += _BYTE_TO_HEX[_round(self._alpha*255)]
 
         return rgb
 
@@ -219,6 +477,21 @@ class Color(object):
     def hex(self, color_value):
         self.rgb = self._rgb_from_hex(color_value)
 
+    # Name
+    # CSS color names, any case; alpha is ignored
+    @property
+    @_cached
+    def name(self):
+        """Name of the color, or of the closest named color"""
+        r, g, b = self.color
+        return nearest_name((_round(r*255) << 16) | (_round(g*255) << 8) | _round(b*255))
+
+    @name.setter
+    def name(self, name):
+        value = int_from_name(name)
+        self.rgb = (_BYTE_TO_FLOAT[value >> 16], _BYTE_TO_FLOAT[(value >> 8) & 0xFF],
+                    _BYTE_TO_FLOAT[value & 0xFF])
+
     # Alpha
     @property
     def alpha(self):
@@ -227,6 +500,27 @@ class Color(object):
     @alpha.setter
     def alpha(self, value):
         self._alpha = self._apply_float_bounds(value)
+        self._clear_cache()
+
+    # Cache of derived representations (hls, hsv, cmy, cmyk, hex, rgb256)
+    # Off by default; every setter invalidates it. Assigning Color.color
+    # directly bypasses the setters, so disable the cache if you do that
+    def enable_cache(self):
+        if self._cache is None:
+            self._cache = {}
+
+    def disable_cache(self):
+        self._cache = None
+
+    @staticmethod
+    def cache_info():
+        """Cache hits and misses across all colors"""
+        return dict(_cache_stats)
+
+    @staticmethod
+    def reset_cache_info():
+        _cache_stats['hits'] = 0
+        _cache_stats['misses'] = 0
 
     #
     # Color Functions
@@ -243,46 +537,53 @@ class Color(object):
         cmy_mix = tuple([cmy1 + cmy2 for cmy1, cmy2 in zip(self.cmy, other.cmy)])
         return Color(cmy_mix, 'CMY')
 
+    # WCAG 2 contrast ratio, 1 (none) - 21 (black on white)
+    # Note: returns a float, not a Color
+    def contrast(self, other):
+        lighter, darker = self.luminance, other.luminance
+        if darker > lighter:
+            lighter, darker = darker, lighter
+        return (lighter + 0.05) / (darker + 0.05)
+
+    # Distance and tolerance comparison, alpha is ignored
+    # metric: 'RGB' (euclidean, channels 0 - 1) or 'LAB' (CIE76 Delta-E)
+    def distance(self, other, metric='RGB'):
+        metric = metric.upper()
+        if metric not in DISTANCE_METRICS:
+            raise ValueError('Unsupported distance metric: %s' % (metric))
+        if metric == 'LAB':
+            first, second = self.lab, other.lab
+        else:
+            first, second = self.color, other.color
+        return math.sqrt(sum([(x - y) ** 2 for x, y in zip(first, second)]))
+
+    def is_close(self, other, tolerance, metric='RGB'):
+        return self.distance(other, metric) <= tolerance
+
     #
     # INTERNAL
     #
     def _rgb_from_hex(self, color_value):
-        hex_value = str(color_value)
-
-        # Remove hash if exists
-        if hex_value[0] == '#':
-            hex_value = hex_value[1:]
-
-        # Check length
-        # 6: 6 digit hex
-        # 8: 6 digit hex + alpha
-        if len(hex_value) not in [6, 8]:
-            raise ValueError('Invalid Hex Input: %s' % (color_value))
-
-        # Return rgb from hex
-        try:
-            rgb =  (int(hex_value[0:2], 16) / 255.0,
-                    int(hex_value[2:4], 16) / 255.0,
-                    int(hex_value[4:6], 16) / 255.0)
-
-            # Append alpha if exists
-            if len(hex_value) == 8:
-                rgb += (int(hex_value[6:8], 16) / 255.0,)
-
-            return rgb
-        except Exception, e:
-            raise ValueError('Invalid Hex Input: %s' % (color_value))
+        return _rgb_from_hex(color_value)
 
     def _float_to_hex(self, float_value):
-        # Convert from float to in to hex number, remove '0x'
-        int_value = int(round(float_value*255))
-        hex_value = hex(int_value)[2:]
+        # Convert from float to int, then look up the two digit hex
+        return _BYTE_TO_HEX[_round(float_value*255)]
 
-        # If hex is only one digit, pad with 0
-        if len(hex_value) == 1:
-            hex_value = '0' + hex_value
+    def _clear_cache(self):
+        if self._cache:
+            self._cache.clear()
 
-        return hex_value.upper()
+    def _key(self):
+        """
+        Color as the integer its hex implies: 0xRRGGBB without alpha,
+        0x1RRGGBBAA with alpha (bit 32 keeps the two apart)
+        """
+        r, g, b = self.color
+        key = (_round(r*255) << 16) | (_round(g*255) << 8) | _round(b*255)
+        if self._alpha is not None:
+            key = _ALPHA_KEY_FLAG | (key << 8) | _round(self._alpha*255)
+        return key
 
     def _apply_float_bounds(self, coordinate):
         """Assure coordinate is a float between 0 to 1"""
@@ -303,3 +604,223 @@ class Color(object):
             return color_tuple + (self.alpha,)
         return color_tuple
 
+
+
+class ColorSet(object):
+    """
+    Set of distinct colors with a count for each
+    Colors are distinct when their hex differs, as with Color equality
+    """
+    def __init__(self, colors=()):
+        # Color key (Color._key) -> number of times added
+        self._counts = {}
+        self.update(colors)
+
+    def add(self, color, count=1):
+        key = color._key()
+        self._counts[key] = self._counts.get(key, 0) + count
+
+    def update(self, colors):
+        """Add every color from an iterable of Colors, or a ColorArray"""
+        counts = self._counts
+
+        # ColorArray computes keys and counts for the whole array at once
+        if hasattr(colors, '_unique_keys'):
+            keys, key_counts = colors._unique_keys()
+            for key, count in zip(keys.tolist(), key_counts.tolist()):
+                counts[key] = counts.get(key, 0) + count
+            return
+
+        for color in colors:
+            key = color._key()
+            counts[key] = counts.get(key, 0) + 1
+
+    def count(self, color):
+        return self._counts.get(color._key(), 0)
+
+    def total(self):
+        """Number of colors added, including duplicates"""
+        return sum(self._counts.values())
+
+    def most_common(self, n=None):
+        """List of (Color, count), most frequent first"""
+        items = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+        if n is not None:
+            items = items[:n]
+        return [(_color_from_key(key), count) for key, count in items]
+
+    def __contains__(self, color):
+        return color._key() in self._counts
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __iter__(self):
+        for key in self._counts:
+            yield _color_from_key(key)
+
+
+def _restore_color(value, alpha=None, cls=None):
+    """Inverse of Color.__reduce__, value is an rgb tuple or a key"""
+    cls = cls or Color
+    if isinstance(value, tuple):
+        return cls._new(value, alpha)
+    return _color_from_key(value, cls)
+
+
+def _color_from_key(key, cls=None):
+    """Inverse of Color._key, as a cls (default Color)"""
+    cls = cls or Color
+    if key & _ALPHA_KEY_FLAG:
+        return cls.from_int(key & 0xFFFFFFFF, alpha=True)
+    return cls.from_int(key)
+
+
+def _float_bound(coordinate):
+    """Color._apply_float_bounds without the None check"""
+    if coordinate < 0.0:
+        return 0.0
+    elif coordinate > 1.0:
+        return 1.0
+    return float(coordinate)
+
+
+def mix_many(colors, mode='additive'):
+    """
+    Mix any number of colors into one, the same as chaining additive_mix
+    (c1 + c2 + ...) or subtractive_mix (c1 - c2 - ...) without creating a
+    Color per step. A ColorArray is mixed with whole-array operations
+    Additive mixes keep alpha (summed) only if every color has it
+    """
+    if mode not in ('additive', 'subtractive'):
+        raise ValueError('Unsupported mix mode: %s' % (mode))
+
+    # ColorArray sums each channel in a single pass
+    if hasattr(colors, 'mix'):
+        return colors.mix(mode)
+
+    colors = list(colors)
+    if not colors:
+        raise ValueError('Nothing to mix')
+
+    # Every step clamps at 1 and no term is negative, so clamping the
+    # totals once gives the same result
+    if mode == 'additive':
+        r = g = b = 0.0
+        alpha = 0.0
+        for color in colors:
+            cr, cg, cb = color.color
+            r += cr
+            g += cg
+            b += cb
+            if alpha is not None:
+                alpha = None if color._alpha is None else alpha + color._alpha
+        if alpha is not None:
+            alpha = _float_bound(alpha)
+        return Color._new((_float_bound(r), _float_bound(g), _float_bound(b)), alpha)
+
+    c = m = y = 0.0
+    for color in colors:
+        cr, cg, cb = color.color
+        c += 1 - cr
+        m += 1 - cg
+        y += 1 - cb
+    return Color._new((1 - _float_bound(c), 1 - _float_bound(m), 1 - _float_bound(y)))
+
+
+#
+# CIE helpers
+#
+
+def _srgb_to_linear(c):
+    if c <= 0.04045:
+        return c / 12.92
+    return ((c + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(c):
+    if c <= 0.0031308:
+        return c * 12.92
+    return 1.055 * c ** (1 / 2.4) - 0.055
+
+
+def _lab_f(t):
+    if t > _LAB_EPSILON:
+        return t ** (1 / 3.0)
+    return t / (3 * _LAB_DELTA ** 2) + 4 / 29.0
+
+
+def _lab_f_inverse(f):
+    if f > _LAB_DELTA:
+        return f ** 3
+    return 3 * _LAB_DELTA ** 2 * (f - 4 / 29.0)
+
+
+#
+# Hex parsing / formatting
+#
+
+def _rgb_from_hex(color_value):
+    """Return an rgb (or rgba) float tuple from '#RRGGBB' or '#RRGGBBAA'"""
+    hex_value = str(color_value)
+
+    # Remove hash if exists
+    if hex_value[:1] == '#':
+        hex_value = hex_value[1:]
+
+    # Check length
+    # 6: 6 digit hex
+    # 8: 6 digit hex + alpha
+    length = len(hex_value)
+    if length != 6 and length != 8:
+        raise ValueError('Invalid Hex Input: %s' % (color_value))
+
+    # Return rgb from hex
+    try:
+        rgb = (_HEX_TO_FLOAT[hex_value[0:2]],
+               _HEX_TO_FLOAT[hex_value[2:4]],
+               _HEX_TO_FLOAT[hex_value[4:6]])
+
+        # Append alpha if exists
+        if length == 8:
+            rgb += (_HEX_TO_FLOAT[hex_value[6:8]],)
+
+        return rgb
+    except KeyError:
+        raise ValueError('Invalid Hex Input: %s' % (color_value))
+
+
+def _hex_lines(hex_values):
+    """Split newline separated bytes / text, pass other sequences through"""
+    if isinstance(hex_values, bytes):
+        hex_values = hex_values.decode('ascii')
+    if isinstance(hex_values, type(u'')):
+        hex_values = hex_values.splitlines()
+    return hex_values
+
+
+def parse_hex_many(hex_values):
+    """
+    Parse many hex strings at once, giving the same rgb tuples as Color.rgb
+    hex_values is a list of strings or newline separated bytes / text
+    """
+    return [_rgb_from_hex(hex_value) for hex_value in _hex_lines(hex_values)]
+
+
+def format_hex_many(color_tuples):
+    """
+    Format many rgb float tuples (with optional alpha) as hex strings,
+    giving the same output as Color.hex
+    """
+    hex_values = []
+    for color_tuple in color_tuples:
+        hex_value = '#'
+        for i, x in enumerate(color_tuple[:4]):
+            # Alpha may be None (unset)
+            if i == 3 and x is None:
+                break
+            # Bounds as applied by Color._apply_float_bounds
+            x = 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
+            hex_value += _BYTE_TO_HEX[_round(x*255)]
+        hex_values.append(hex_value)
+    return hex_values
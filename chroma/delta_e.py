@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.delta_e
+~~~~~~~~~~~~~~~
+
+Provides color difference (Delta-E) functions (requires NumPy)
+
+"""
+
+# Every function accepts Color objects, ColorArrays, Lab tuples or N x 3 Lab
+# arrays, broadcast against each other. A single pair returns a float, any
+# array input returns an array
+
+import numpy as np
+
+from .core import Color
+from .array import ColorArray
+
+
+def delta_e_cie76(color1, color2):
+    """CIE76: euclidean distance in Lab"""
+    lab1, lab2, scalar = _labs(color1, color2)
+    return _result(np.sqrt(((lab1 - lab2) ** 2).sum(axis=-1)), scalar)
+
+
+def delta_e_cie94(color1, color2, textiles=False):
+    """
+    CIE94, with color1 as the reference
+    Graphic arts weights by default, textiles weights if textiles is True
+    """
+    lab1, lab2, scalar = _labs(color1, color2)
+    if textiles:
+        k_l, k_1, k_2 = 2.0, 0.048, 0.014
+    else:
+        k_l, k_1, k_2 = 1.0, 0.045, 0.015
+
+    l1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    l2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+    c1 = np.hypot(a1, b1)
+    c2 = np.hypot(a2, b2)
+
+    delta_l = l1 - l2
+    delta_c = c1 - c2
+    # Hue difference squared, tiny negatives come from rounding
+    delta_h2 = np.maximum((a1 - a2) ** 2 + (b1 - b2) ** 2 - delta_c ** 2, 0)
+
+    s_c = 1 + k_1 * c1
+    s_h = 1 + k_2 * c1
+    return _result(np.sqrt((delta_l / k_l) ** 2 + (delta_c / s_c) ** 2 + delta_h2 / s_h ** 2), scalar)
+
+
+def delta_e_ciede2000(color1, color2, k_l=1.0, k_c=1.0, k_h=1.0):
+    """CIEDE2000 (Sharma, Wu and Dalal formulation)"""
+    lab1, lab2, scalar = _labs(color1, color2)
+    l1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    l2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    # Adjusted a*, chroma and hue
+    c_mean = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - np.sqrt(c_mean ** 7 / (c_mean ** 7 + 25.0 ** 7)))
+    a1 = (1 + g) * a1
+    a2 = (1 + g) * a2
+    c1 = np.hypot(a1, b1)
+    c2 = np.hypot(a2, b2)
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    h2 = np.degrees(np.arctan2(b2, a2)) % 360
+
+    # Differences, hue difference is 0 when either color is neutral
+    neutral = c1 * c2 == 0
+    delta_l = l2 - l1
+    delta_c = c2 - c1
+    delta_h = h2 - h1
+    delta_h = np.where(delta_h > 180, delta_h - 360, np.where(delta_h < -180, delta_h + 360, delta_h))
+    delta_h = np.where(neutral, 0, delta_h)
+    delta_big_h = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(delta_h / 2))
+
+    # Means, hue mean wraps around 360
+    l_mean = (l1 + l2) / 2
+    c_mean = (c1 + c2) / 2
+    h_sum = h1 + h2
+    h_mean = np.where(np.abs(h1 - h2) <= 180, h_sum / 2,
+                      np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+    h_mean = np.where(neutral, h_sum, h_mean)
+
+    t = (1 - 0.17 * np.cos(np.radians(h_mean - 30))
+           + 0.24 * np.cos(np.radians(2 * h_mean))
+           + 0.32 * np.cos(np.radians(3 * h_mean + 6))
+           - 0.20 * np.cos(np.radians(4 * h_mean - 63)))
+    delta_theta = 30 * np.exp(-((h_mean - 275) / 25) ** 2)
+    r_c = 2 * np.sqrt(c_mean ** 7 / (c_mean ** 7 + 25.0 ** 7))
+    s_l = 1 + 0.015 * (l_mean - 50) ** 2 / np.sqrt(20 + (l_mean - 50) ** 2)
+    s_c = 1 + 0.045 * c_mean
+    s_h = 1 + 0.015 * c_mean * t
+    r_t = -np.sin(np.radians(2 * delta_theta)) * r_c
+
+    term_l = delta_l / (k_l * s_l)
+    term_c = delta_c / (k_c * s_c)
+    term_h = delta_big_h / (k_h * s_h)
+    return _result(np.sqrt(term_l ** 2 + term_c ** 2 + term_h ** 2 + r_t * term_c * term_h), scalar)
+
+
+#
+# INTERNAL
+#
+
+def _lab(value):
+    """Lab coordinates as an array, and whether value was a single color"""
+    if isinstance(value, Color):
+        return np.array(value.lab), True
+    if isinstance(value, ColorArray):
+        return value.lab, False
+
+    lab = np.asarray(value, dtype=np.float64)
+    if lab.shape[-1:] != (3,):
+        raise ValueError('Expected Lab coordinates, got shape %s' % (lab.shape,))
+    return lab, lab.ndim == 1
+
+
+def _labs(color1, color2):
+    lab1, scalar1 = _lab(color1)
+    lab2, scalar2 = _lab(color2)
+    return lab1, lab2, scalar1 and scalar2
+
+
+def _result(delta_e, scalar):
+    return float(delta_e) if scalar else delta_e
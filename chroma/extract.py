@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.extract
+~~~~~~~~~~~~~~~
+
+Provides palette extraction by median cut or k-means (requires NumPy)
+
+"""
+
+# Pixels are first reduced to a histogram: 8-bit colors are binned by the
+# top BIN_BITS bits of each channel, keeping the pixel count and mean color
+# of every bin. Both methods then work on the (at most 2^15) occupied bins,
+# weighted by their counts, so their cost hardly depends on the image size.
+#
+# Clustering runs in RGB, Lab or a cylinder of HSV / HLS: hue is an angle,
+# so those spaces use (s cos h, s sin h, v or l) to keep 359 and 0 degrees
+# close. Each palette color is the mean RGB of the pixels it covers.
+
+import numpy as np
+
+from .core import Color
+from .array import ColorArray, _round, _rgb_to_hsv, _rgb_to_hls, _rgb_to_xyz, _xyz_to_lab
+from .buffer import PixelBuffer
+
+METHODS = ('median_cut', 'kmeans')
+SPACES = ('RGB', 'HSV', 'HLS', 'LAB')
+
+# Bits of each channel kept by the histogram (2^15 bins)
+BIN_BITS = 5
+
+
+def extract_palette(colors, count=8, method='kmeans', space='RGB', sample=None, seed=0, **options):
+    """
+    Up to count most representative colors of colors (ColorArray,
+    PixelBuffer, N x 3 / N x 4 uint8 array or iterable of Color objects), as
+    [(Color, share of the pixels)], largest share first
+    method: 'median_cut' or 'kmeans' (extra options are passed to kmeans)
+    sample: number of pixels to draw at random (with seed) first, for speed
+    """
+    if method not in METHODS:
+        raise ValueError('Unsupported palette extraction method: %s' % (method))
+    if method == 'median_cut':
+        return median_cut(colors, count, space, sample, seed, **options)
+    return kmeans(colors, count, space, sample, seed, **options)
+
+
+def median_cut(colors, count=8, space='RGB', sample=None, seed=0):
+    """
+    Median cut: starting from one box around every color, repeatedly split
+    the box with the largest weighted squared error, across its axis of
+    largest variance, at the weighted median
+    """
+    bins = _Bins(colors, space, sample, np.random.RandomState(seed))
+    points, weights = bins.points, bins.weights
+
+    # Bins of each box, in no particular order, and (error, axis) of each
+    boxes = [np.arange(len(points))]
+    spreads = [_spread(points, weights, boxes[0])]
+    while len(boxes) < count:
+        best = max(range(len(boxes)), key=lambda i: spreads[i][0])
+        error, axis = spreads[best]
+        if error <= 0:
+            break
+
+        box = boxes.pop(best)
+        spreads.pop(best)
+        box = box[np.argsort(points[box, axis], kind='mergesort')]
+        cumulative = np.cumsum(weights[box])
+        split = int(np.searchsorted(cumulative, cumulative[-1] / 2.0))
+        # Both halves keep at least one bin
+        split = min(split, len(box) - 2) + 1
+        for half in (box[:split], box[split:]):
+            boxes.append(half)
+            spreads.append(_spread(points, weights, half))
+
+    labels = np.empty(len(points), dtype=np.intp)
+    for i, box in enumerate(boxes):
+        labels[box] = i
+    return bins.palette(labels, len(boxes))
+
+
+def kmeans(colors, count=8, space='RGB', sample=None, seed=0,
+           batch_size=1024, max_iter=100, tolerance=1e-4):
+    """
+    Mini-batch k-means (Sculley 2010), seeded with k-means++
+    Each iteration moves the centers towards a batch of batch_size pixels;
+    stops after max_iter iterations, or once no center moves further than
+    tolerance (in units of the space, RGB is 0 - 1)
+    """
+    rng = np.random.RandomState(seed)
+    bins = _Bins(colors, space, sample, rng)
+    points, weights = bins.points, bins.weights
+    if not len(points):
+        return []
+
+    centers = _kmeans_plus_plus(points, weights, min(count, len(points)), rng)
+    seen = np.zeros(len(centers))
+    probabilities = weights / weights.sum()
+    for _ in range(max_iter):
+        batch = points[rng.choice(len(points), batch_size, p=probabilities)]
+        labels = _nearest(batch, centers)
+
+        # Per center learning rate 1 / (pixels seen so far)
+        counts = np.bincount(labels, minlength=len(centers)).astype(np.float64)
+        sums = np.column_stack([np.bincount(labels, batch[:, axis], minlength=len(centers))
+                                for axis in range(batch.shape[1])])
+        seen += counts
+        moved = counts > 0
+        step = (sums[moved] - counts[moved, np.newaxis] * centers[moved]) / seen[moved, np.newaxis]
+        centers[moved] += step
+        if not len(step) or np.sqrt((step ** 2).sum(axis=1)).max() <= tolerance:
+            break
+
+    return bins.palette(_nearest(points, centers), len(centers))
+
+
+#
+# INTERNAL
+#
+
+class _Bins(object):
+    """Occupied histogram bins: pixel counts, mean RGB and points in space"""
+    def __init__(self, colors, space, sample, rng):
+        space = space.upper()
+        if space not in SPACES:
+            raise ValueError('Unsupported palette extraction space: %s' % (space))
+
+        byte = _bytes(colors)
+        if sample is not None and sample < len(byte):
+            byte = byte[rng.randint(0, len(byte), sample)]
+
+        shift = 8 - BIN_BITS
+        keys = (((byte[:, 0] >> shift).astype(np.intp) << (2 * BIN_BITS))
+                | ((byte[:, 1] >> shift).astype(np.intp) << BIN_BITS)
+                | (byte[:, 2] >> shift))
+        counts = np.bincount(keys, minlength=1 << (3 * BIN_BITS))
+        occupied = np.flatnonzero(counts)
+
+        self.total = len(byte)
+        self.weights = counts[occupied].astype(np.float64)
+        sums = np.column_stack([np.bincount(keys, byte[:, channel], minlength=len(counts))[occupied]
+                                for channel in range(3)])
+        # Mean RGB of each bin, 0 - 1
+        self.rgb = sums / (self.weights[:, np.newaxis] * 255)
+        self.points = _points(self.rgb, space)
+
+    def palette(self, labels, size):
+        """[(Color, share)] of each non-empty label, largest share first"""
+        counts = np.bincount(labels, self.weights, minlength=size)
+        sums = np.column_stack([np.bincount(labels, self.weights * self.rgb[:, channel], minlength=size)
+                                for channel in range(3)])
+        used = np.flatnonzero(counts)
+        used = used[np.argsort(-counts[used], kind='mergesort')]
+        rgb = np.clip(sums[used] / counts[used, np.newaxis], 0.0, 1.0)
+        return [(Color.from_rgb_unchecked(tuple(color)), share)
+                for color, share in zip(rgb.tolist(), (counts[used] / self.total).tolist())]
+
+
+def _bytes(colors):
+    """N x 3 uint8 array of the colors"""
+    if isinstance(colors, PixelBuffer):
+        byte = colors.pixels
+    elif isinstance(colors, np.ndarray) and colors.dtype == np.uint8:
+        byte = colors
+    else:
+        if not isinstance(colors, ColorArray):
+            colors = ColorArray.from_colors(colors)
+        byte = _round(colors.color * 255).astype(np.uint8)
+
+    if byte.ndim != 2 or byte.shape[1] not in (3, 4):
+        raise ValueError('Expected N x 3 or N x 4 8-bit colors, got shape %s' % (byte.shape,))
+    return byte[:, :3]
+
+
+def _points(rgb, space):
+    """Coordinates of RGB floats in the clustering space"""
+    if space == 'LAB':
+        return _xyz_to_lab(_rgb_to_xyz(rgb))
+    if space == 'HSV':
+        h, s, third = _rgb_to_hsv(rgb)
+    elif space == 'HLS':
+        h, third, s = _rgb_to_hls(rgb)
+    else:
+        return rgb.copy()
+    angle = h * (2 * np.pi)
+    return np.column_stack((s * np.cos(angle), s * np.sin(angle), third))
+
+
+def _spread(points, weights, box):
+    """Weighted squared error of a box about its mean, and its axis of largest variance"""
+    if len(box) < 2:
+        return 0.0, 0
+    box_points, box_weights = points[box], weights[box]
+    mean = np.average(box_points, axis=0, weights=box_weights)
+    errors = (box_weights[:, np.newaxis] * (box_points - mean) ** 2).sum(axis=0)
+    return float(errors.sum()), int(np.argmax(errors))
+
+
+def _nearest(points, centers):
+    """Nearest center of each point"""
+    distances = ((points[:, np.newaxis, :] - centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+    return np.argmin(distances, axis=1)
+
+
+def _kmeans_plus_plus(points, weights, count, rng):
+    """count initial centers, each drawn with probability ~ weight x squared distance"""
+    centers = [points[rng.choice(len(points), p=weights / weights.sum())]]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, count):
+        scores = weights * distances
+        if scores.sum() <= 0:
+            break
+        center = points[rng.choice(len(points), p=scores / scores.sum())]
+        centers.append(center)
+        distances = np.minimum(distances, ((points - center) ** 2).sum(axis=1))
+    return np.array(centers)
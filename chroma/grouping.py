@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.grouping
+~~~~~~~~~~~~~~~~
+
+Provides tolerance based dedupe and clustering of many colors
+(requires NumPy)
+
+"""
+
+# Colors are hashed into a grid of cubes as wide as the tolerance, so two
+# colors within tolerance are always in the same or neighbouring cubes.
+# cluster measures those pairs, which is close to linear in the number of
+# colors as long as a cube holds a handful of them. dedupe never lists
+# pairs: each color is only compared with the colors already kept in the
+# neighbouring cubes, which can only hold a few each (kept colors are more
+# than tolerance apart), stopping at the first match. Exact duplicates are
+# merged first. Distances are as Color.distance gives them, alpha is ignored
+
+import math
+
+import numpy as np
+
+from .core import Color, DISTANCE_METRICS
+from .array import ColorArray
+
+# Neighbouring cubes after this one in (x, y, z) order, with the cube itself
+# each pair of neighbours is visited once
+_OFFSETS = [(0, 0, 0)] + [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)
+                          if (x, y, z) > (0, 0, 0)]
+
+# Colors dedupe converts to Python values at a time
+_BLOCK = 1 << 14
+
+# Every neighbouring cube, nearest first (the cube itself, faces, edges, corners)
+_ALL_OFFSETS = sorted([(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)],
+                      key=lambda offset: sum([abs(x) for x in offset]))
+
+
+def cluster(colors, tolerance, metric='RGB'):
+    """
+    Cluster label of each color (ColorArray or iterable of Color objects):
+    colors share a label when a chain of colors, each within tolerance of
+    the next, joins them. Labels are numbered in order of first appearance
+    """
+    unique, inverse, first = _unique_points(colors, metric)
+    a, b = _close_pairs(unique, _check_tolerance(tolerance))
+    roots = _components(len(unique), a, b)[inverse]
+
+    # Renumber roots by the first color of each cluster
+    _, first_row, renumbered = np.unique(roots, return_index=True, return_inverse=True)
+    rank = np.empty(len(first_row), dtype=np.intp)
+    rank[np.argsort(first_row, kind='mergesort')] = np.arange(len(first_row))
+    return rank[renumbered.ravel()]
+
+
+def dedupe(colors, tolerance, metric='RGB'):
+    """
+    Positions of the colors to keep, ascending: going in order, a color is
+    kept unless it is within tolerance of a color already kept, so every
+    color dropped has a kept color within tolerance
+    """
+    unique, inverse, first = _unique_points(colors, metric)
+    tolerance = _check_tolerance(tolerance)
+
+    # Distinct colors in order of first appearance
+    order = np.argsort(first, kind='mergesort')
+    if len(unique) < 2 or tolerance <= 0:
+        return np.sort(first)
+    keys, span = _cube_keys(unique, tolerance)
+    offsets = [(x * span[1] + y) * span[2] + z for x, y, z in _ALL_OFFSETS]
+
+    # Kept colors of each cube, by key
+    kept_in = {}
+    kept = []
+    # Converted to Python values a block at a time
+    for start in range(0, len(order), _BLOCK):
+        block = order[start:start + _BLOCK]
+        for i, key, (x, y, z) in zip(block.tolist(), keys[block].tolist(), unique[block].tolist()):
+            for offset in offsets:
+                near = kept_in.get(key + offset)
+                if near is not None and any(math.sqrt((a - x) ** 2 + (b - y) ** 2 + (c - z) ** 2) <= tolerance
+                                            for a, b, c in near):
+                    break
+            else:
+                kept.append(i)
+                kept_in.setdefault(key, []).append((x, y, z))
+    return np.sort(first[kept])
+
+
+#
+# INTERNAL
+#
+
+def _check_tolerance(tolerance):
+    tolerance = float(tolerance)
+    if not tolerance >= 0:
+        raise ValueError('Tolerance must be a number >= 0, got %r' % (tolerance))
+    return tolerance
+
+
+def _unique_points(colors, metric):
+    """Distinct points, the distinct point of each color, and each one's first color"""
+    metric = metric.upper()
+    if metric not in DISTANCE_METRICS:
+        raise ValueError('Unsupported distance metric: %s' % (metric))
+    if isinstance(colors, Color):
+        colors = [colors]
+    if not isinstance(colors, ColorArray):
+        colors = ColorArray.from_colors(colors)
+    points = colors.lab if metric == 'LAB' else colors.color
+
+    if not len(points):
+        return points, np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    unique, first, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+    return unique, inverse.ravel(), first
+
+
+def _close_pairs(points, tolerance):
+    """Index pairs (a, b), a != b, of points no more than tolerance apart"""
+    none = np.zeros(0, dtype=np.intp)
+    if len(points) < 2 or tolerance <= 0:
+        return none, none
+
+    keys, span = _cube_keys(points, tolerance)
+
+    # Points sorted by cube, points of cube i are order[starts[i]:starts[i] + counts[i]]
+    order = np.argsort(keys, kind='mergesort')
+    cube_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    pairs_a, pairs_b = [], []
+    for x, y, z in _OFFSETS:
+        targets = cube_keys + (x * span[1] + y) * span[2] + z
+        found = np.minimum(np.searchsorted(cube_keys, targets), len(cube_keys) - 1)
+        source = np.flatnonzero(cube_keys[found] == targets)
+        target = found[source]
+
+        # Every point of the source cube with every point of the target cube
+        owner, a = _expand(starts[source], counts[source])
+        owner, b = _expand(starts[target][owner], counts[target][owner])
+        a = a[owner]
+        if (x, y, z) == (0, 0, 0):
+            keep = a < b
+            a, b = a[keep], b[keep]
+
+        a, b = order[a], order[b]
+        close = np.sqrt(((points[a] - points[b]) ** 2).sum(axis=1)) <= tolerance
+        pairs_a.append(a[close])
+        pairs_b.append(b[close])
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
+
+
+def _cube_keys(points, tolerance):
+    """
+    Packed cube of each point, and the span of each axis: the cube offset
+    (x, y, z) away has key + (x * span[1] + y) * span[2] + z
+    """
+    # Cube coordinates, ranked per axis so the packed keys stay small. Ranks
+    # of neighbouring cubes differ by 1; cubes that are only adjacent in rank
+    # add candidates the distance test drops
+    cells = np.floor((points - points.min(axis=0)) / tolerance)
+    ranks = np.empty(cells.shape, dtype=np.int64)
+    for axis in range(3):
+        _, ranks[:, axis] = np.unique(cells[:, axis], return_inverse=True)
+    span = ranks.max(axis=0) + 3
+    keys = ((ranks[:, 0] + 1) * span[1] + ranks[:, 1] + 1) * span[2] + ranks[:, 2] + 1
+    return keys, span
+
+
+def _expand(starts, counts):
+    """For runs [start, start + count): the run of each position, and the positions"""
+    owner = np.repeat(np.arange(len(counts)), counts)
+    run_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, np.arange(len(owner)) - run_offsets + np.repeat(starts, counts)
+
+
+def _components(size, a, b):
+    """
+    Connected components over pairs (union-find by hooking roots onto the
+    smaller root, then path compression, a round at a time): the smallest
+    index of each point's component
+    """
+    parent = np.arange(size)
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        if np.array_equal(root_a, root_b):
+            return parent
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
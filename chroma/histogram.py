@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.histogram
+~~~~~~~~~~~~~~~~~
+
+Provides ColorHistogram, counting colors as packed integers (requires NumPy)
+
+"""
+
+# Each color is quantized to `bits` per channel and packed into one
+# integer, red in the high bits: (r << 2 * bits) | (g << bits) | b, with
+# alpha appended in the lowest bits when counted. Counting is a bincount
+# into a dense array of every possible key, or np.unique over the keys
+# seen for wide keys, where a dense array would be too large
+
+import numpy as np
+
+from .core import Color
+from .array import ColorArray, _round
+from .buffer import PixelBuffer
+
+# Widest key counted densely by default: 2^21 bins, 16 MB of counts
+DENSE_BITS = 21
+
+
+class ColorHistogram(object):
+    """
+    Chroma ColorHistogram counts colors a chunk at a time; histograms with
+    the same settings can be merged (e.g. one per process)
+    """
+    def __init__(self, bits=8, alpha=False, dense=None):
+        if not 1 <= bits <= 8:
+            raise ValueError('ColorHistogram bits per channel must be 1 - 8')
+
+        self.bits = bits
+        self.alpha = alpha
+        self.channels = 4 if alpha else 3
+        key_bits = bits * self.channels
+        self.dense = key_bits <= DENSE_BITS if dense is None else dense
+
+        # Dense: counts for every key; sparse: sorted keys seen, and counts
+        if self.dense:
+            self._counts = np.zeros(1 << key_bits, dtype=np.int64)
+        else:
+            self._keys = np.zeros(0, dtype=np.int64)
+            self._counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, colors):
+        """
+        Count colors: a ColorArray, PixelBuffer, N x 3 / N x 4 uint8 array or
+        any iterable of Color objects
+        """
+        keys = self._pack(self._bytes(colors))
+        if self.dense:
+            self._counts += np.bincount(keys, minlength=len(self._counts))
+        else:
+            keys, counts = np.unique(keys, return_counts=True)
+            self._merge(keys, counts)
+
+    def update(self, other):
+        """Add the counts of another histogram with the same settings"""
+        if (other.bits, other.alpha) != (self.bits, self.alpha):
+            raise ValueError('Cannot merge histograms with different bits / alpha')
+        keys, counts = other.items()
+        if self.dense:
+            np.add.at(self._counts, keys, counts)
+        else:
+            self._merge(keys, counts)
+
+    def __add__(self, other):
+        merged = ColorHistogram(self.bits, self.alpha, self.dense)
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def items(self):
+        """Keys counted at least once (ascending) and their counts, as arrays"""
+        if self.dense:
+            keys = np.flatnonzero(self._counts)
+            return keys, self._counts[keys]
+        return self._keys, self._counts
+
+    def total(self):
+        return int(self._counts.sum())
+
+    def __len__(self):
+        """Number of distinct (quantized) colors"""
+        if self.dense:
+            return int(np.count_nonzero(self._counts))
+        return len(self._keys)
+
+    def most_common(self, n=None):
+        """
+        [(Color, count)], most frequent first (ties by key)
+        Colors of quantized buckets are the center of the bucket
+        """
+        keys, counts = self.items()
+        if n is not None and n < len(keys):
+            top = np.argpartition(-counts, n - 1)[:n] if n > 0 else np.zeros(0, dtype=np.intp)
+            keys, counts = keys[top], counts[top]
+        order = np.lexsort((keys, -counts))
+        return list(zip(self.to_colors(keys[order]), counts[order].tolist()))
+
+    def to_colors(self, keys):
+        """Color for each packed key"""
+        byte = self._unpack(np.asarray(keys, dtype=np.int64))
+        packed = (byte[:, 0] << 16) | (byte[:, 1] << 8) | byte[:, 2]
+        if self.alpha:
+            packed = (packed << 8) | byte[:, 3]
+        return [Color.from_int(key, self.alpha) for key in packed.tolist()]
+
+    #
+    # INTERNAL
+    #
+    def _bytes(self, colors):
+        """N x channels uint8 array of the colors, opaque where alpha is missing"""
+        if isinstance(colors, PixelBuffer):
+            byte = colors.pixels
+        elif isinstance(colors, np.ndarray) and colors.dtype == np.uint8:
+            byte = colors
+        else:
+            if not isinstance(colors, ColorArray):
+                colors = ColorArray.from_colors(colors)
+            byte = _round(colors.color * 255).astype(np.uint8)
+            if colors.alpha is not None:
+                alpha = _round(colors.alpha * 255).astype(np.uint8)
+                byte = np.column_stack((byte, alpha))
+
+        if byte.ndim != 2 or byte.shape[1] not in (3, 4):
+            raise ValueError('Expected N x 3 or N x 4 8-bit colors, got shape %s' % (byte.shape,))
+        if self.alpha and byte.shape[1] == 3:
+            byte = np.column_stack((byte, np.full(len(byte), 255, dtype=np.uint8)))
+        return byte[:, :self.channels]
+
+    def _pack(self, byte):
+        shift = 8 - self.bits
+        keys = np.zeros(len(byte), dtype=np.int64)
+        for channel in range(self.channels):
+            keys = (keys << self.bits) | (byte[:, channel] >> shift)
+        return keys
+
+    def _unpack(self, keys):
+        """8-bit values of each key, bucket centers when quantized"""
+        shift = 8 - self.bits
+        center = (1 << shift) >> 1
+        mask = (1 << self.bits) - 1
+        byte = np.empty((len(keys), self.channels), dtype=np.int64)
+        for channel in range(self.channels - 1, -1, -1):
+            byte[:, channel] = ((keys & mask) << shift) | center
+            keys = keys >> self.bits
+        return byte
+
+    def _merge(self, keys, counts):
+        """Sparse: add counts for sorted, distinct keys"""
+        all_keys = np.concatenate((self._keys, keys))
+        self._keys, inverse = np.unique(all_keys, return_inverse=True)
+        self._counts = np.bincount(inverse.ravel(), np.concatenate((self._counts, counts)),
+                                   minlength=len(self._keys)).astype(np.int64)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.instrument
+~~~~~~~~~~~~~~~~~~
+
+Provides opt-in counters and timings for Color operations
+
+"""
+
+# enable() replaces the Color constructors, properties and mix functions
+# with recording wrappers, disable() puts the originals back, so nothing is
+# added to the call path while instrumentation is off.
+#
+# Only operations called from outside chroma are recorded: reading cmyk
+# counts get.cmyk, not the get.cmy it uses internally. Hex parsing is the
+# exception, every parse (and failure) is counted as parse_hex.
+
+import contextlib
+import sys
+import threading
+import time
+
+from . import core
+from .core import Color
+
+_CONSTRUCTORS = ('from_rgb', 'from_rgb256', 'from_hex', 'from_int', 'from_rgb_unchecked')
+_PROPERTIES = ('rgb', 'rgb256', 'hls', 'hsv', 'cmy', 'cmyk', 'xyz', 'lab', 'luminance', 'hex', 'name',
+               'alpha')
+_MIXES = ('additive_mix', 'subtractive_mix')
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+# (owner, attribute) -> original, empty while disabled
+_originals = {}
+_timing = False
+
+# Operation name -> [calls, errors, seconds, {bucket (us): calls}]
+_stats = {}
+
+# Nesting depth of recorded calls, per thread
+_local = threading.local()
+
+
+def enable(timing=False):
+    """
+    Start recording; with timing, also the time spent per operation
+    (adds two clock reads per call)
+    """
+    global _timing
+    _timing = timing
+    if _originals:
+        return
+
+    _patch(Color, '__init__', _wrap_init(Color.__init__))
+    for name in _CONSTRUCTORS:
+        _patch(Color, name, classmethod(_wrap(name, getattr(Color, name).__func__)))
+    for name in _PROPERTIES:
+        prop = Color.__dict__[name]
+        _patch(Color, name, property(_wrap('get.' + name, prop.fget),
+                                     _wrap('set.' + name, prop.fset), None, prop.__doc__))
+    for name in _MIXES:
+        _patch(Color, name, _wrap(name, Color.__dict__[name]))
+
+    # mix_many is also bound in the package namespace
+    mix_many = _wrap('mix_many', core.mix_many)
+    _patch(core, 'mix_many', mix_many)
+    _patch(sys.modules[__name__.rsplit('.', 1)[0]], 'mix_many', mix_many)
+    _patch(core, '_rgb_from_hex', _wrap('parse_hex', core._rgb_from_hex, nested=True))
+
+
+def disable():
+    """Stop recording and restore the original functions, counts are kept"""
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+def enabled():
+    return bool(_originals)
+
+
+def snapshot():
+    """
+    Copy of the counts so far:
+    {operation: {'calls', 'errors', 'seconds', 'histogram'}}
+    histogram maps an upper bound in microseconds (powers of two) to calls
+    """
+    return dict((name, {'calls': calls, 'errors': errors, 'seconds': seconds,
+                        'histogram': dict(histogram)})
+                for name, (calls, errors, seconds, histogram) in _stats.items())
+
+
+def reset():
+    """Clear all counts"""
+    _stats.clear()
+
+
+@contextlib.contextmanager
+def recording(timing=False):
+    """
+    Record one block of code on its own, yields a dict filled with the
+    block's snapshot() on exit:
+
+        with instrument.recording() as stats:
+            handle_request()
+        stats['get.hls']['calls']
+
+    The block's counts are added to the overall counts afterwards, and
+    instrumentation is left as enabled / disabled as it was before
+    """
+    global _stats, _timing
+    was_enabled, was_timing = enabled(), _timing
+    outer, _stats = _stats, {}
+    block = {}
+    enable(timing)
+    try:
+        yield block
+    finally:
+        block.update(snapshot())
+        _merge(outer, _stats)
+        _stats = outer
+        _timing = was_timing
+        if not was_enabled:
+            disable()
+
+
+#
+# INTERNAL
+#
+
+def _patch(owner, name, replacement):
+    _originals[(owner, name)] = owner.__dict__[name]
+    setattr(owner, name, replacement)
+
+
+def _record(name, failed, start):
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = [0, 0, 0.0, {}]
+    stats[0] += 1
+    if failed:
+        stats[1] += 1
+    if start is not None:
+        elapsed = _clock() - start
+        stats[2] += elapsed
+        bucket = 1 << int(elapsed * 1e6).bit_length()
+        stats[3][bucket] = stats[3].get(bucket, 0) + 1
+
+
+def _call(name, func, args, kwargs, nested):
+    """Call func, recording it under name unless it runs inside another recorded call"""
+    depth = getattr(_local, 'depth', 0)
+    if depth and not nested:
+        return func(*args, **kwargs)
+
+    _local.depth = depth + 1
+    failed = True
+    start = _clock() if _timing else None
+    try:
+        result = func(*args, **kwargs)
+        failed = False
+        return result
+    finally:
+        _local.depth = depth
+        _record(name, failed, start)
+
+
+def _wrap(name, func, nested=False):
+    if func is None:
+        return None
+
+    def recorded(*args, **kwargs):
+        return _call(name, func, args, kwargs, nested)
+    recorded.__name__ = func.__name__
+    recorded.__doc__ = func.__doc__
+    return recorded
+
+
+def _wrap_init(func):
+    """__init__ is recorded per format, as init.HEX, init.RGB, ..."""
+    def __init__(self, color_value='#FFFFFF', format='HEX'):
+        name = 'init.' + str(format).upper()
+        return _call(name, func, (self, color_value, format), {}, False)
+    __init__.__doc__ = func.__doc__
+    return __init__
+
+
+def _merge(into, stats):
+    for name, (calls, errors, seconds, histogram) in stats.items():
+        total = into.get(name)
+        if total is None:
+            total = into[name] = [0, 0, 0.0, {}]
+        total[0] += calls
+        total[1] += errors
+        total[2] += seconds
+        for bucket, count in histogram.items():
+            total[3][bucket] = total[3].get(bucket, 0) + count
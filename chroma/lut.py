@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.lut
+~~~~~~~~~~~
+
+Provides LUT3D, precomputed 3D lookup tables over RGB (requires NumPy)
+
+"""
+
+# A table samples a conversion on a size x size x size lattice of RGB
+# values, indexed table[r, g, b]. Size 256 has an entry for every 8-bit
+# color, so 8-bit input is looked up directly; smaller lattices interpolate
+#
+# Hue (degrees) wraps from 360 to 0, so a hue channel is interpolated as the
+# angle of the interpolated (cos, sin) of its lattice values
+#
+# save() layout, all little-endian:
+#   header (20 bytes): magic 'CLUT', version (uint16), hue channel (int16,
+#                      -1 for none), title length (uint32), table offset (uint64)
+#   title:             UTF-8, empty for none
+#   table:             a .npy array at the table offset, which load() maps
+
+import struct
+
+import numpy as np
+
+from .array import ColorArray, _as_color_array
+from .buffer import PixelBuffer
+
+# Colors interpolated at a time, bounds temporary memory
+CHUNK_SIZE = 1 << 18
+
+# Lattice size with one entry per 8-bit value
+FULL_SIZE = 256
+
+# Conversions whose first channel is hue, in degrees
+_HUE_CONVERSIONS = ('hls', 'hsv')
+
+MAGIC = b'CLUT'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHhIQ')
+
+
+class LUT3D(object):
+    """
+    Chroma LUT3D holds a conversion from RGB sampled on a regular lattice,
+    and applies it to many colors without running the conversion math
+    """
+    def __init__(self, table, domain_min=(0.0, 0.0, 0.0), domain_max=(1.0, 1.0, 1.0), title=None,
+                 hue_channel=None):
+        # hue_channel: output channel holding hue in degrees, if any
+        table = np.asarray(table)
+        if table.ndim != 4 or not table.shape[0] == table.shape[1] == table.shape[2] or table.shape[0] < 2:
+            raise ValueError('Expected a size x size x size x k table, got shape %s' % (table.shape,))
+
+        self.table = table
+        self.size = table.shape[0]
+        self.domain_min = np.asarray(domain_min, dtype=np.float64)
+        self.domain_max = np.asarray(domain_max, dtype=np.float64)
+        self.title = title
+        self.hue_channel = hue_channel
+
+    @classmethod
+    def build(cls, conversion, size=33, dtype=np.float32):
+        """
+        Sample a conversion on the lattice
+        conversion: ColorArray property name ('hls', 'hsv', 'cmyk', 'lab', ...)
+        or a function from ColorArray to an N x k array
+        size 256 gives the exact 2^24 entry table (200 MB as float32, 3 channels)
+        """
+        title = hue_channel = None
+        if not callable(conversion):
+            title = name = conversion.lower()
+            conversion = lambda colors: getattr(colors, name)
+            if name in _HUE_CONVERSIONS:
+                hue_channel = 0
+
+        axis = np.arange(size) / float(size - 1)
+        g, b = [a.ravel() for a in np.meshgrid(axis, axis, indexing='ij')]
+
+        # One red slice at a time, bounds the float64 temporaries
+        slices = []
+        for r in axis:
+            colors = ColorArray()
+            colors.color = np.column_stack((np.full(len(g), r), g, b))
+            slices.append(np.asarray(conversion(colors), dtype=dtype))
+        table = np.stack(slices).reshape(size, size, size, -1)
+        return cls(table, title=title, hue_channel=hue_channel)
+
+    #
+    # Applying
+    #
+    def apply(self, colors, method='trilinear'):
+        """
+        Look up colors (ColorArray, PixelBuffer or N x 3 RGB float array)
+        method: 'trilinear', 'tetrahedral' or 'nearest' between lattice points,
+        8-bit input to a 256 lattice is always exact
+        Returns an N x k array
+        """
+        if method not in ('trilinear', 'tetrahedral', 'nearest'):
+            raise ValueError('Unsupported interpolation: %s' % (method))
+
+        if isinstance(colors, PixelBuffer):
+            if self._direct():
+                pixels = colors.pixels
+                return self.table[pixels[:, 0], pixels[:, 1], pixels[:, 2]]
+            rgb = colors.to_array().color
+        elif isinstance(colors, ColorArray):
+            rgb = colors.color
+        else:
+            rgb = _as_color_array(colors)[:, :3]
+
+        if self._direct():
+            byte = (rgb * 255 + 0.5).astype(np.uint8)
+            if np.array_equal(byte / 255.0, rgb):
+                return self.table[byte[:, 0], byte[:, 1], byte[:, 2]]
+
+        interpolate = getattr(self, '_' + method)
+        result = np.empty((len(rgb), self.table.shape[3]))
+        for start in range(0, len(rgb), CHUNK_SIZE):
+            stop = start + CHUNK_SIZE
+            result[start:stop] = self._from_vertex_values(
+                interpolate(self._lattice_coordinates(rgb[start:stop])))
+        return result
+
+    #
+    # Files
+    #
+    def save(self, path):
+        """Write the table with its title and hue channel, load() memory maps the table"""
+        if not (np.all(self.domain_min == 0) and np.all(self.domain_max == 1)):
+            raise ValueError('Tables with a custom domain can only be saved with save_cube')
+
+        title = (self.title or u'').encode('utf-8')
+        hue_channel = -1 if self.hue_channel is None else self.hue_channel
+        table_offset = _align(_HEADER.size + len(title))
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, hue_channel, len(title), table_offset))
+            f.write(title)
+            f.write(b'\0' * (table_offset - f.tell()))
+            np.save(f, self.table)
+
+    @classmethod
+    def load(cls, path, mmap=True, hue_channel=None):
+        """
+        Read a table written by save(), memory mapped by default
+        Plain .npy tables load too
+        hue_channel: as for LUT3D, overrides the saved one
+        """
+        title = None
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if header.startswith(np.lib.format.MAGIC_PREFIX):
+                # A plain .npy table, without title or hue channel
+                table_offset = 0
+            else:
+                if len(header) != _HEADER.size or header[:4] != MAGIC:
+                    raise ValueError('Not a chroma LUT file: %s' % (path))
+                magic, version, saved_channel, title_length, table_offset = _HEADER.unpack(header)
+                if version > VERSION:
+                    raise ValueError('Unsupported LUT file version %d: %s' % (version, path))
+                title = f.read(title_length).decode('utf-8') or None
+                if hue_channel is None and saved_channel >= 0:
+                    hue_channel = saved_channel
+
+            f.seek(table_offset)
+            if not mmap:
+                return cls(np.lib.format.read_array(f), title=title, hue_channel=hue_channel)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            data_offset = f.tell()
+
+        table = np.memmap(path, dtype, 'r', data_offset, shape, 'F' if fortran_order else 'C')
+        return cls(table, title=title, hue_channel=hue_channel)
+
+    @classmethod
+    def load_cube(cls, path, hue_channel=None):
+        """Read an Adobe / Resolve .cube 3D LUT file"""
+        title = None
+        size = None
+        domain_min, domain_max = (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)
+        data = []
+
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                keyword = line.split(None, 1)[0]
+                if keyword[0].isdigit() or keyword[0] in '-+.':
+                    data.append(line)
+                elif keyword == 'TITLE':
+                    title = line[len(keyword):].strip().strip('"')
+                elif keyword == 'LUT_3D_SIZE':
+                    size = int(line.split()[1])
+                elif keyword == 'DOMAIN_MIN':
+                    domain_min = tuple(float(x) for x in line.split()[1:4])
+                elif keyword == 'DOMAIN_MAX':
+                    domain_max = tuple(float(x) for x in line.split()[1:4])
+                elif keyword == 'LUT_1D_SIZE':
+                    raise ValueError('1D .cube LUTs are not supported: %s' % (path))
+
+        if size is None or len(data) != size ** 3:
+            raise ValueError('Invalid .cube file: %s' % (path))
+
+        # Red changes fastest in the file, so rows are ordered [b, g, r]
+        values = np.array(' '.join(data).split(), dtype=np.float64).reshape(size, size, size, 3)
+        return cls(values.transpose(2, 1, 0, 3), domain_min, domain_max, title, hue_channel)
+
+    def save_cube(self, path):
+        """Write a .cube file (tables with 3 output channels)"""
+        if self.table.shape[3] != 3:
+            raise ValueError('.cube files hold exactly 3 output channels')
+
+        with open(path, 'w') as f:
+            if self.title:
+                f.write('TITLE "%s"\n' % (self.title))
+            f.write('LUT_3D_SIZE %d\n' % (self.size))
+            f.write('DOMAIN_MIN %r %r %r\n' % tuple(self.domain_min.tolist()))
+            f.write('DOMAIN_MAX %r %r %r\n' % tuple(self.domain_max.tolist()))
+            rows = np.asarray(self.table, dtype=np.float64).transpose(2, 1, 0, 3).reshape(-1, 3)
+            np.savetxt(f, rows, fmt='%.6f')
+
+    #
+    # INTERNAL
+    #
+    def _direct(self):
+        """Whether 8-bit input indexes the table directly"""
+        return (self.size == FULL_SIZE and np.all(self.domain_min == 0)
+                and np.all(self.domain_max == 1))
+
+    def _lattice_coordinates(self, rgb):
+        """Lower lattice corner (int) and position inside the cell (0 - 1)"""
+        x = (rgb - self.domain_min) / (self.domain_max - self.domain_min)
+        x = np.clip(x, 0.0, 1.0) * (self.size - 1)
+        corner = np.minimum(np.floor(x).astype(np.intp), self.size - 2)
+        return corner, x - corner
+
+    def _at(self, corner, offset):
+        """Lattice values at corner + offset, hue as (cos, sin) in the last two columns"""
+        values = self.table[corner[:, 0] + offset[0], corner[:, 1] + offset[1], corner[:, 2] + offset[2]]
+        if self.hue_channel is None:
+            return values
+        angle = np.radians(values[:, self.hue_channel])
+        return np.column_stack((values, np.cos(angle), np.sin(angle)))
+
+    def _from_vertex_values(self, values):
+        """Undo _at: hue back from the (cos, sin) columns, in degrees 0 - 360"""
+        if self.hue_channel is None:
+            return values
+        hue = np.degrees(np.arctan2(values[:, -1], values[:, -2])) % 360
+        # A tiny negative angle rounds up to 360
+        hue[hue == 360] = 0.0
+        values = values[:, :-2].copy()
+        values[:, self.hue_channel] = hue
+        return values
+
+    def _nearest(self, coordinates):
+        corner, fraction = coordinates
+        return self._at(corner + (fraction >= 0.5), (0, 0, 0))
+
+    def _trilinear(self, coordinates):
+        corner, fraction = coordinates
+        result = 0
+        for offset in np.ndindex(2, 2, 2):
+            weight = np.prod(np.where(offset, fraction, 1 - fraction), axis=1)
+            result = result + weight[:, np.newaxis] * self._at(corner, offset)
+        return result
+
+    def _tetrahedral(self, coordinates):
+        # Walk from the lower corner to the upper one, one axis at a time in
+        # order of decreasing fraction; the four visited vertices enclose the
+        # color and the fraction gaps are their weights
+        corner, fraction = coordinates
+        rows = np.arange(len(fraction))[:, np.newaxis]
+        order = np.argsort(-fraction, axis=1, kind='mergesort')
+        f = fraction[rows, order]
+        weights = (1 - f[:, 0], f[:, 0] - f[:, 1], f[:, 1] - f[:, 2], f[:, 2])
+
+        vertex = corner.copy()
+        result = weights[0][:, np.newaxis] * self._at(vertex, (0, 0, 0))
+        for step in range(3):
+            vertex[rows[:, 0], order[:, step]] += 1
+            result = result + weights[step + 1][:, np.newaxis] * self._at(vertex, (0, 0, 0))
+        return result
+
+
+def _align(offset, alignment=64):
+    return (offset + alignment - 1) // alignment * alignment
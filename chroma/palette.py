@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.palette
+~~~~~~~~~~~~~~~
+
+Provides Palette object, nearest color lookups (requires NumPy)
+
+"""
+
+import numpy as np
+
+from .array import ColorArray, _as_color_array, _rgb_to_xyz, _xyz_to_lab
+
+# Space name -> (lower, upper) bounds of every color in that space
+# Lookups are exact for any query inside these bounds
+_DOMAINS = {
+    'RGB': ((0.0, 0.0, 0.0), (1.0, 1.0, 1.0)),
+    'LAB': ((-1.0, -90.0, -110.0), (101.0, 100.0, 100.0)),
+}
+
+# Query rows x candidates compared at a time by _GridIndex.query
+_QUERY_BLOCK = 1 << 16
+
+
+class Palette(object):
+    """
+    Chroma Palette holds a fixed list of colors and finds the closest entry
+    to any color, measured in RGB or CIE Lab (perceptual) space
+    """
+    def __init__(self, colors, space='RGB'):
+        self.colors = list(colors)
+        if not self.colors:
+            raise ValueError('Palette needs at least one color')
+
+        self.space = space.upper()
+        if self.space not in _DOMAINS:
+            raise ValueError('Unsupported chroma.Palette space: %s' % (space))
+
+        self.array = ColorArray.from_colors(self.colors)
+        lower, upper = _DOMAINS[self.space]
+        self._index = _GridIndex(self._points(self.array.color), lower, upper)
+
+    # Container protocol
+    def __len__(self):
+        return len(self.colors)
+
+    def __iter__(self):
+        return iter(self.colors)
+
+    def __getitem__(self, index):
+        return self.colors[index]
+
+    #
+    # Lookups
+    # Alpha is ignored when matching
+    #
+    def nearest(self, color):
+        """Palette color closest to color"""
+        return self.colors[self.nearest_index(color)]
+
+    def nearest_index(self, color):
+        """Position in the palette of the color closest to color"""
+        point = self._points(np.array([color.color]))[0]
+        return int(self._index.query_one(point))
+
+    def nearest_many(self, colors):
+        """
+        Positions of the closest palette colors, as an int array
+        colors: ColorArray or an N x 3 array of RGB floats
+        """
+        rgb = colors.color if isinstance(colors, ColorArray) else _as_color_array(colors)[:, :3]
+        return self._index.query(self._points(rgb))
+
+    #
+    # INTERNAL
+    #
+    def _points(self, rgb):
+        if self.space == 'LAB':
+            return _xyz_to_lab(_rgb_to_xyz(rgb))
+        return rgb
+
+
+class _GridIndex(object):
+    """
+    Exact nearest neighbour index over a uniform grid
+    For every cell the index keeps each point that could be nearest to some
+    location inside that cell: a point is kept when its minimum distance to
+    the cell is no more than the smallest maximum distance of any point.
+    A query then only compares against the candidates of its own cell.
+    """
+    def __init__(self, points, lower, upper, cells=None):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+
+        # About one point per cell, within limits
+        if cells is None:
+            cells = int(np.clip(np.ceil(len(self.points) ** (1.0 / 3)), 4, 16))
+        self.cells = cells
+        self.cell_size = (self.upper - self.lower) / cells
+
+        # Candidates of cell i are flat[offsets[i]:offsets[i + 1]]
+        candidates = self._candidates()
+        self.offsets = np.concatenate(([0], np.cumsum([len(c) for c in candidates])))
+        self.flat = np.concatenate(candidates)
+
+    def query_one(self, point):
+        cell = self._cell_ids(point[np.newaxis])[0]
+        candidates = self.flat[self.offsets[cell]:self.offsets[cell + 1]]
+        distances = ((self.points[candidates] - point) ** 2).sum(axis=1)
+        return candidates[np.argmin(distances)]
+
+    def query(self, points):
+        points = np.asarray(points, dtype=np.float64)
+        result = np.empty(len(points), dtype=np.intp)
+        if not len(points):
+            return result
+
+        # Group queries by cell, then compare each group with its candidates
+        cell_ids = self._cell_ids(points)
+        order = np.argsort(cell_ids, kind='mergesort')
+        sorted_ids = cell_ids[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_ids[1:] != sorted_ids[:-1])))
+        stops = np.concatenate((starts[1:], [len(points)]))
+
+        for start, stop in zip(starts, stops):
+            cell = sorted_ids[start]
+            candidates = self.flat[self.offsets[cell]:self.offsets[cell + 1]]
+            candidate_points = self.points[candidates][np.newaxis, :, :]
+            # Rows of a cell a slice at a time, so memory stays bounded
+            step = max(1, _QUERY_BLOCK // len(candidates))
+            for block in range(start, stop, step):
+                rows = order[block:min(block + step, stop)]
+                diff = points[rows][:, np.newaxis, :] - candidate_points
+                result[rows] = candidates[np.argmin((diff ** 2).sum(axis=2), axis=1)]
+        return result
+
+    def _cell_ids(self, points):
+        coords = np.floor((points - self.lower) / self.cell_size).astype(np.intp)
+        coords = np.clip(coords, 0, self.cells - 1)
+        return (coords[:, 0] * self.cells + coords[:, 1]) * self.cells + coords[:, 2]
+
+    def _candidates(self):
+        n = self.cells
+        size = self.cell_size
+
+        # Points sorted by cell, points of cell i are by_cell[starts[i]:starts[i + 1]]
+        point_ids = self._cell_ids(self.points)
+        by_cell = np.argsort(point_ids, kind='mergesort')
+        starts = np.searchsorted(point_ids[by_cell], np.arange(n ** 3 + 1))
+
+        candidates = []
+        for cell, coord in enumerate(np.indices((n, n, n)).reshape(3, -1).T):
+            lo = self.lower + coord * size
+            hi = lo + size
+
+            # Any point gives an upper bound on the distance from a location in
+            # this cell to its nearest point, so grow a cube of cells until one
+            # turns up
+            reach = 0
+            members = self._points_near(coord, reach, by_cell, starts)
+            while not len(members):
+                reach += 1
+                members = self._points_near(coord, reach, by_cell, starts)
+            bound = _farthest(lo, hi, self.points[members]).min()
+
+            # Every candidate lies within sqrt(bound) of the cell
+            reach = max(reach, int(np.ceil(np.sqrt(bound) / size.min())))
+            members = self._points_near(coord, reach, by_cell, starts)
+            points = self.points[members]
+            bound = _farthest(lo, hi, points).min()
+
+            # Small slack so rounding never drops the true nearest point
+            keep = _nearest(lo, hi, points) <= bound * (1 + 1e-9) + 1e-12
+            # In palette order, so ties go to the earliest entry
+            candidates.append(np.sort(members[keep]))
+        return candidates
+
+    def _points_near(self, coord, reach, by_cell, starts):
+        """Points in the cube of cells within reach of the cell at coord"""
+        n = self.cells
+        first = np.maximum(coord - reach, 0)
+        last = np.minimum(coord + reach, n - 1)
+
+        # Cells along z are consecutive, so each (x, y) column is one slice
+        slices = []
+        for x in range(first[0], last[0] + 1):
+            for y in range(first[1], last[1] + 1):
+                column = (x * n + y) * n
+                slices.append(by_cell[starts[column + first[2]]:starts[column + last[2] + 1]])
+        return np.concatenate(slices)
+
+
+def _farthest(lo, hi, points):
+    """Squared distance from each point to the farthest corner of a box"""
+    return np.maximum((points - lo) ** 2, (points - hi) ** 2).sum(axis=1)
+
+
+def _nearest(lo, hi, points):
+    """Squared distance from each point to the box (0 inside it)"""
+    return (np.maximum(np.maximum(lo - points, points - hi), 0) ** 2).sum(axis=1)
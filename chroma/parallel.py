@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.parallel
+~~~~~~~~~~~~~~~~
+
+Provides convert_many, batch conversion over a process pool (requires NumPy)
+
+"""
+
+# Color data is handed to worker processes through shared memory, only the
+# block names and row ranges are pickled
+
+import multiprocessing
+
+import numpy as np
+
+from .array import ColorArray
+from .names import _NAMED
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python < 3.8, conversions run in this process
+    shared_memory = None
+
+FORMATS = ('HEX', 'RGB', 'RGB256', 'HLS', 'HSV', 'CMY', 'CMYK', 'XYZ', 'LAB', 'NAME')
+
+# Formats without an alpha channel
+_NO_ALPHA_FORMATS = ('CMY', 'CMYK', 'XYZ', 'LAB', 'NAME')
+
+# Widest hex value: '#RRGGBBAA'
+_HEX_DTYPE = 'S9'
+
+# Widest CSS color name
+_NAME_DTYPE = 'U%d' % (max(len(name) for name in _NAMED))
+
+# Formats given and returned as strings, and their output dtype
+_STRING_DTYPES = {'HEX': _HEX_DTYPE, 'NAME': _NAME_DTYPE}
+
+# Below this many colors per worker a pool costs more than it saves
+_MIN_CHUNK = 10000
+
+
+def convert_many(values, src='HEX', dst='HLS', workers=None):
+    """
+    Convert many color values from format src to format dst
+    Accepts any format Color does. HEX and NAME output is a list of strings,
+    every other format an N x k array (alpha column included when set, as in Color)
+    workers: number of processes, defaults to the CPU count
+    """
+    src = _check_format(src)
+    dst = _check_format(dst)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    data = _pack_input(values, src)
+    has_alpha = _has_alpha(data, src)
+
+    n = len(data)
+    if n == 0:
+        # Same type and width as a non-empty result would have
+        out_dtype, out_shape = _output_layout(n, dst, has_alpha)
+        return _unpack_output(np.empty(out_shape, dtype=out_dtype), dst)
+
+    workers = min(workers, n // _MIN_CHUNK)
+    if workers <= 1 or shared_memory is None:
+        return _unpack_output(_convert(data, src, dst, has_alpha), dst)
+
+    out_dtype, out_shape = _output_layout(n, dst, has_alpha)
+    shared_in = _share(data.nbytes)
+    shared_out = _share(np.dtype(out_dtype).itemsize * int(np.prod(out_shape)))
+    try:
+        _view(shared_in, data.dtype, data.shape)[:] = data
+
+        # A few chunks per worker to even out the load
+        bounds = np.linspace(0, n, workers * 4 + 1).astype(int)
+        tasks = [(shared_in.name, data.dtype.str, data.shape,
+                  shared_out.name, np.dtype(out_dtype).str, out_shape,
+                  start, stop, src, dst, has_alpha)
+                 for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+        pool = multiprocessing.Pool(workers)
+        try:
+            pool.map(_convert_chunk, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+        result = _view(shared_out, out_dtype, out_shape).copy()
+    finally:
+        for block in (shared_in, shared_out):
+            block.close()
+            block.unlink()
+
+    return _unpack_output(result, dst)
+
+
+#
+# INTERNAL
+#
+
+def _check_format(format):
+    format = format.upper()
+    if format not in FORMATS:
+        raise ValueError('Unsupported chroma.Color format: %s' % (format))
+    return format
+
+
+def _pack_input(values, src):
+    """Input as a fixed width array that can live in shared memory"""
+    if src not in _STRING_DTYPES:
+        data = np.asarray(values, dtype=np.float64)
+        if data.ndim == 1 and data.size == 0:
+            data = data.reshape(0, 4 if src == 'CMYK' else 3)
+        return data
+
+    strings = np.asarray(values)
+    if len(strings) == 0:
+        return np.empty(0, dtype=_STRING_DTYPES[src])
+    if strings.ndim != 1 or strings.dtype.kind not in 'SU':
+        raise ValueError('Expected a sequence of %s strings' % (src.lower()))
+    if src == 'NAME':
+        # Any width, names are looked up as given
+        return strings.astype('U')
+
+    too_long = np.char.str_len(strings) > 9
+    if too_long.any():
+        raise ValueError('Invalid Hex Input: %s' % (values[np.argmax(too_long)]))
+    try:
+        return strings.astype(_HEX_DTYPE)
+    except UnicodeEncodeError as e:
+        # Hex digits are ASCII, anything else can not be a hex value
+        raise ValueError('Invalid Hex Input: %s' % (e.object))
+
+
+def _has_alpha(data, src):
+    """Whether any input value carries alpha (decides the output width)"""
+    if src == 'HEX':
+        digits = np.char.str_len(data) - (data.view(np.uint8).reshape(-1, 9)[:, 0] == ord('#'))
+        return bool((digits == 8).any())
+    if src in _NO_ALPHA_FORMATS:
+        return False
+    return data.ndim == 2 and data.shape[1] > 3
+
+
+def _output_layout(n, dst, has_alpha):
+    if dst in _STRING_DTYPES:
+        return _STRING_DTYPES[dst], (n,)
+    width = {'CMY': 3, 'CMYK': 4, 'XYZ': 3, 'LAB': 3}.get(dst, 4 if has_alpha else 3)
+    # As ColorArray.rgb256, integers unless an alpha column is stacked on
+    if dst == 'RGB256' and not has_alpha:
+        return np.int64, (n, width)
+    return np.float64, (n, width)
+
+
+def _convert(data, src, dst, has_alpha):
+    """Convert packed input rows, in whichever process this runs in"""
+    if src in _STRING_DTYPES:
+        colors = ColorArray(data.tolist(), src)
+    else:
+        colors = ColorArray(data, src)
+
+    # The whole batch gets alpha if any value had it, as with ColorArray
+    if has_alpha and colors.alpha is None:
+        colors.alpha = 1.0
+
+    if dst in _STRING_DTYPES:
+        return np.array(getattr(colors, dst.lower()), dtype=_STRING_DTYPES[dst])
+    return getattr(colors, dst.lower())
+
+
+def _convert_chunk(task):
+    (in_name, in_dtype, in_shape, out_name, out_dtype, out_shape,
+     start, stop, src, dst, has_alpha) = task
+
+    shared_in = shared_memory.SharedMemory(name=in_name)
+    shared_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        data = _view(shared_in, in_dtype, in_shape)[start:stop]
+        _view(shared_out, out_dtype, out_shape)[start:stop] = _convert(data, src, dst, has_alpha)
+
+        # Drop the views before closing the blocks
+        del data
+    finally:
+        shared_in.close()
+        shared_out.close()
+
+
+def _share(nbytes):
+    return shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+
+def _view(block, dtype, shape):
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _unpack_output(result, dst):
+    if dst in _STRING_DTYPES:
+        return result.astype(str).tolist()
+    return result
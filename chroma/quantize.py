@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.quantize
+~~~~~~~~~~~~~~~~
+
+Provides quantize, mapping pixels onto a palette with optional dithering
+(requires NumPy)
+
+"""
+
+# Nearest mapping and ordered (Bayer) dithering are whole-array operations,
+# a chunk of pixels at a time. Floyd-Steinberg error diffusion is serial
+# within a row: each pixel needs the error of the one to its left. Row y
+# can still run two pixels behind row y - 1, so the pixels on each line
+# x + 2y = t only depend on earlier lines and are quantized together,
+# giving the same result as a plain raster scan.
+#
+# Distances are |p|^2 - 2 p.c + |c|^2 as one matrix product; the few rows
+# where two palette colors come out (nearly) equally close are measured
+# again exactly, so results match Palette.nearest_many, ties included.
+# When the pixels x palette matrix would be too large (big chunks, big
+# palettes) Palette.nearest_many's grid index is used instead.
+
+import time
+
+import numpy as np
+
+from .array import ColorArray, _round, _rgb_to_xyz, _xyz_to_lab
+from .buffer import PixelBuffer, _BYTE_TO_FLOAT_ARRAY
+from .palette import Palette
+
+DITHERS = (None, 'ordered', 'floyd_steinberg')
+
+# Pixels mapped at a time
+CHUNK_SIZE = 1 << 16
+
+# Largest pixels x palette distance matrix, beyond it the palette's index is used
+MATRIX_SIZE = 1 << 22
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+def _bayer(size):
+    """size x size Bayer index matrix, size a power of 2"""
+    matrix = np.zeros((1, 1), dtype=np.intp)
+    while len(matrix) < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    return matrix
+
+# Ordered dithering offsets, in range -0.5 - 0.5
+_BAYER = (_bayer(8) + 0.5) / 64 - 0.5
+
+
+class Quantized(object):
+    """
+    Result of quantize: the palette position of every pixel (indexes, an
+    H x W array when the width is known), the Palette and the time taken
+    """
+    def __init__(self, indexes, palette, seconds):
+        self.indexes = indexes
+        self.palette = palette
+        self.seconds = seconds
+
+    def __len__(self):
+        return self.indexes.size
+
+    @property
+    def pixels_per_second(self):
+        return self.indexes.size / self.seconds if self.seconds else float('inf')
+
+    def to_pixels(self):
+        """Quantized 8-bit RGB pixels, indexes shape x 3 uint8"""
+        table = _round(self.palette.array.color * 255).astype(np.uint8)
+        return table[self.indexes]
+
+
+def quantize(pixels, palette, dither=None, width=None, space='RGB', strength=None):
+    """
+    Map pixels (PixelBuffer, ColorArray, N x 3 / N x 4 or H x W x 3 / 4
+    uint8 array) onto palette (a Palette, or Color objects); alpha is
+    ignored
+    dither: None (nearest color), 'ordered' (8 x 8 Bayer) or
+    'floyd_steinberg'; both dithers need the image width
+    space: 'RGB' or 'LAB', where nearest colors are measured
+    strength: ordered dithering spread, by default the spacing of a uniform
+    palette of the same size
+    """
+    start = _clock()
+    if dither not in DITHERS:
+        raise ValueError('Unsupported dither: %s' % (dither))
+    if not isinstance(palette, Palette):
+        palette = Palette(palette, space)
+
+    rgb, shape = _rgb(pixels, width)
+    if dither is not None and shape is None:
+        raise ValueError('Dithering needs the image width')
+
+    # Palette points in the matching space, once per call
+    entries = palette.array.lab if palette.space == 'LAB' else palette.array.color
+
+    if dither == 'floyd_steinberg':
+        indexes = _floyd_steinberg(rgb.reshape(shape + (3,)), palette, entries)
+    else:
+        if dither == 'ordered':
+            if strength is None:
+                strength = min(1.0, 1.0 / max(len(palette) ** (1.0 / 3) - 1, 1e-9))
+            height, columns = shape
+            offsets = np.tile(_BAYER, (height // 8 + 1, columns // 8 + 1))[:height, :columns]
+            # Clamped to 0 - 1 before matching, as error diffusion does
+            rgb = np.clip(rgb + strength * offsets.reshape(-1, 1), 0.0, 1.0)
+        indexes = np.concatenate([_nearest(palette, entries, rgb[i:i + CHUNK_SIZE])
+                                  for i in range(0, len(rgb), CHUNK_SIZE)] or [np.zeros(0, dtype=np.intp)])
+        if shape is not None:
+            indexes = indexes.reshape(shape)
+
+    dtype = np.uint8 if len(palette) <= 256 else np.uint16 if len(palette) <= 65536 else np.intp
+    return Quantized(indexes.astype(dtype), palette, _clock() - start)
+
+
+#
+# INTERNAL
+#
+
+def _rgb(pixels, width):
+    """N x 3 RGB floats, and (height, width) if known"""
+    if isinstance(pixels, np.ndarray) and pixels.ndim == 3:
+        if width is not None and width != pixels.shape[1]:
+            raise ValueError('Width %d does not match the image width %d' % (width, pixels.shape[1]))
+        width = pixels.shape[1]
+        pixels = pixels.reshape(-1, pixels.shape[2])
+
+    if isinstance(pixels, PixelBuffer):
+        rgb = _BYTE_TO_FLOAT_ARRAY[pixels.pixels[:, :3]]
+    elif isinstance(pixels, ColorArray):
+        rgb = pixels.color
+    elif isinstance(pixels, np.ndarray) and pixels.dtype == np.uint8 and pixels.ndim == 2:
+        rgb = _BYTE_TO_FLOAT_ARRAY[pixels[:, :3]]
+    else:
+        raise ValueError('Expected a PixelBuffer, ColorArray or uint8 pixel array')
+
+    if width is None:
+        return rgb, None
+    if width <= 0 or len(rgb) % width:
+        raise ValueError('%d pixels do not fill rows of width %d' % (len(rgb), width))
+    return rgb, (len(rgb) // width, width)
+
+
+def _nearest(palette, entries, rgb):
+    """
+    Palette position closest to each RGB row (0 - 1), ties to the earliest
+    entry; entries are the palette points in its space
+    """
+    if len(rgb) * len(entries) > MATRIX_SIZE:
+        return palette.nearest_many(rgb)
+
+    points = _xyz_to_lab(_rgb_to_xyz(rgb)) if palette.space == 'LAB' else rgb
+    approx = (entries ** 2).sum(axis=1) - 2 * points.dot(entries.T)
+    best = approx.argmin(axis=1)
+
+    # Rows whose runner-up is within rounding error of the best
+    slack = 1e-9 * (1 + (entries ** 2).sum(axis=1).max() + (points ** 2).sum(axis=1))
+    close = (approx <= (approx[np.arange(len(best)), best] + slack)[:, np.newaxis]).sum(axis=1) > 1
+    if close.any():
+        diff = points[close][:, np.newaxis, :] - entries[np.newaxis, :, :]
+        best[close] = np.argmin((diff ** 2).sum(axis=2), axis=1)
+    return best
+
+
+def _floyd_steinberg(image, palette, entries):
+    """
+    Error diffusion over an H x W x 3 image (7/16 right, 3/16 down left,
+    5/16 down, 1/16 down right), values clamped to 0 - 1 before matching
+    """
+    height, width = image.shape[:2]
+    values = image.astype(np.float64)
+    rgb_entries = palette.array.color
+    indexes = np.zeros((height, width), dtype=np.intp)
+
+    for t in range(width + 2 * (height - 1)):
+        # Pixels (y, t - 2y) inside the image
+        ys = np.arange(max(0, (t - width) // 2 + 1), min(height - 1, t // 2) + 1)
+        xs = t - 2 * ys
+        current = np.clip(values[ys, xs], 0.0, 1.0)
+        chosen = _nearest(palette, entries, current)
+        indexes[ys, xs] = chosen
+        error = current - rgb_entries[chosen]
+
+        # Rows below first, so every pixel adds up its errors in raster order
+        below = ys + 1 < height
+        for dx, weight in ((-1, 3), (0, 5), (1, 1)):
+            into = below & (xs + dx >= 0) & (xs + dx < width)
+            values[ys[into] + 1, xs[into] + dx] += error[into] * (weight / 16.0)
+        into = xs + 1 < width
+        values[ys[into], xs[into] + 1] += error[into] * (7 / 16.0)
+    return indexes
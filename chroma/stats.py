@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.stats
+~~~~~~~~~~~~~
+
+Provides ColorStats, streaming color statistics (requires NumPy)
+
+"""
+
+# Each chunk is reduced to its count, mean and sum of squared deviations
+# per RGB channel, then folded in with the parallel form of Welford's
+# update (Chan et al.), which is also how two accumulators merge. Hue is an
+# angle, so its mean comes from the sums of cos / sin over chromatic (non
+# gray) colors, next to a 360 bin histogram of hue rounded to whole degrees
+# (as Color gives it). Memory is the same whatever the number of colors;
+# alpha is ignored
+
+import math
+
+import numpy as np
+
+from .core import Color
+from .array import ColorArray, _as_color_array, _hue, _round
+from .buffer import PixelBuffer, _BYTE_TO_FLOAT_ARRAY
+
+# Pixels of a PixelBuffer reduced at a time
+CHUNK_SIZE = 1 << 20
+
+
+class ColorStats(object):
+    """
+    Chroma ColorStats accumulates mean, variance, min / max per RGB channel
+    and hue statistics a chunk at a time; accumulators can be merged (e.g.
+    one per process)
+    """
+    def __init__(self):
+        self.count = 0
+        self._mean = np.zeros(3)
+        self._m2 = np.zeros(3)
+        self._min = np.full(3, np.inf)
+        self._max = np.full(3, -np.inf)
+
+        # Chromatic colors only
+        self.chromatic = 0
+        self._cos = 0.0
+        self._sin = 0.0
+        self._hues = np.zeros(360, dtype=np.int64)
+
+    def add(self, colors):
+        """
+        Add colors: a Color, ColorArray, PixelBuffer, N x 3 / N x 4 array
+        (uint8 as 8-bit values, floats in range 0 - 1) or any iterable of
+        Color objects
+        """
+        if isinstance(colors, PixelBuffer):
+            for start in range(0, len(colors), CHUNK_SIZE):
+                self._add_rgb(_BYTE_TO_FLOAT_ARRAY[colors.pixels[start:start + CHUNK_SIZE, :3]])
+        else:
+            self._add_rgb(_rgb(colors))
+
+    def update(self, other):
+        """Merge the colors of another accumulator into this one"""
+        self._merge_channels(other.count, other._mean, other._m2, other._min, other._max)
+        self.chromatic += other.chromatic
+        self._cos += other._cos
+        self._sin += other._sin
+        self._hues += other._hues
+
+    def __add__(self, other):
+        merged = ColorStats()
+        merged.update(self)
+        merged.update(other)
+        return merged
+
+    def __len__(self):
+        return self.count
+
+    #
+    # Per channel statistics, RGB floats in range 0 - 1
+    # None until a color has been added
+    #
+    @property
+    def mean(self):
+        return self._mean.copy() if self.count else None
+
+    @property
+    def mean_color(self):
+        """Mean as a Color"""
+        return Color.from_rgb_unchecked(tuple(self._mean.tolist())) if self.count else None
+
+    @property
+    def variance(self):
+        """Population variance"""
+        return self._m2 / self.count if self.count else None
+
+    @property
+    def std(self):
+        return np.sqrt(self._m2 / self.count) if self.count else None
+
+    @property
+    def min(self):
+        return self._min.copy() if self.count else None
+
+    @property
+    def max(self):
+        return self._max.copy() if self.count else None
+
+    #
+    # Hue statistics, in degrees, over chromatic colors
+    # None until a chromatic color has been added
+    #
+    @property
+    def hue_mean(self):
+        """Circular mean hue (0 - 360)"""
+        if not self.chromatic or self._cos == self._sin == 0:
+            return None
+        return math.degrees(math.atan2(self._sin, self._cos)) % 360
+
+    @property
+    def hue_concentration(self):
+        """Mean resultant length: 1 for a single hue, near 0 for hues spread evenly"""
+        if not self.chromatic:
+            return None
+        return math.hypot(self._cos, self._sin) / self.chromatic
+
+    @property
+    def hue_std(self):
+        """Circular standard deviation, sqrt(-2 ln(concentration))"""
+        concentration = self.hue_concentration
+        if concentration is None:
+            return None
+        if concentration <= 0:
+            return float('inf')
+        return math.degrees(math.sqrt(-2 * math.log(min(concentration, 1.0))))
+
+    @property
+    def hue_histogram(self):
+        """Chromatic colors per hue in whole degrees, as a 360 int array"""
+        return self._hues.copy()
+
+    #
+    # INTERNAL
+    #
+    def _add_rgb(self, rgb):
+        if not len(rgb):
+            return
+        mean = rgb.mean(axis=0)
+        self._merge_channels(len(rgb), mean, ((rgb - mean) ** 2).sum(axis=0),
+                             rgb.min(axis=0), rgb.max(axis=0))
+
+        maxc = rgb.max(axis=1)
+        minc = rgb.min(axis=1)
+        chromatic = maxc != minc
+        if chromatic.any():
+            hue = _hue(rgb[chromatic], maxc[chromatic], (maxc - minc)[chromatic])
+            angle = hue * (2 * np.pi)
+            self.chromatic += len(hue)
+            self._cos += float(np.cos(angle).sum())
+            self._sin += float(np.sin(angle).sum())
+            self._hues += np.bincount(_round(hue * 360).astype(np.intp) % 360,
+                                      minlength=360)
+
+    def _merge_channels(self, count, mean, m2, low, high):
+        """Chan et al. pairwise update of count, mean and squared deviations"""
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean = self._mean + delta * (float(count) / total)
+        self._m2 = self._m2 + m2 + delta ** 2 * (float(self.count) * count / total)
+        self.count = total
+        self._min = np.minimum(self._min, low)
+        self._max = np.maximum(self._max, high)
+
+
+def _rgb(colors):
+    """N x 3 array of RGB floats"""
+    if isinstance(colors, Color):
+        return np.array([colors.color], dtype=np.float64)
+    if isinstance(colors, ColorArray):
+        return colors.color
+    if isinstance(colors, np.ndarray):
+        if colors.dtype == np.uint8:
+            return _BYTE_TO_FLOAT_ARRAY[colors[:, :3]]
+        return _as_color_array(colors)[:, :3]
+    return ColorArray.from_colors(colors).color
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+chroma.stream
+~~~~~~~~~~~~~~
+
+Provides chunked conversion of text color streams (requires NumPy)
+
+"""
+
+# Rows are text lines, one color each:
+#   csv:   HEX / NAME as a bare value ('#335577'), other formats as numbers ('0.2,0.3,0.4')
+#   jsonl: HEX / NAME as a JSON string, other formats as a JSON array
+# Lines are read and converted a chunk at a time, so memory stays bounded.
+# Each row converts as Color would convert it alone: alpha only where the
+# row has it, and an invalid row does not affect the others
+
+import collections
+import itertools
+import json
+import multiprocessing
+
+from .array import ColorArray, _hex_digits
+
+FORMATS = ('HEX', 'RGB', 'RGB256', 'HLS', 'HSV', 'CMY', 'CMYK', 'XYZ', 'LAB', 'NAME')
+
+# Formats given as one string per color
+_STRING_FORMATS = ('HEX', 'NAME')
+
+# Formats given with an optional fourth (alpha) value
+_ALPHA_FORMATS = ('RGB', 'RGB256', 'HLS', 'HSV')
+
+LAYOUTS = ('csv', 'jsonl')
+
+# Output columns written as integers, as Color returns them
+_INTEGER_COLUMNS = {'RGB256': 3, 'HLS': 1, 'HSV': 1}
+
+
+def convert_lines(lines, src='HEX', dst='HLS', input='csv', output='csv'):
+    """
+    Convert one chunk of rows, returns the output rows (without newlines)
+    Blank lines are skipped, an invalid line raises ValueError
+    """
+    rows, errors = _convert_rows(lines, src.upper(), dst.upper(), input, output)
+    if errors:
+        raise ValueError(errors[0][1])
+    return rows
+
+
+def convert_stream(lines, write, src='HEX', dst='HLS', input='csv', output='csv',
+                   chunk_size=100000, workers=1, errors=None):
+    """
+    Convert an iterable of rows chunk by chunk, passing output text to write
+    With workers > 1 chunks are converted in a process pool, at most two
+    chunks per worker are in flight at once
+    errors: called with (line number, message) for each invalid line, which
+    is then skipped; without it the first invalid line raises ValueError
+    Returns the number of rows converted (blank and invalid lines excluded)
+    """
+    src, dst = src.upper(), dst.upper()
+    for format in (src, dst):
+        if format not in FORMATS:
+            raise ValueError('Unsupported chroma.Color format: %s' % (format))
+    for layout in (input, output):
+        if layout not in LAYOUTS:
+            raise ValueError('Unsupported layout: %s' % (layout))
+    if chunk_size < 1:
+        raise ValueError('Chunk size must be at least 1, got %d' % (chunk_size))
+
+    count = [0]
+
+    def emit(first_line, converted):
+        rows, invalid = converted
+        for position, message in invalid:
+            if errors is None:
+                raise ValueError('Line %d: %s' % (first_line + position, message))
+            errors(first_line + position, message)
+        count[0] += len(rows)
+        if rows:
+            write('\n'.join(rows) + '\n')
+
+    if workers <= 1:
+        for first_line, chunk in _chunks(lines, chunk_size):
+            emit(first_line, _convert_rows(chunk, src, dst, input, output))
+        return count[0]
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        pending = collections.deque()
+        for first_line, chunk in _chunks(lines, chunk_size):
+            pending.append((first_line, pool.apply_async(_convert_rows, (chunk, src, dst, input, output))))
+            if len(pending) >= 2 * workers:
+                first_line, result = pending.popleft()
+                emit(first_line, result.get())
+        while pending:
+            first_line, result = pending.popleft()
+            emit(first_line, result.get())
+    finally:
+        pool.terminate()
+        pool.join()
+    return count[0]
+
+
+#
+# INTERNAL
+#
+
+def _chunks(lines, chunk_size):
+    """(number of the first line, lines) of each chunk"""
+    lines = iter(lines)
+    first_line = 1
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield first_line, chunk
+        first_line += len(chunk)
+
+
+def _convert_rows(lines, src, dst, input, output):
+    """
+    Output rows of the valid lines, and (position, message) of the invalid
+    ones; rows with and without alpha are converted apart, so every row
+    comes out as Color gives it, wherever the chunk boundaries fall
+    """
+    values = []
+    positions = []
+    errors = []
+    for position, line in enumerate(lines):
+        row = line.strip()
+        if not row:
+            continue
+        try:
+            values.append(_parse(row, src, input))
+            positions.append(position)
+        except ValueError as e:
+            errors.append((position, str(e)))
+
+    groups = {}
+    for i, value in enumerate(values):
+        groups.setdefault(_has_alpha(value, src), []).append(i)
+
+    result = [None] * len(values)
+    for members in groups.values():
+        try:
+            converted = _format(ColorArray([values[i] for i in members], src), dst, output)
+        except (ValueError, TypeError):
+            # Convert one row at a time to single out the invalid ones
+            converted = []
+            for i in members:
+                try:
+                    converted.extend(_format(ColorArray([values[i]], src), dst, output))
+                except (ValueError, TypeError) as e:
+                    converted.append(None)
+                    errors.append((positions[i], str(e)))
+        for i, row in zip(members, converted):
+            result[i] = row
+
+    errors.sort()
+    return [row for row in result if row is not None], errors
+
+
+def _parse(row, src, input):
+    if input == 'jsonl':
+        return json.loads(row)
+    if src in _STRING_FORMATS:
+        return row
+    return [float(x) for x in row.split(',')]
+
+
+def _has_alpha(value, src):
+    """Whether a parsed value carries alpha"""
+    try:
+        if src == 'HEX':
+            return len(_hex_digits(value)) == 8
+        if src in _ALPHA_FORMATS:
+            return len(value) > 3
+    except (ValueError, TypeError):
+        pass
+    return False
+
+
+def _format(colors, dst, output):
+    """Output rows of a ColorArray"""
+    if dst in _STRING_FORMATS:
+        result = getattr(colors, dst.lower())
+        if output == 'jsonl':
+            return [json.dumps(value) for value in result]
+        return result
+
+    # Cast integer columns back to int, as Color returns them
+    integers = _INTEGER_COLUMNS.get(dst, 0)
+    result = [[int(x) for x in row[:integers]] + row[integers:]
+              for row in getattr(colors, dst.lower()).tolist()]
+    if output == 'jsonl':
+        return [json.dumps(row) for row in result]
+    return [','.join([repr(x) for x in row]) for row in result]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma ColorArray Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks that bulk conversions agree with the scalar Color API.
+
+"""
+
+import unittest
+import random
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class ColorArrayTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1234)
+        self.hexes = ['#%02X%02X%02X' % (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+                      for _ in range(200)]
+        self.hexes += ['#000000', '#FFFFFF', '#808080', '#FF0000', '#00FF00', '#0000FF']
+        self.colors = [chroma.Color(h) for h in self.hexes]
+        self.array = chroma.ColorArray(self.hexes)
+
+    def assertRowsAlmostEqual(self, rows, tuples):
+        self.assertEqual(len(rows), len(tuples))
+        for row, t in zip(rows, tuples):
+            self.assertEqual(len(row), len(t))
+            for x, y in zip(row, t):
+                self.assertEqual(round(x - y, 7), 0)
+
+    def test_getters_match_color(self):
+        """Test every property against the scalar Color path"""
+        self.assertEqual(self.array.hex, [c.hex for c in self.colors])
+        self.assertEqual(self.array.rgb256.tolist(), [list(c.rgb256) for c in self.colors])
+        for name in ('rgb', 'hls', 'hsv', 'cmy', 'cmyk'):
+            self.assertRowsAlmostEqual(getattr(self.array, name),
+                                       [getattr(c, name) for c in self.colors])
+
+    def test_rounding_matches_color(self):
+        """Test halfway values round as Color rounds them (round() of this Python)"""
+        values = [(0.3, 0.5, 0.1), (0.5 / 255, 1.5 / 255, 2.5 / 255), (0.125 / 360, 0.5, 0.5)]
+        array = chroma.ColorArray(values, 'RGB')
+        colors = [chroma.Color(v, 'RGB') for v in values]
+        self.assertEqual(array.hex, [c.hex for c in colors])
+        self.assertEqual(array.hex[0], '#%02X801A' % (int(round(0.3 * 255))))
+        self.assertEqual(array.rgb256.tolist(), [list(c.rgb256) for c in colors])
+        self.assertEqual(array.hls[:, 0].tolist(), [c.hls[0] for c in colors])
+        self.assertEqual(array.hsv[:, 0].tolist(), [c.hsv[0] for c in colors])
+        expected = (0, 2, 2) if isinstance(round(0.5), int) else (1, 2, 3)
+        self.assertEqual(chroma.Color((0.5 / 255, 1.5 / 255, 2.5 / 255), 'RGB').rgb256, expected)
+        self.assertEqual(array.rgb256[1].tolist(), list(expected))
+
+    def test_cie_match_color(self):
+        """Test CIE XYZ / Lab for 8-bit (table) and other float input"""
+        self.assertRowsAlmostEqual(self.array.xyz, [c.xyz for c in self.colors])
+        self.assertRowsAlmostEqual(self.array.lab, [c.lab for c in self.colors])
+
+        values = [(0.1234, 0.5, 0.999), (0.01, 0.02, 0.03)]
+        array = chroma.ColorArray(values, 'RGB')
+        self.assertRowsAlmostEqual(array.lab, [chroma.Color(v, 'RGB').lab for v in values])
+
+        self.assertEqual(chroma.ColorArray(self.array.lab, 'LAB').hex, self.hexes)
+        self.assertEqual(chroma.ColorArray(self.array.xyz, 'XYZ').hex, self.hexes)
+
+    def test_setters_match_color(self):
+        """Test construction from every format, including out of bound input"""
+        values = [(400, -3, 10), (-10, 0.4, 0.2), (210, 0.3333, 0.40), (0, 0, 0)]
+        for format in ('HLS', 'HSV'):
+            self.assertEqual(chroma.ColorArray(values, format).hex,
+                             [chroma.Color(v, format).hex for v in values])
+
+        values = [(10, -3, 0.5, 3), (0.57, 0.29, 0, 0.53), (0, 0, 0, 1)]
+        self.assertEqual(chroma.ColorArray(values, 'CMYK').hex,
+                         [chroma.Color(v, 'CMYK').hex for v in values])
+        self.assertEqual(chroma.ColorArray([(300, -3, 50)], 'RGB256').hex,
+                         [chroma.Color((300, -3, 50), 'RGB256').hex])
+
+        self.assertRaises(ValueError, chroma.ColorArray, ['#FFF'])
+        self.assertRaises(ValueError, chroma.ColorArray, ['#GG0000'])
+        self.assertRaises(ValueError, chroma.ColorArray, [(0, 0, 0)], 'ERROR')
+
+    def test_alpha(self):
+        """Test alpha column support"""
+        array = chroma.ColorArray(['#33557780', '#446688FF'])
+        self.assertEqual(array.hex, ['#33557780', '#446688FF'])
+        self.assertEqual(array.hls.shape, (2, 4))
+        self.assertEqual(array.cmyk.shape, (2, 4))
+
+        array.alpha = None
+        self.assertEqual(array.hex, ['#335577', '#446688'])
+        self.assertEqual(array[0], chroma.Color('#335577'))
+
+    def test_container(self):
+        """Test indexing and round trips through Color objects"""
+        self.assertEqual(len(self.array), len(self.colors))
+        self.assertEqual(self.array[3], self.colors[3])
+        self.assertEqual(self.array[2:5].hex, self.hexes[2:5])
+        self.assertEqual(chroma.ColorArray.from_colors(self.colors).hex, self.hexes)
+        self.assertEqual(self.array.to_colors(), self.colors)
+
+    def test_color_set(self):
+        """Test ColorSet counts a ColorArray like the equivalent Colors"""
+        hexes = self.hexes + self.hexes[:10] + ['#33557780', '#33557780']
+        from_array = chroma.ColorSet(chroma.ColorArray(hexes[:-2]))
+        from_array.update(chroma.ColorArray(hexes[-2:]))
+        from_colors = chroma.ColorSet(chroma.Color(h) for h in hexes)
+
+        self.assertEqual(len(from_array), len(from_colors))
+        self.assertEqual(sorted((c.hex, n) for c, n in from_array.most_common()),
+                         sorted((c.hex, n) for c, n in from_colors.most_common()))
+
+    def test_mixing(self):
+        """Test row by row and whole array mixing against Color"""
+        other = self.colors[::-1]
+        reverse = chroma.ColorArray.from_colors(other)
+        self.assertEqual((self.array + reverse).to_colors(), [a + b for a, b in zip(self.colors, other)])
+        self.assertEqual((self.array - reverse).to_colors(), [a - b for a, b in zip(self.colors, other)])
+
+        red = chroma.Color('#FF0000')
+        self.assertEqual((self.array + red).to_colors(), [c + red for c in self.colors])
+        self.assertEqual((red - self.array).to_colors(), [red - c for c in self.colors])
+
+        dark = chroma.ColorArray(['#010203', '#203040', '#000000'])
+        self.assertEqual(chroma.mix_many(dark), chroma.mix_many(dark.to_colors()))
+        self.assertEqual(chroma.mix_many(dark, 'subtractive'), chroma.mix_many(dark.to_colors(), 'subtractive'))
+
+    def test_hex_buffer(self):
+        """Test bulk parsing of a newline separated buffer"""
+        lines = [h.lower() if i % 3 else h[1:] for i, h in enumerate(self.hexes)]
+        array, invalid = chroma.ColorArray.from_hex_buffer(('\r\n'.join(lines) + '\n').encode('ascii'))
+        self.assertFalse(invalid.any())
+        self.assertEqual(array.hex, self.hexes)
+        self.assertEqual(array.alpha, None)
+
+        lines = ['#FF000080', 'oops', '', '#12345', '#00FF00', '#0000FG', '#FFFFFF00']
+        array, invalid = chroma.ColorArray.from_hex_buffer(bytearray('\n'.join(lines).encode('ascii')))
+        self.assertEqual(invalid.tolist(), [False, True, True, True, False, True, False])
+        self.assertEqual(array[~invalid].to_colors(), [chroma.Color(h) for h in ['#FF000080', '#00FF00FF', '#FFFFFF00']])
+
+        array, invalid = chroma.ColorArray.from_hex_buffer(b'')
+        self.assertEqual((len(array), len(invalid)), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
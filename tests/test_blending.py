@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Blending Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks compositing and blend modes against the formulas in linear light.
+
+"""
+
+import unittest
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+from chroma import blending
+
+import numpy as np
+
+def to_linear(c):
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+def to_srgb(c):
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * c ** (1 / 2.4) - 0.055)
+
+class BlendingTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.top = chroma.ColorArray(rng.rand(300, 4), 'RGB')
+        self.bottom = chroma.ColorArray(rng.rand(300, 3), 'RGB')
+
+    def test_over(self):
+        """Test source over against the formula"""
+        a = self.top.alpha[:, np.newaxis]
+        expected = to_srgb(to_linear(self.top.color) * a + to_linear(self.bottom.color) * (1 - a))
+        result = blending.over(self.top, self.bottom)
+        self.assertTrue(np.abs(result.color - expected).max() < 1e-4)
+        self.assertTrue(np.allclose(result.alpha, 1))
+
+        # Half transparent red over blue mixes in linear light
+        self.assertEqual(blending.over(chroma.Color('#FF000080'), chroma.Color('#0000FF')).hex, '#BC00BBFF')
+        self.assertEqual(blending.over(chroma.Color('#FF0000'), chroma.Color('#0000FF')).hex, '#FF0000')
+        self.assertEqual(blending.over(chroma.Color('#FF000000'), chroma.Color('#00000000')).hex, '#00000000')
+
+    def test_modes(self):
+        """Test multiply, screen and overlay with an opaque backdrop"""
+        top = chroma.ColorArray(self.top.color, 'RGB')
+        source, backdrop = to_linear(top.color), to_linear(self.bottom.color)
+        expected = {
+            'multiply': backdrop * source,
+            'screen': backdrop + source - backdrop * source,
+            'overlay': np.where(backdrop <= 0.5, 2 * backdrop * source,
+                                1 - 2 * (1 - backdrop) * (1 - source)),
+        }
+        for mode, linear in expected.items():
+            result = chroma.blend(top, self.bottom, mode)
+            self.assertTrue(np.abs(result.color - to_srgb(linear)).max() < 1e-4)
+            self.assertEqual(result.alpha, None)
+
+        white = chroma.Color('#FFFFFF')
+        self.assertEqual(blending.multiply(top, white).hex, top.hex)
+        self.assertRaises(ValueError, chroma.blend, top, white, 'dodge')
+
+    def test_pixels(self):
+        """Test pixel buffers blend like the equivalent ColorArrays"""
+        rgba = chroma.PixelBuffer(bytes(bytearray([255, 0, 0, 128, 10, 200, 30, 255])), channels=4)
+        rgb = chroma.PixelBuffer(bytes(bytearray([0, 0, 255, 90, 90, 90])))
+        for mode in blending.MODES:
+            self.assertEqual(chroma.blend(rgba, rgb, mode).hex,
+                             chroma.blend(rgba.to_array(), rgb.to_array(), mode).hex)
+        self.assertEqual(chroma.blend(rgba, rgb)[0].hex, '#BC00BBFF')
+
+
+if __name__ == '__main__':
+    unittest.main()
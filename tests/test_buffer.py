@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma PixelBuffer Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks zero-copy pixel buffers against the scalar Color API.
+
+"""
+
+import unittest
+import tempfile
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class PixelBufferTestSuite(unittest.TestCase):
+    def setUp(self):
+        self.rgb = bytearray([0x33, 0x55, 0x77, 0x44, 0x66, 0x88, 0xFF, 0x00, 0x00])
+        self.colors = [chroma.Color('#335577'), chroma.Color('#446688'), chroma.Color('#FF0000')]
+
+    def test_zero_copy(self):
+        """Test the buffer is shared, not copied"""
+        pixels = chroma.PixelBuffer(self.rgb)
+        self.assertEqual(len(pixels), 3)
+        self.rgb[0] = 0x00
+        self.assertEqual(pixels[0], chroma.Color('#005577'))
+        self.assertEqual(pixels[1:].hex, ['#446688', '#FF0000'])
+
+        self.assertEqual(len(chroma.PixelBuffer(memoryview(bytes(self.rgb)))), 3)
+        self.assertRaises(ValueError, chroma.PixelBuffer, bytes(self.rgb[:4]))
+        self.assertRaises(ValueError, chroma.PixelBuffer, bytes(self.rgb), 2)
+
+    def test_conversions(self):
+        """Test whole buffer conversions, in chunks and with alpha"""
+        pixels = chroma.PixelBuffer(bytes(self.rgb))
+        self.assertEqual(pixels.hex, [c.hex for c in self.colors])
+        for name in ('hls', 'hsv', 'cmyk'):
+            for row, color in zip(getattr(pixels, name), self.colors):
+                for x, y in zip(row, getattr(color, name)):
+                    self.assertAlmostEqual(x, y)
+        self.assertEqual([a.hex for a in pixels.chunks(2)], [['#335577', '#446688'], ['#FF0000']])
+
+        rgba = chroma.PixelBuffer(bytes(bytearray([0x33, 0x55, 0x77, 0x80])), channels=4)
+        self.assertEqual(rgba.hex, ['#33557780'])
+        self.assertEqual(rgba[0].hex, '#33557780')
+        self.assertEqual(rgba.to_array().hex, ['#33557780'])
+
+    def test_open(self):
+        """Test memory mapping a raw pixel file"""
+        handle, path = tempfile.mkstemp()
+        try:
+            os.write(handle, bytes(self.rgb))
+            os.close(handle)
+            with chroma.PixelBuffer.open(path) as pixels:
+                self.assertEqual(pixels.hex, [c.hex for c in self.colors])
+
+            # A live slice keeps the mapping open (Python 2 cannot tell)
+            if sys.version_info[0] >= 3:
+                pixels = chroma.PixelBuffer.open(path)
+                part = pixels[1:]
+                self.assertRaises(BufferError, pixels.close)
+                self.assertEqual(pixels.hex, [c.hex for c in self.colors])
+                self.assertEqual(part.hex, [c.hex for c in self.colors[1:]])
+                del part
+                pixels.close()
+                self.assertEqual(len(pixels), 0)
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
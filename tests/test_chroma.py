@@ -11,6 +11,8 @@ A series of unittests to check the basic functionality of the Chroma API.
 
 import unittest
 import argparse
+import copy
+import pickle
 
 # Path hack. (for importing)
 import sys
@@ -44,6 +46,26 @@ class ChromaTestSuite(unittest.TestCase):
         # Test ValueError too
         self.assertRaises(ValueError, chroma.Color, (0, 0, 0), 'ERROR')
 
+    def test_fast_constructors(self):
+        """Test classmethod constructors against the format constructor"""
+        for value in [(0.2, 0.3333, 0.4667), (10, -3, 0.5), (10, -1, 0.5, -10), (0.2, 0.4, 0.6, 0.5)]:
+            self.assertEqual(chroma.Color.from_rgb(value).rgb, chroma.Color(value, 'RGB').rgb)
+        for value in [(51, 85, 119), (300, -3, 50), (51, 85, 119, 127.5)]:
+            self.assertEqual(chroma.Color.from_rgb256(value).rgb, chroma.Color(value, 'RGB256').rgb)
+        for value in ['#335577', '33557780']:
+            self.assertEqual(chroma.Color.from_hex(value).rgb, chroma.Color(value).rgb)
+
+        self.assertEqual(chroma.Color.from_int(0x335577).rgb, self.c1.rgb)
+        self.assertEqual(chroma.Color.from_int(0x33557780, alpha=True).hex, '#33557780')
+        self.assertEqual(chroma.Color.from_rgb_unchecked(self.c1.rgb).hex, self.c1.hex)
+
+        self.assertRaises(ValueError, chroma.Color.from_hex, '#GG0000')
+        self.assertRaises(ValueError, chroma.Color.from_int, 0x1000000)
+        self.assertRaises(ValueError, chroma.Color.from_int, -1, True)
+
+        # The RGB256 setter scales alpha by 255 too
+        self.assertEqual(chroma.Color((51, 85, 119, 127.5), 'RGB256').rgb256, (51, 85, 119, 0.5))
+
     def test_comparison_methods(self):
         """Test equality and inequality"""
 
@@ -55,6 +77,37 @@ class ChromaTestSuite(unittest.TestCase):
         self.assertTrue(self.c1 != self.c2)
         self.assertFalse(self.c1 != chroma.Color('#335577'))
 
+        # Tolerance
+        near = chroma.Color('#345577')
+        self.assertFalse(self.c1 == near)
+        self.assertAlmostEqual(self.c1.distance(near), 1 / 255.0)
+        self.assertTrue(self.c1.is_close(near, 1 / 255.0))
+        self.assertFalse(self.c1.is_close(near, 0.5 / 255.0))
+        self.assertTrue(self.c1.is_close(near, 1, 'lab'))
+        self.assertAlmostEqual(chroma.Color('#000000').distance(chroma.Color('#FFFFFF'), 'LAB'), 100, 3)
+        self.assertRaises(ValueError, self.c1.distance, near, 'HSV')
+
+    def test_hashing(self):
+        """Test colors as set members / dict keys, and ColorSet counting"""
+        self.assertEqual(hash(self.c1), hash(chroma.Color((51, 85, 119), 'RGB256')))
+        self.assertEqual(len(set([self.c1, self.c2, chroma.Color('#335577')])), 2)
+        self.assertFalse(self.c1 == '#335577')
+        self.assertTrue(self.c1 != '#335577')
+
+        # Alpha is part of the identity, as with hex
+        opaque = chroma.Color('#335577FF')
+        self.assertNotEqual(self.c1, opaque)
+        self.assertNotEqual(hash(self.c1), hash(opaque))
+
+        colors = chroma.ColorSet([self.c1, self.c2, chroma.Color('#335577'), opaque])
+        self.assertEqual(len(colors), 3)
+        self.assertEqual(colors.total(), 4)
+        self.assertEqual(colors.count(self.c1), 2)
+        self.assertTrue(opaque in colors)
+        self.assertFalse(self.c3 in colors)
+        self.assertEqual(colors.most_common(1), [(self.c1, 2)])
+        self.assertEqual(set(colors), set([self.c1, self.c2, opaque]))
+
     def test_system_conversion(self):
         """Test conversion between systems"""
 
@@ -75,6 +128,20 @@ class ChromaTestSuite(unittest.TestCase):
         self.assertTupleAlmostEqual(chroma.Color((0.8, 0.67, 0.53), 'CMY').cmy, self.c1.cmy)
         self.assertTupleAlmostEqual(chroma.Color((0.57, 0.29, 0, 0.53), 'CMYK').cmyk, self.c1.cmyk)
 
+    def test_cie_systems(self):
+        """Test CIE XYZ and Lab against reference values"""
+        self.assertTupleAlmostEqual(chroma.Color('#FFFFFF').xyz, (0.9505, 1.0, 1.0888))
+        self.assertTupleAlmostEqual(chroma.Color('#FF0000').lab, (53.24, 80.09, 67.20))
+        self.assertTupleAlmostEqual(self.c1.lab, (35.07, -1.52, -23.08))
+
+        # Round trips, and formats for the constructor
+        for color in (self.c1, self.c2, self.c3, chroma.Color('#000000')):
+            self.assertEqual(chroma.Color(color.xyz, 'XYZ'), color)
+            self.assertEqual(chroma.Color(color.lab, 'LAB'), color)
+
+        # Out of gamut is clipped
+        self.assertEqual(chroma.Color((150, 0, 0), 'LAB').hex, '#FFFFFF')
+
     def test_bad_input(self):
         """Test input that goes beyond color system bounds"""
         # Upper bound
@@ -138,6 +205,124 @@ class ChromaTestSuite(unittest.TestCase):
         self.assertEqual(chroma.Color("#FFFF00"), chroma.Color("#FFFFFF") - chroma.Color("#FFFF00"))
         self.assertEqual(chroma.Color("#00FF00"), chroma.Color("#FFFF00") - chroma.Color("#00FFFF"))
 
+    def test_mix_many(self):
+        """Test mixing many colors matches chained mixing"""
+        colors = [self.c1, self.c2, self.c3, chroma.Color('#102030')]
+        added = colors[0] + colors[1] + colors[2] + colors[3]
+        self.assertEqual(chroma.mix_many(colors).rgb, added.rgb)
+        subtracted = colors[0] - colors[1] - colors[2] - colors[3]
+        self.assertEqual(chroma.mix_many(colors, 'subtractive'), subtracted)
+        self.assertEqual(chroma.mix_many([chroma.Color('#10203080'), chroma.Color('#10203090')]).hex,
+                         '#204060FF')
+        self.assertEqual(chroma.mix_many([chroma.Color('#10203080'), chroma.Color('#102030')]).alpha, None)
+        self.assertRaises(ValueError, chroma.mix_many, [])
+        self.assertRaises(ValueError, chroma.mix_many, colors, 'average')
+
+    def test_compact_storage(self):
+        """Test Color keeps no per-instance dict and still pickles"""
+        self.assertFalse(hasattr(self.c1, '__dict__'))
+        self.assertRaises(AttributeError, setattr, self.c1, 'spam', 1)
+
+        self.c1.alpha = 0.5
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(self.c1, protocol))
+            self.assertEqual(restored.rgb, self.c1.rgb)
+            self.assertEqual(restored.hex, '#33557780')
+
+        # 8-bit colors pickle as their packed hex value
+        for color in (chroma.Color('#335577'), chroma.Color('#33557780'), chroma.Color((0.1, 0.2, 0.3), 'RGB')):
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                restored = pickle.loads(pickle.dumps(color, protocol))
+                self.assertEqual(restored.rgb, color.rgb)
+        self.assertTrue(len(pickle.dumps(chroma.Color('#335577'), 2)) < 50)
+
+    def test_subclass_pickles(self):
+        """Test pickling and copying keep a subclass and its attributes"""
+        for value in ('#335577', '#33557780', (0.1, 0.2, 0.3)):
+            color = LabelledColor(value, 'RGB' if isinstance(value, tuple) else 'HEX')
+            color.label = 'ink'
+            copies = [copy.copy(color), copy.deepcopy(color)]
+            copies += [pickle.loads(pickle.dumps(color, protocol)) for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]
+            for restored in copies:
+                self.assertTrue(type(restored) is LabelledColor)
+                self.assertEqual((restored.rgb, restored.label), (color.rgb, 'ink'))
+
+        restored = pickle.loads(pickle.dumps(LabelledColor('#335577'), 2))
+        self.assertTrue(type(restored) is LabelledColor)
+        self.assertFalse(hasattr(restored, 'label'))
+
+    def test_old_pickles(self):
+        """Test loading Colors pickled by 0.2.0 on Python 2.7"""
+        pickles = [
+            # Protocol 0, Color('#336699') and Color('#33669980')
+            (b"ccopy_reg\n_reconstructor\np0\n(cchroma.core\nColor\np1\nc__builtin__\nobject\np2\n"
+             b"Ntp3\nRp4\n(dp5\nS'color'\np6\n(F0.2\nF0.4\nF0.6\ntp7\nsS'_alpha'\np8\nNsb."),
+            (b"ccopy_reg\n_reconstructor\np0\n(cchroma.core\nColor\np1\nc__builtin__\nobject\np2\n"
+             b"Ntp3\nRp4\n(dp5\nS'color'\np6\n(F0.2\nF0.4\nF0.6\ntp7\nsS'_alpha'\np8\n"
+             b"F0.5019607843137255\nsb."),
+            # Protocol 2, the same colors
+            (b"\x80\x02cchroma.core\nColor\nq\x00)\x81q\x01}q\x02(U\x05colorq\x03"
+             b"G?\xc9\x99\x99\x99\x99\x99\x9aG?\xd9\x99\x99\x99\x99\x99\x9aG?\xe3333333"
+             b"\x87q\x04U\x06_alphaq\x05Nub."),
+            (b"\x80\x02cchroma.core\nColor\nq\x00)\x81q\x01}q\x02(U\x05colorq\x03"
+             b"G?\xc9\x99\x99\x99\x99\x99\x9aG?\xd9\x99\x99\x99\x99\x99\x9aG?\xe3333333"
+             b"\x87q\x04U\x06_alphaq\x05G?\xe0\x10\x10\x10\x10\x10\x10ub."),
+        ]
+        for data, expected in zip(pickles, ['#336699', '#33669980'] * 2):
+            color = pickle.loads(data)
+            self.assertEqual(color.hex, expected)
+            self.assertEqual(color, chroma.Color(expected))
+            self.assertEqual(pickle.loads(pickle.dumps(color, 2)), color)
+
+    def test_cache(self):
+        """Test the opt-in cache of derived representations"""
+        chroma.Color.reset_cache_info()
+        self.c1.hls
+        self.assertEqual(chroma.Color.cache_info(), {'hits': 0, 'misses': 0})
+
+        self.c1.enable_cache()
+        hls = self.c1.hls
+        self.assertTrue(self.c1.hls is hls)
+        self.assertEqual(chroma.Color.cache_info(), {'hits': 1, 'misses': 1})
+
+        # Every setter invalidates
+        derived = ('hex', 'hls', 'hsv', 'cmy', 'cmyk', 'rgb256')
+        setters = ('rgb', 'hex', 'hls', 'hsv', 'cmy', 'cmyk', 'rgb256')
+        for i, name in enumerate(setters):
+            source = (self.c2, self.c3)[i % 2]
+            uncached = chroma.Color()
+            setattr(uncached, name, getattr(source, name))
+
+            [getattr(self.c1, n) for n in derived]
+            setattr(self.c1, name, getattr(source, name))
+            self.assertEqual([getattr(self.c1, n) for n in derived],
+                             [getattr(uncached, n) for n in derived])
+
+        self.c1.alpha = 0.5
+        self.assertEqual(self.c1.hex, '#44668880')
+        self.assertEqual(len(self.c1.hls), 4)
+
+        self.c1.disable_cache()
+        self.assertEqual(self.c1.hex, '#44668880')
+
+    def test_hex_many(self):
+        """Test bulk hex parsing and formatting against Color"""
+        hexes = ['#335577', '#446688', '#55555580', 'aabbcc']
+        rgbs = [chroma.Color(h).rgb for h in hexes]
+
+        self.assertEqual(chroma.parse_hex_many(hexes), rgbs)
+        self.assertEqual(chroma.parse_hex_many(b'\n'.join(h.encode('ascii') for h in hexes)), rgbs)
+        self.assertEqual(chroma.format_hex_many(rgbs), [chroma.Color(h).hex for h in hexes])
+        self.assertEqual(chroma.format_hex_many([(2, -1, 0.5, None)]), ['#FF0080'])
+
+        self.assertRaises(ValueError, chroma.parse_hex_many, ['#335577', '#3355'])
+        self.assertRaises(ValueError, chroma.parse_hex_many, b'#335577\n#33557G')
+        self.assertRaises(ValueError, chroma.Color, '')
+
+
+class LabelledColor(chroma.Color):
+    """Color subclass with instance attributes, for pickling tests"""
+
 
 if __name__ == '__main__':
     unittest.main()
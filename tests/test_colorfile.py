@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma ColorFile Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks binary color files round trip and index lookups.
+
+"""
+
+import unittest
+import tempfile
+import random
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class ColorFileTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.hexes = ['#%06X' % rng.randint(0, 0xFFFFFF) for _ in range(300)]
+        self.colors = chroma.ColorArray(self.hexes)
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        """Test both encodings read back the written colors"""
+        for encoding in chroma.colorfile.ENCODINGS:
+            chroma.ColorFile.write(self.path, self.colors, encoding)
+            with chroma.ColorFile.open(self.path) as colors:
+                self.assertEqual(len(colors), 300)
+                self.assertEqual(colors.encoding, encoding)
+                self.assertEqual(colors[7], chroma.Color(self.hexes[7]))
+                self.assertEqual(colors[10:20].hex, self.hexes[10:20])
+                self.assertEqual(colors.to_array().hex, self.hexes)
+
+        colors = [chroma.Color('#33557780'), chroma.Color('#446688FF')]
+        chroma.ColorFile.write(self.path, colors)
+        with chroma.ColorFile.open(self.path) as restored:
+            self.assertEqual(list(restored), colors)
+
+    def test_lookup(self):
+        """Test lookups with and without the index"""
+        hexes = self.hexes + self.hexes[:5]
+        for index in (True, False):
+            chroma.ColorFile.write(self.path, chroma.ColorArray(hexes), index=index)
+            with chroma.ColorFile.open(self.path) as colors:
+                self.assertEqual(colors.index(chroma.Color(hexes[3])), 3)
+                self.assertEqual(colors.find(chroma.Color(hexes[250])), hexes.index(hexes[250]))
+                self.assertFalse(chroma.Color('#33557780') in colors)
+                missing = [h for h in ('#000001', '#000002', '#000003') if h not in hexes][0]
+                self.assertRaises(ValueError, colors.index, chroma.Color(missing))
+
+    def test_bad_file(self):
+        """Test files that are not color files are rejected"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a color file, but long enough for a header')
+        self.assertRaises(ValueError, chroma.ColorFile.open, self.path)
+        self.assertRaises(ValueError, chroma.ColorFile.write, self.path, self.colors, 'rgb16')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Contrast Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks WCAG contrast ratios, and batch ratios against Color.contrast.
+
+"""
+
+import unittest
+import random
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class ContrastTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(20)
+        self.fg = [chroma.Color('#%06X' % rng.randint(0, 0xFFFFFF)) for _ in range(60)]
+        self.bg = [chroma.Color('#%06X' % rng.randint(0, 0xFFFFFF)) for _ in range(80)]
+
+    def test_color_contrast(self):
+        """Test Color luminance and contrast ratios"""
+        black, white = chroma.Color('#000000'), chroma.Color('#FFFFFF')
+        self.assertEqual(black.luminance, 0.0)
+        self.assertAlmostEqual(white.luminance, 1.0)
+        self.assertAlmostEqual(black.contrast(white), 21.0)
+        self.assertAlmostEqual(white.contrast(black), 21.0)
+        self.assertEqual(white.contrast(white), 1.0)
+        # #767676 is the lightest gray passing AA on white
+        self.assertTrue(chroma.Color('#767676').contrast(white) >= 4.5)
+        self.assertTrue(chroma.Color('#777777').contrast(white) < 4.5)
+
+    def test_matrix(self):
+        """Test contrast_matrix against Color.contrast"""
+        matrix = chroma.contrast_matrix(chroma.ColorArray.from_colors(self.fg), self.bg)
+        self.assertEqual(matrix.shape, (60, 80))
+        for i, fg in enumerate(self.fg):
+            for j, bg in enumerate(self.bg):
+                self.assertAlmostEqual(matrix[i, j], fg.contrast(bg))
+
+        single = chroma.contrast_matrix(self.fg[0], self.bg)
+        self.assertEqual(single.shape, (1, 80))
+
+    def test_pairs(self):
+        """Test contrast_pairs against every pair, by level or ratio"""
+        colors = chroma.ColorArray.from_colors(self.bg)
+        for level, threshold in [('AA', 4.5), ('aaa', 7.0), (3.0, 3.0), (1.0, 1.0)]:
+            fg_idx, bg_idx, ratios = chroma.contrast_pairs(self.fg, colors, level)
+            expected = [(i, j) for i, fg in enumerate(self.fg) for j, bg in enumerate(self.bg)
+                        if fg.contrast(bg) >= threshold]
+            self.assertEqual(list(zip(fg_idx.tolist(), bg_idx.tolist())), expected)
+            for i, j, ratio in zip(fg_idx, bg_idx, ratios):
+                self.assertAlmostEqual(ratio, self.fg[i].contrast(self.bg[j]))
+
+        self.assertRaises(ValueError, chroma.contrast_pairs, self.fg, self.bg, 'A')
+
+
+if __name__ == '__main__':
+    unittest.main()
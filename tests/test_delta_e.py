@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Delta-E Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks color differences against published reference data.
+
+"""
+
+import unittest
+
+import numpy as np
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+# Sharma, Wu, Dalal (2005) CIEDE2000 test data: Lab 1, Lab 2, Delta-E 2000
+SHARMA = [
+    ((50.0000, 2.6772, -79.7751), (50.0000, 0.0000, -82.7485), 2.0425),
+    ((50.0000, 3.1571, -77.2803), (50.0000, 0.0000, -82.7485), 2.8615),
+    ((50.0000, 0.0000, 0.0000), (50.0000, -1.0000, 2.0000), 2.3669),
+    ((50.0000, 2.4900, -0.0010), (50.0000, -2.4900, 0.0009), 7.1792),
+    ((50.0000, 2.5000, 0.0000), (73.0000, 25.0000, -18.0000), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+]
+
+class DeltaETestSuite(unittest.TestCase):
+    def test_ciede2000(self):
+        """Test CIEDE2000 on reference pairs, one at a time and as arrays"""
+        for lab1, lab2, expected in SHARMA:
+            self.assertAlmostEqual(chroma.delta_e_ciede2000(lab1, lab2), expected, 4)
+            self.assertAlmostEqual(chroma.delta_e_ciede2000(lab2, lab1), expected, 4)
+
+        labs1 = np.array([pair[0] for pair in SHARMA])
+        labs2 = np.array([pair[1] for pair in SHARMA])
+        result = chroma.delta_e_ciede2000(labs1, labs2)
+        self.assertTrue(np.allclose(result, [pair[2] for pair in SHARMA], atol=1e-4))
+
+    def test_cie76_cie94(self):
+        """Test the simpler formulas and Color / ColorArray input"""
+        self.assertAlmostEqual(chroma.delta_e_cie76((50, 0, 0), (53, 4, 0)), 5.0)
+        # Pure lightness difference: only S_L (graphic arts 1, textiles 2)
+        self.assertAlmostEqual(chroma.delta_e_cie94((50, 10, 10), (54, 10, 10)), 4.0)
+        self.assertAlmostEqual(chroma.delta_e_cie94((50, 10, 10), (54, 10, 10), textiles=True), 2.0)
+
+        red, c1 = chroma.Color('#FF0000'), chroma.Color('#335577')
+        self.assertAlmostEqual(chroma.delta_e_cie76(red, red), 0.0)
+        array = chroma.ColorArray(['#FF0000', '#335577'])
+        result = chroma.delta_e_ciede2000(array, c1)
+        self.assertEqual(result.shape, (2,))
+        self.assertAlmostEqual(result[0], chroma.delta_e_ciede2000(red, c1))
+        self.assertAlmostEqual(result[1], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
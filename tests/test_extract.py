@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Palette Extraction Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks median cut and k-means on images with known colors.
+
+"""
+
+import unittest
+
+import numpy as np
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class ExtractTestSuite(unittest.TestCase):
+    def setUp(self):
+        # 40% red, 30% teal, 20% white, 10% near black
+        self.expected = [('#C81E1E', 0.4), ('#1E9696', 0.3), ('#F0F0F0', 0.2), ('#0A0A0A', 0.1)]
+        rows = np.repeat([[200, 30, 30], [30, 150, 150], [240, 240, 240], [10, 10, 10]], [4, 3, 2, 1], axis=0)
+        self.pixels = chroma.PixelBuffer(np.tile(rows, (1000, 1)).astype(np.uint8).tobytes())
+
+    def assertPalette(self, palette, expected):
+        self.assertEqual([color.hex for color, _ in palette], [h for h, _ in expected])
+        for (_, share), (_, expected_share) in zip(palette, expected):
+            self.assertAlmostEqual(share, expected_share)
+
+    def test_exact_colors(self):
+        """Test every method and space recovers a few exact colors"""
+        for method in ('median_cut', 'kmeans'):
+            for space in ('RGB', 'HSV', 'HLS', 'LAB'):
+                self.assertPalette(chroma.extract_palette(self.pixels, 4, method, space), self.expected)
+
+        # Fewer colors than asked for, and other inputs
+        self.assertPalette(chroma.extract_palette(self.pixels, 8, 'median_cut'), self.expected)
+        colors = self.pixels[:10].to_array()
+        self.assertPalette(chroma.extract_palette(colors, 4), self.expected)
+        self.assertPalette(chroma.extract_palette(colors.to_colors(), 4), self.expected)
+
+    def test_clusters(self):
+        """Test sampled extraction of noisy clusters"""
+        # Noisy clusters, in a random order
+        rng = np.random.RandomState(5)
+        centers = np.array([[200, 30, 30], [30, 200, 30], [30, 30, 200]])
+        labels = rng.choice(3, 30000, p=[0.5, 0.3, 0.2])
+        pixels = np.clip(centers[labels] + rng.normal(0, 6, (30000, 3)), 0, 255).astype(np.uint8)
+
+        for method in ('median_cut', 'kmeans'):
+            palette = chroma.extract_palette(pixels, 3, method, 'LAB', sample=10000, seed=1)
+            self.assertEqual(palette, chroma.extract_palette(pixels, 3, method, 'LAB', sample=10000, seed=1))
+            self.assertAlmostEqual(sum(share for _, share in palette), 1.0)
+            if method == 'kmeans':
+                for (color, share), center, expected in zip(palette, centers, [0.5, 0.3, 0.2]):
+                    self.assertTrue(np.abs(np.array(color.rgb256) - center).max() <= 3)
+                    self.assertTrue(abs(share - expected) < 0.02)
+
+        self.assertRaises(ValueError, chroma.extract_palette, pixels, 3, 'octree')
+        self.assertRaises(ValueError, chroma.extract_palette, pixels, 3, 'kmeans', 'CMYK')
+
+
+if __name__ == '__main__':
+    unittest.main()
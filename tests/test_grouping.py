@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Grouping Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks dedupe and cluster against pairwise comparison of Colors.
+
+"""
+
+import unittest
+import random
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class GroupingTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.colors = [chroma.Color('#%06X' % rng.randint(0, 0xFFFFFF)) for _ in range(300)]
+        self.colors += self.colors[:40]
+        self.array = chroma.ColorArray.from_colors(self.colors)
+
+    def test_dedupe(self):
+        """Test dedupe against a greedy pairwise scan"""
+        for metric, tolerance in [('RGB', 0.08), ('LAB', 8)]:
+            kept = []
+            for i, color in enumerate(self.colors):
+                if not any(self.colors[k].is_close(color, tolerance, metric) for k in kept):
+                    kept.append(i)
+            self.assertEqual(chroma.dedupe(self.array, tolerance, metric).tolist(), kept)
+
+        # Exact duplicates only
+        self.assertEqual(chroma.dedupe(self.colors, 0).tolist(), list(range(300)))
+        self.assertEqual(len(chroma.dedupe([], 0.1)), 0)
+        self.assertRaises(ValueError, chroma.dedupe, self.colors, -1)
+
+    def test_cluster(self):
+        """Test cluster against chaining every close pair"""
+        for metric, tolerance in [('RGB', 0.08), ('LAB', 8)]:
+            # Label of each color's cluster, by chaining close pairs
+            labels = list(range(len(self.colors)))
+            for i, first in enumerate(self.colors):
+                for j in range(i + 1, len(self.colors)):
+                    if first.is_close(self.colors[j], tolerance, metric) and labels[i] != labels[j]:
+                        old, new = max(labels[i], labels[j]), min(labels[i], labels[j])
+                        labels = [new if label == old else label for label in labels]
+            numbering = {}
+            expected = [numbering.setdefault(label, len(numbering)) for label in labels]
+            self.assertEqual(chroma.cluster(self.array, tolerance, metric).tolist(), expected)
+
+        # A gradient chains into one cluster, but dedupes to several colors
+        grays = chroma.ColorArray([(x, x, x) for x in range(256)], 'RGB256')
+        self.assertEqual(set(chroma.cluster(grays, 2 / 255.0).tolist()), set([0]))
+        # Grays one step apart are sqrt(3) / 255 apart, every other one is kept
+        self.assertEqual(len(chroma.dedupe(grays, 2 / 255.0)), 128)
+
+
+if __name__ == '__main__':
+    unittest.main()
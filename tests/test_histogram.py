@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma ColorHistogram Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks packed integer color counts against ColorSet.
+
+"""
+
+import unittest
+import pickle
+import random
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class ColorHistogramTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(99)
+        self.hexes = ['#%02X%02X%02X' % (rng.choice([0, 51, 102]), rng.choice([0, 255]), rng.randint(0, 3))
+                      for _ in range(500)]
+        self.colors = chroma.ColorArray(self.hexes)
+
+    def test_counts(self):
+        """Test dense and sparse counts match ColorSet"""
+        expected = sorted((c.hex, n) for c, n in chroma.ColorSet(self.colors).most_common())
+        for dense in (True, False):
+            histogram = chroma.ColorHistogram(dense=dense)
+            histogram.add(self.colors[:200])
+            histogram.add(self.colors[200:])
+            self.assertEqual(sorted((c.hex, n) for c, n in histogram.most_common()), expected)
+            self.assertEqual(histogram.total(), 500)
+            self.assertEqual(len(histogram), len(expected))
+
+        top = histogram.most_common(3)
+        self.assertEqual(len(top), 3)
+        self.assertEqual([n for c, n in top], sorted([n for c, n in expected], reverse=True)[:3])
+
+    def test_merge(self):
+        """Test histograms merge, also after pickling (as between processes)"""
+        first, second = chroma.ColorHistogram(), chroma.ColorHistogram()
+        first.add(self.colors[:250])
+        second.add(chroma.PixelBuffer(bytes(bytearray(self.colors[250:].rgb256.astype('uint8')))))
+        merged = first + pickle.loads(pickle.dumps(second))
+
+        whole = chroma.ColorHistogram()
+        whole.add(self.colors)
+        self.assertEqual(merged.most_common(), whole.most_common())
+        self.assertRaises(ValueError, merged.update, chroma.ColorHistogram(bits=5))
+
+    def test_quantize(self):
+        """Test buckets, alpha keys and conversion back to Colors"""
+        histogram = chroma.ColorHistogram(bits=5)
+        histogram.add([chroma.Color('#FF0000'), chroma.Color('#F90307'), chroma.Color('#000000')])
+        self.assertEqual(histogram.most_common(), [(chroma.Color('#FC0404'), 2), (chroma.Color('#040404'), 1)])
+
+        histogram = chroma.ColorHistogram(alpha=True)
+        histogram.add(chroma.ColorArray(['#33557780', '#335577', '#33557780']))
+        self.assertEqual(histogram.most_common(), [(chroma.Color('#33557780'), 2), (chroma.Color('#335577FF'), 1)])
+        self.assertRaises(ValueError, chroma.ColorHistogram, 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Instrumentation Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks operation counts, timings and that disabling restores Color.
+
+"""
+
+import unittest
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+from chroma import instrument
+
+class InstrumentTestSuite(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_counts(self):
+        """Test top level operations and hex failures are counted"""
+        with instrument.recording() as stats:
+            color = chroma.Color('#335577')
+            color.hls
+            color.hls
+            color.cmyk
+            color.hsv = (10, 0.5, 0.5)
+            color + color
+            chroma.mix_many([color, color])
+            self.assertRaises(ValueError, chroma.Color, '#33557')
+
+        self.assertEqual(stats['init.HEX']['calls'], 2)
+        self.assertEqual(stats['init.HEX']['errors'], 1)
+        self.assertEqual(stats['get.hls']['calls'], 2)
+        self.assertEqual(stats['set.hsv']['calls'], 1)
+        self.assertEqual(stats['additive_mix']['calls'], 1)
+        self.assertEqual(stats['mix_many']['calls'], 1)
+        self.assertEqual((stats['parse_hex']['calls'], stats['parse_hex']['errors']), (2, 1))
+        # Calls made by chroma itself are not counted
+        self.assertFalse('get.cmy' in stats)
+        self.assertFalse('set.rgb' in stats)
+        self.assertEqual(instrument.snapshot(), stats)
+
+    def test_timing(self):
+        """Test timings fill the histogram"""
+        instrument.enable(timing=True)
+        for _ in range(10):
+            chroma.Color.from_hex('#335577').cmyk
+        stats = instrument.snapshot()['get.cmyk']
+        self.assertEqual(stats['calls'], 10)
+        self.assertEqual(sum(stats['histogram'].values()), 10)
+        self.assertTrue(stats['seconds'] > 0)
+
+        instrument.reset()
+        self.assertEqual(instrument.snapshot(), {})
+
+    def test_disable(self):
+        """Test disabling puts the original Color back"""
+        original = chroma.Color.__dict__['hls'], chroma.Color.__init__, chroma.mix_many
+        instrument.enable()
+        self.assertTrue(instrument.enabled())
+        instrument.disable()
+        self.assertEqual((chroma.Color.__dict__['hls'], chroma.Color.__init__, chroma.mix_many), original)
+        chroma.Color('#335577').hls
+        self.assertEqual(instrument.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma LUT3D Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks lookup tables against direct conversions, and .cube round trips.
+
+"""
+
+import unittest
+import tempfile
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+import numpy as np
+
+class LUT3DTestSuite(unittest.TestCase):
+    def setUp(self):
+        self.rgb = np.random.RandomState(0).rand(500, 3)
+
+    def test_interpolation(self):
+        """Test interpolated lookups against the conversion"""
+        identity = chroma.LUT3D.build('rgb', size=5)
+        for method in ('trilinear', 'tetrahedral'):
+            self.assertTrue(np.allclose(identity.apply(self.rgb, method), self.rgb))
+
+        colors = chroma.ColorArray(self.rgb, 'RGB')
+        cmy = chroma.LUT3D.build('cmy', size=9)
+        self.assertTrue(np.allclose(cmy.apply(colors, 'tetrahedral'), colors.cmy, atol=1e-6))
+        lab = chroma.LUT3D.build('lab', size=33)
+        self.assertTrue(np.abs(lab.apply(colors) - colors.lab).max() < 1.0)
+        self.assertRaises(ValueError, lab.apply, colors, 'cubic')
+
+    def test_hue(self):
+        """Test interpolated HLS and HSV hue across the wrap at red"""
+        colors = chroma.ColorArray(self.rgb, 'RGB')
+        chromatic = np.ptp(self.rgb, axis=1) > 0.2
+        for conversion in ('hls', 'hsv'):
+            lut = chroma.LUT3D.build(conversion, size=33)
+            self.assertEqual(lut.hue_channel, 0)
+            exact = getattr(colors, conversion)[:, 0]
+            for method in ('trilinear', 'tetrahedral'):
+                hue = lut.apply(colors, method)[:, 0]
+                self.assertTrue(((hue >= 0) & (hue < 360)).all())
+                error = np.abs((hue - exact + 180) % 360 - 180)
+                self.assertTrue(error[chromatic].max() < 2.0)
+
+        # Halfway between 350 and 10 degrees is 0, not 180
+        table = np.empty((2, 2, 2, 1))
+        table[0], table[1] = 350.0, 10.0
+        hue = chroma.LUT3D(table, hue_channel=0).apply(np.array([[0.5, 0.3, 0.7]]))[0, 0]
+        self.assertTrue(min(hue, 360 - hue) < 1e-6)
+
+    def test_full_table(self):
+        """Test 8-bit input to a 256 table is exact"""
+        lut = chroma.LUT3D(np.random.RandomState(1).rand(256, 256, 256, 1))
+        pixels = chroma.PixelBuffer(bytes(bytearray([0, 128, 255, 7, 3, 1])))
+        expected = [lut.table[0, 128, 255], lut.table[7, 3, 1]]
+        self.assertTrue(np.array_equal(lut.apply(pixels), expected))
+        self.assertTrue(np.array_equal(lut.apply(pixels.to_array()), expected))
+
+    def test_files(self):
+        """Test .cube and .npy round trips"""
+        lut = chroma.LUT3D.build('hsv', size=3)
+        lut.table /= [360.0, 1.0, 1.0]
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'hsv.cube')
+            lut.save_cube(path)
+            loaded = chroma.LUT3D.load_cube(path)
+            self.assertEqual(loaded.title, 'hsv')
+            self.assertTrue(np.allclose(loaded.table, lut.table, atol=1e-6))
+            # Red changes fastest in the file
+            with open(path) as f:
+                rows = [line for line in f if line[0].isdigit()]
+            self.assertTrue(np.allclose([float(x) for x in rows[1].split()], lut.table[1, 0, 0]))
+
+            path = os.path.join(directory, 'hsv.lut')
+            lut.save(path)
+            for mmap in (True, False):
+                loaded = chroma.LUT3D.load(path, mmap)
+                self.assertTrue(np.array_equal(loaded.table, lut.table))
+                self.assertEqual((loaded.title, loaded.hue_channel), ('hsv', 0))
+            self.assertEqual(chroma.LUT3D.load(path, hue_channel=2).hue_channel, 2)
+
+            # Title and hue channel are optional, plain .npy tables still load
+            lut = chroma.LUT3D(lut.table)
+            lut.save(path)
+            self.assertEqual((chroma.LUT3D.load(path).title, chroma.LUT3D.load(path).hue_channel), (None, None))
+            path = os.path.join(directory, 'hsv.npy')
+            np.save(path, lut.table)
+            self.assertTrue(np.array_equal(chroma.LUT3D.load(path).table, lut.table))
+            self.assertEqual(chroma.LUT3D.load(path, hue_channel=0).hue_channel, 0)
+
+            path = os.path.join(directory, 'other')
+            with open(path, 'wb') as f:
+                f.write(b'not a table')
+            self.assertRaises(ValueError, chroma.LUT3D.load, path)
+        finally:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Names Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks CSS name parsing and nearest name lookups.
+
+"""
+
+import unittest
+import random
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+from chroma import names
+
+class NamesTestSuite(unittest.TestCase):
+    def test_parse(self):
+        """Test names parse in any case, and unknown names raise"""
+        self.assertEqual(len(names.CSS_COLORS), 148)
+        self.assertEqual(chroma.Color('RebeccaPurple', 'NAME'), chroma.Color('#663399'))
+        self.assertEqual(chroma.Color(' navy ', 'name').hex, '#000080')
+        color = chroma.Color('#FFFFFF80')
+        color.name = 'grey'
+        self.assertEqual(color.hex, '#80808080')
+        self.assertRaises(ValueError, chroma.Color, 'notacolor', 'NAME')
+        self.assertRaises(ValueError, chroma.Color, None, 'NAME')
+
+    def test_nearest(self):
+        """Test exact names, and nearest names against a full search"""
+        self.assertEqual(chroma.Color('#00FFFF').name, 'aqua')
+        self.assertEqual(chroma.Color('#808080').name, 'gray')
+        self.assertEqual(chroma.Color('#663398').name, 'rebeccapurple')
+
+        def closest(value):
+            rgb = (value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+            distances = [(sum((x - y) ** 2 for x, y in zip(rgb, (v >> 16, (v >> 8) & 0xFF, v & 0xFF))), i)
+                         for i, v in enumerate(names._NAMED_INTS)]
+            return names._NAMED[min(distances)[1]]
+
+        rng = random.Random(11)
+        for _ in range(2000):
+            value = rng.randint(0, 0xFFFFFF)
+            self.assertEqual(names.nearest_name(value), closest(value))
+
+        # Without NumPy every named color is compared
+        np = names.np
+        names.np = None
+        try:
+            for _ in range(200):
+                value = rng.randint(0, 0xFFFFFF)
+                self.assertEqual(names.nearest_name(value), closest(value))
+        finally:
+            names.np = np
+
+    def test_many(self):
+        """Test ColorArray names match Color names"""
+        rng = random.Random(12)
+        hexes = ['#%06X' % rng.randint(0, 0xFFFFFF) for _ in range(3000)] + ['#00FFFF', '#696969']
+        self.assertEqual(chroma.ColorArray(hexes).name, [chroma.Color(h).name for h in hexes])
+        self.assertEqual(chroma.ColorArray(['navy', 'Cyan'], 'NAME').hex, ['#000080', '#00FFFF'])
+
+
+if __name__ == '__main__':
+    unittest.main()
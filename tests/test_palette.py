@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Palette Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks indexed nearest color lookups against a brute force search.
+
+"""
+
+import unittest
+
+import numpy as np
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+from chroma import palette as palette_module
+
+class PaletteTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.colors = chroma.ColorArray(rng.rand(500, 3), 'RGB').to_colors()
+        self.queries = chroma.ColorArray(rng.rand(3000, 3), 'RGB')
+
+    def assertNearest(self, palette, indexes):
+        # Compare distances, ties may resolve to either entry
+        points = palette._points(self.queries.color)
+        entries = palette._points(palette.array.color)
+        brute = ((points[:, np.newaxis, :] - entries[np.newaxis, :, :]) ** 2).sum(axis=2).min(axis=1)
+        found = ((points - entries[indexes]) ** 2).sum(axis=1)
+        self.assertTrue(np.allclose(found, brute))
+
+    def test_nearest_many(self):
+        """Test bulk lookups in every space"""
+        for space in ('RGB', 'LAB'):
+            palette = chroma.Palette(self.colors, space)
+            self.assertNearest(palette, palette.nearest_many(self.queries))
+            self.assertNearest(palette, palette.nearest_many(self.queries.rgb))
+
+    def test_query_blocks(self):
+        """Test lookups compared a few rows at a time give the same result"""
+        palette = chroma.Palette(self.colors, 'LAB')
+        expected = palette.nearest_many(self.queries)
+        block = palette_module._QUERY_BLOCK
+        palette_module._QUERY_BLOCK = 7
+        try:
+            self.assertEqual(palette.nearest_many(self.queries).tolist(), expected.tolist())
+        finally:
+            palette_module._QUERY_BLOCK = block
+
+    def test_nearest(self):
+        """Test single lookups agree with bulk lookups"""
+        palette = chroma.Palette(self.colors, 'lab')
+        indexes = palette.nearest_many(self.queries[:50])
+        for i, color in enumerate(self.queries[:50]):
+            self.assertEqual(palette.nearest_index(color), indexes[i])
+            self.assertEqual(palette.nearest(color), self.colors[indexes[i]])
+
+        primaries = chroma.Palette([chroma.Color('#FF0000'), chroma.Color('#00FF00'), chroma.Color('#0000FF')])
+        self.assertEqual(primaries.nearest(chroma.Color('#EE1122')), chroma.Color('#FF0000'))
+        self.assertRaises(ValueError, chroma.Palette, [])
+        self.assertRaises(ValueError, chroma.Palette, self.colors, 'CMYK')
+
+
+if __name__ == '__main__':
+    unittest.main()
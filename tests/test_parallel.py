@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Batch Conversion Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks convert_many against the scalar Color API.
+
+"""
+
+import unittest
+import random
+
+import numpy as np
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+from chroma import parallel
+
+class ConvertManyTestSuite(unittest.TestCase):
+    def setUp(self):
+        # Small chunks so the process pool is used
+        self.min_chunk = parallel._MIN_CHUNK
+        parallel._MIN_CHUNK = 10
+
+        rng = random.Random(42)
+        self.hexes = ['#%06X' % (rng.randint(0, 0xFFFFFF)) for _ in range(500)]
+
+    def tearDown(self):
+        parallel._MIN_CHUNK = self.min_chunk
+
+    def test_matches_color(self):
+        """Test pooled conversion against Color for every output format"""
+        for dst in ('RGB', 'RGB256', 'HLS', 'HSV', 'CMY', 'CMYK', 'XYZ', 'LAB'):
+            result = chroma.convert_many(self.hexes, 'HEX', dst, workers=3)
+            self.assertEqual(result.shape[0], len(self.hexes))
+            self.assertEqual(result.dtype, getattr(chroma.ColorArray(self.hexes[:1]), dst.lower()).dtype)
+            for row, value in zip(result, self.hexes[:50]):
+                expected = getattr(chroma.Color(value), dst.lower())
+                for x, y in zip(row, expected):
+                    self.assertTrue(abs(x - y) <= 1e-9)
+
+        hls = chroma.convert_many(self.hexes, 'HEX', 'HLS', workers=3)
+        self.assertEqual(chroma.convert_many(hls, 'HLS', 'HEX', workers=3),
+                         chroma.convert_many(hls, 'HLS', 'HEX', workers=1))
+        self.assertEqual(chroma.convert_many(self.hexes, 'HEX', 'HEX', workers=3), self.hexes)
+        names = chroma.convert_many(self.hexes, 'HEX', 'NAME', workers=3)
+        self.assertEqual(names, [chroma.Color(value).name for value in self.hexes])
+        self.assertEqual(chroma.convert_many(names, 'NAME', 'HEX', workers=3),
+                         [chroma.Color(name, 'NAME').hex for name in names])
+        self.assertEqual(chroma.convert_many([' Red', 'lightgoldenrodyellow'], 'NAME', 'RGB256', workers=1).tolist(),
+                         [[255, 0, 0], [250, 250, 210]])
+        for space in ('XYZ', 'LAB'):
+            values = chroma.convert_many(self.hexes, 'HEX', space, workers=3)
+            self.assertEqual(chroma.convert_many(values, space, 'HEX', workers=3), self.hexes)
+
+    def test_alpha_and_errors(self):
+        """Test alpha handling and bad input"""
+        result = chroma.convert_many(['#FFFFFF', '#00000080'], 'HEX', 'HEX', workers=1)
+        self.assertEqual(result, ['#FFFFFFFF', '#00000080'])
+
+        self.assertRaises(ValueError, chroma.convert_many, self.hexes + ['#GG0000'], 'HEX', 'RGB', 3)
+        self.assertEqual(chroma.convert_many(['#00000080'], 'HEX', 'LAB', workers=1).shape, (1, 3))
+        self.assertRaises(ValueError, chroma.convert_many, ['#FFFFFF'], 'HEX', 'LUV')
+        self.assertRaises(ValueError, chroma.convert_many, ['red', 'reddish'], 'NAME', 'HEX', 1)
+        self.assertRaises(ValueError, chroma.convert_many, [u'#\xc4\xc40000'], 'HEX', 'RGB', 1)
+        self.assertRaises(ValueError, chroma.convert_many, [[]], 'RGB', 'HLS', 1)
+
+    def test_empty(self):
+        """Test empty input gives the shape non-empty input would"""
+        self.assertEqual(chroma.convert_many([], 'HEX', 'HEX'), [])
+        self.assertEqual(chroma.convert_many([], 'HEX', 'NAME'), [])
+        for src, dst, width in [('HEX', 'HLS', 3), ('HEX', 'CMYK', 4), ('NAME', 'LAB', 3), ('RGB', 'RGB256', 3)]:
+            result = chroma.convert_many([], src, dst)
+            self.assertEqual(result.shape, (0, width))
+            self.assertEqual(result.dtype, chroma.convert_many(['#FFFFFF'], 'HEX', dst).dtype)
+
+        # Alpha columns carry through, as they do with rows
+        self.assertEqual(chroma.convert_many(np.empty((0, 4)), 'RGB', 'HLS').shape, (0, 4))
+        self.assertEqual(chroma.convert_many(np.empty((0, 4)), 'RGB', 'HEX'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Quantize Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks palette mapping and dithering against per pixel reference code.
+
+"""
+
+import importlib
+import unittest
+
+import numpy as np
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+# The module, chroma.quantize is the function
+quantize = importlib.import_module('chroma.quantize')
+
+class QuantizeTestSuite(unittest.TestCase):
+    def setUp(self):
+        # 40 x 30 gradient image
+        ramp = np.add.outer(np.arange(30), np.arange(40)) * 3
+        self.image = np.dstack([ramp, ramp[::-1], np.full((30, 40), 128)]).astype(np.uint8)
+        self.colors = [chroma.Color(h) for h in ['#000000', '#FFFFFF', '#FF0000', '#00FF00', '#0000FF', '#808080']]
+
+    def test_nearest(self):
+        """Test nearest mapping against Palette.nearest_many"""
+        for space in ('RGB', 'LAB'):
+            palette = chroma.Palette(self.colors, space)
+            result = chroma.quantize(chroma.PixelBuffer(self.image.tobytes()), palette)
+            expected = palette.nearest_many(self.image.reshape(-1, 3) / 255.0)
+            self.assertEqual(result.indexes.dtype, np.uint8)
+            self.assertEqual(result.indexes.tolist(), expected.tolist())
+            self.assertTrue(result.pixels_per_second > 0)
+
+        result = chroma.quantize(self.image, self.colors)
+        self.assertEqual(result.indexes.shape, (30, 40))
+        self.assertEqual(result.to_pixels().shape, (30, 40, 3))
+        self.assertEqual([c.hex for c in result.palette], [c.hex for c in self.colors])
+
+    def test_floyd_steinberg(self):
+        """Test error diffusion against a raster scan"""
+        # Raster scan, one pixel at a time
+        values = self.image / 255.0
+        entries = np.array([c.rgb for c in self.colors])
+        expected = np.zeros((30, 40), dtype=int)
+        for y in range(30):
+            for x in range(40):
+                value = np.clip(values[y, x], 0, 1)
+                i = int(((entries - value) ** 2).sum(axis=1).argmin())
+                expected[y, x] = i
+                error = value - entries[i]
+                if x + 1 < 40:
+                    values[y, x + 1] += error * (7 / 16.0)
+                if y + 1 < 30:
+                    if x > 0:
+                        values[y + 1, x - 1] += error * (3 / 16.0)
+                    values[y + 1, x] += error * (5 / 16.0)
+                    if x + 1 < 40:
+                        values[y + 1, x + 1] += error * (1 / 16.0)
+
+        buffer = chroma.PixelBuffer(self.image.tobytes())
+        result = chroma.quantize(buffer, self.colors, 'floyd_steinberg', width=40)
+        self.assertEqual(result.indexes.tolist(), expected.tolist())
+        self.assertRaises(ValueError, chroma.quantize, buffer, self.colors, 'floyd_steinberg')
+        self.assertRaises(ValueError, chroma.quantize, buffer, self.colors, 'floyd_steinberg', 7)
+
+    def test_large_palette(self):
+        """Test large palettes match the same colors through the palette index"""
+        # Matched through the palette's index instead of a distance matrix
+        rng = np.random.RandomState(0)
+        colors = [chroma.Color.from_rgb_unchecked(tuple(c)) for c in rng.rand(300, 3).tolist()]
+        matrix_size = quantize.MATRIX_SIZE
+        for space in ('RGB', 'LAB'):
+            palette = chroma.Palette(colors, space)
+            results = []
+            for size in (matrix_size, 1):
+                quantize.MATRIX_SIZE = size
+                try:
+                    results.append([chroma.quantize(self.image, palette, dither).indexes.tolist()
+                                    for dither in (None, 'ordered', 'floyd_steinberg')])
+                finally:
+                    quantize.MATRIX_SIZE = matrix_size
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0][0], palette.nearest_many(self.image.reshape(-1, 3) / 255.0)
+                             .reshape(30, 40).tolist())
+
+    def test_dither_tone(self):
+        """Test dithering keeps the average tone"""
+        # Mid gray in black and white keeps its average either way
+        gray = np.full((32, 32, 3), 128, dtype=np.uint8)
+        black_white = [chroma.Color('#000000'), chroma.Color('#FFFFFF')]
+        self.assertEqual(chroma.quantize(gray, black_white).indexes.mean(), 1)
+        for dither in ('ordered', 'floyd_steinberg'):
+            share = chroma.quantize(gray, black_white, dither).indexes.mean()
+            self.assertTrue(abs(share - 128 / 255.0) < 0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma ColorStats Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks streaming and merged statistics against whole-array results.
+
+"""
+
+import unittest
+import pickle
+import random
+
+import numpy as np
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+
+class ColorStatsTestSuite(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.hexes = ['#%06X' % rng.randint(0, 0xFFFFFF) for _ in range(1000)]
+        self.colors = chroma.ColorArray(self.hexes)
+
+    def test_channels(self):
+        """Test per channel statistics, chunk by chunk and from every input type"""
+        stats = chroma.ColorStats()
+        self.assertEqual(stats.mean, None)
+        for start in range(0, 1000, 128):
+            stats.add(self.colors[start:start + 128])
+
+        rgb = self.colors.color
+        self.assertEqual(len(stats), 1000)
+        self.assertTrue(np.allclose(stats.mean, rgb.mean(axis=0)))
+        self.assertTrue(np.allclose(stats.variance, rgb.var(axis=0)))
+        self.assertTrue(np.allclose(stats.std, rgb.std(axis=0)))
+        self.assertEqual(stats.min.tolist(), rgb.min(axis=0).tolist())
+        self.assertEqual(stats.max.tolist(), rgb.max(axis=0).tolist())
+
+        # Same results from Color objects, 8-bit arrays and pixel buffers
+        byte = np.array([c.rgb256 for c in self.colors], dtype=np.uint8)
+        for source in (self.colors.to_colors(), byte, chroma.PixelBuffer(byte.tobytes())):
+            other = chroma.ColorStats()
+            other.add(source)
+            self.assertTrue(np.allclose(other.mean, stats.mean))
+            self.assertTrue(np.allclose(other.variance, stats.variance))
+            self.assertEqual(other.hue_histogram.tolist(), stats.hue_histogram.tolist())
+
+    def test_merge(self):
+        """Test merging pickled accumulators"""
+        whole = chroma.ColorStats()
+        whole.add(self.colors)
+
+        # One accumulator per worker, sent back pickled
+        parts = []
+        for start, stop in [(0, 10), (10, 600), (600, 1000)]:
+            part = chroma.ColorStats()
+            part.add(self.colors[start:stop])
+            parts.append(pickle.loads(pickle.dumps(part)))
+        merged = chroma.ColorStats()
+        for part in parts:
+            merged.update(part)
+        merged = merged + chroma.ColorStats()
+
+        self.assertEqual(len(merged), len(whole))
+        self.assertTrue(np.allclose(merged.mean, whole.mean))
+        self.assertTrue(np.allclose(merged.variance, whole.variance))
+        self.assertAlmostEqual(merged.hue_mean, whole.hue_mean)
+        self.assertEqual(merged.hue_histogram.tolist(), whole.hue_histogram.tolist())
+
+    def test_hue(self):
+        """Test circular hue statistics"""
+        # 350 and 10 degrees average to 0, not 180; grays are left out
+        stats = chroma.ColorStats()
+        stats.add(chroma.ColorArray([(350, 0.5, 1), (10, 0.5, 1)], 'HSV'))
+        stats.add(chroma.Color('#808080'))
+        self.assertEqual(stats.chromatic, 2)
+        self.assertAlmostEqual(min(stats.hue_mean, 360 - stats.hue_mean), 0)
+        self.assertAlmostEqual(stats.hue_std, np.degrees(np.sqrt(-2 * np.log(np.cos(np.radians(10))))))
+        self.assertEqual(stats.hue_histogram[[349, 350, 10]].tolist(), [0, 1, 1])
+
+        gray = chroma.ColorStats()
+        gray.add([chroma.Color('#000000'), chroma.Color('#FFFFFF')])
+        self.assertEqual((gray.hue_mean, gray.hue_concentration), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
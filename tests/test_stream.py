@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chroma Stream Test Suite
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Checks chunked text conversion used by python -m chroma.
+
+"""
+
+import unittest
+
+# Path hack. (for importing)
+import sys
+import os
+sys.path.insert(0, os.path.abspath('..'))
+sys.path.insert(0, os.path.abspath('.'))
+import chroma
+from chroma.stream import convert_lines, convert_stream
+
+class StreamTestSuite(unittest.TestCase):
+    def setUp(self):
+        self.hexes = ['#335577', '#446688', '#555555', '#FF0000', '#00FF00']
+
+    def test_convert_lines(self):
+        """Test layouts and formats for one chunk"""
+        self.assertEqual(convert_lines(self.hexes[:1], 'HEX', 'RGB256'), ['51,85,119'])
+        self.assertEqual(convert_lines(['"#335577"\n', '\n'], 'HEX', 'RGB256', 'jsonl', 'jsonl'), ['[51, 85, 119]'])
+        self.assertEqual(convert_lines(['51, 85, 119'], 'RGB256', 'HEX'), ['#335577'])
+        self.assertEqual(convert_lines(['[210, 0.3333, 0.4]'], 'HLS', 'HEX', 'jsonl', 'csv'), ['#335577'])
+
+        hls = convert_lines(self.hexes, 'HEX', 'HLS')
+        self.assertEqual(hls[0].split(',')[0], str(chroma.Color('#335577').hls[0]))
+        self.assertEqual(convert_lines(hls, 'HLS', 'HEX'), self.hexes)
+
+        self.assertRaises(ValueError, convert_lines, ['#GG0000'], 'HEX', 'RGB')
+
+    def test_convert_stream(self):
+        """Test chunked conversion in process and with a pool"""
+        lines = [h + '\n' for h in self.hexes] * 3
+        for workers in (1, 2):
+            output = []
+            count = convert_stream(lines, output.append, 'HEX', 'CMYK', chunk_size=2, workers=workers)
+            self.assertEqual(count, len(lines))
+
+            rows = ''.join(output).splitlines()
+            self.assertEqual(len(rows), len(lines))
+            expected = [chroma.Color(h).cmyk for h in self.hexes] * 3
+            for row, cmyk in zip(rows, expected):
+                for x, y in zip(row.split(','), cmyk):
+                    self.assertAlmostEqual(float(x), y)
+
+        self.assertRaises(ValueError, convert_stream, lines, output.append, 'HEX', 'YIQ')
+
+    def test_chunk_boundaries(self):
+        """Test every row converts as Color does, whatever the chunk size"""
+        lines = ['#335577\n', '\n', '#446688\n', '#55555580\n', '#FF0000\n', '#00FF0040\n']
+        values = [line.strip() for line in lines if line.strip()]
+        for dst, expected in [('HEX', [chroma.Color(v).hex for v in values]),
+                              ('RGB256', [','.join(map(repr, chroma.Color(v).rgb256)) for v in values])]:
+            for chunk_size in (1, 2, 3, 100):
+                for workers in (1, 2):
+                    output = []
+                    count = convert_stream(lines, output.append, 'HEX', dst,
+                                           chunk_size=chunk_size, workers=workers)
+                    self.assertEqual(''.join(output).splitlines(), expected)
+                    self.assertEqual(count, len(values))
+        self.assertEqual(convert_lines(['0.2,0.4,0.6', '0.2,0.4,0.6,0.5'], 'RGB', 'HEX'),
+                         ['#336699', '#33669980'])
+
+    def test_invalid_lines(self):
+        """Test invalid lines are reported and skipped, or raise"""
+        lines = ['color\n', '#335577\n', '#GG0000\n', '#446688\n']
+        for chunk_size in (1, 10):
+            output = []
+            invalid = []
+            count = convert_stream(lines, output.append, 'HEX', 'HEX', chunk_size=chunk_size,
+                                   errors=lambda line, message: invalid.append(line))
+            self.assertEqual(''.join(output).splitlines(), ['#335577', '#446688'])
+            self.assertEqual((count, invalid), (2, [1, 3]))
+        self.assertRaises(ValueError, convert_stream, lines, [].append, 'HEX', 'HEX')
+        self.assertRaises(ValueError, convert_lines, ['0.1,0.2'], 'RGB', 'HEX')
+        self.assertRaises(ValueError, convert_stream, lines, output.append, chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()